@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from app.models.job_ai import JobAIRequest, JobAIResponse, JobAISuggestion
 from app.services.llm import generate_job_with_ai
+from app.core.deadline import DeadlineExceeded
 from app.core.logger import get_logger
+from app.services.idempotency import fingerprint, idempotent
 import time
 
 router = APIRouter(prefix="/ai/jobs", tags=["AI Jobs"])
@@ -45,11 +47,19 @@ logger = get_logger(__name__)
 
 
 @router.post("/generate", response_model=JobAIResponse)
-async def generate_job_details(payload: JobAIRequest):
+async def generate_job_details(request: Request, payload: JobAIRequest):
     """
     Generate job description, requirements, responsibilities, etc. using AI.
     This does NOT persist to DB. Only logs the suggestion.
+    With an `Idempotency-Key` header, a retry returns the first suggestion.
     """
+    return await idempotent(
+        request, "ai-job-generate", fingerprint(payload.model_dump_json()),
+        lambda: _generate_job_details(payload),
+    )
+
+
+async def _generate_job_details(payload: JobAIRequest) -> JobAIResponse:
     if not payload.title:
         raise HTTPException(status_code=400, detail="Job title is required")
 
@@ -76,7 +86,7 @@ async def generate_job_details(payload: JobAIRequest):
         })
 
         return response
-    except HTTPException:
+    except (HTTPException, DeadlineExceeded):
         raise
     except Exception as e:
         logger.error(f"❌ AI job generation failed: {e}")
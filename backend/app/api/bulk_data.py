@@ -0,0 +1,52 @@
+# app/api/bulk_data.py
+from typing import Dict, List, Literal
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+
+from app.repositories import candidate_repo, job_repo
+from app.services.bulk_io import active_imports, export_ndjson, import_ndjson
+
+router = APIRouter(prefix="/bulk", tags=["Bulk import / export"])
+
+Kind = Literal["candidates", "jobs"]
+
+
+@router.post("/{kind}/import")
+async def import_documents(
+    kind: Kind,
+    request: Request,
+    chunk_size: int = Query(None, ge=1, le=10000, description="Rows per insert_many (default BULK_IMPORT_CHUNK)"),
+):
+    """
+    Stream an NDJSON body (one candidate / job object per line) into Mongo,
+    validating and inserting chunk by chunk as the body arrives.
+    Returns processed / inserted / duplicates / failed counts, rows_per_sec and
+    line-numbered errors. Rows carrying an exported `id` are skipped as
+    duplicates on re-import. Progress of running imports: GET /bulk/imports.
+    """
+    return await import_ndjson(kind, request.stream(), chunk_size)
+
+
+@router.get("/imports", response_model=List[Dict])
+async def running_imports():
+    """Latest progress report of every import still running in this worker."""
+    return list(active_imports.values())
+
+
+@router.get("/{kind}/export")
+async def export_documents(kind: Kind):
+    """
+    Stream every live candidate / job as NDJSON (constant memory).
+    `X-Total-Count` lets clients show progress while reading lines.
+    """
+    repo = candidate_repo if kind == "candidates" else job_repo
+    total = await repo.count_cached()
+    return StreamingResponse(
+        export_ndjson(kind),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Total-Count": str(total),
+            "Content-Disposition": f'attachment; filename="{kind}.ndjson"',
+        },
+    )
@@ -1,10 +1,21 @@
+import asyncio
+from typing import Any, Dict, List, Literal, Optional, Tuple
+
 from fastapi import APIRouter, HTTPException
 from fastapi.params import Body
-from app.core.db import db
-from app.models.candidate import CandidateResponse
-from app.models.job import JobResponse
-from app.models.scoring import CandidateScore
-from pydantic import BaseModel
+from app.core.config import settings
+from app.repositories import candidate_repo, card_repo, score_repo
+from app.models.candidate import CandidateResponse, CandidateSummary
+from app.services.candidate_cards import (
+    candidate_projection,
+    card_projection,
+    card_row,
+    hydrate_candidates,
+)
+from app.utils.fields import parse_fields, projection
+from app.utils.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.utils.serialization import FastJSONResponse
+from pydantic import BaseModel, Field, model_validator
 from bson import ObjectId
 
 router = APIRouter(prefix="/candidates-listing-with-score", tags=["Candidates"])
@@ -12,8 +23,61 @@ router = APIRouter(prefix="/candidates-listing-with-score", tags=["Candidates"])
 
 # Request model for pagination
 class CandidateListRequest(BaseModel):
-    page: int = 1
-    limit: int = 10
+    page: int = Field(1, ge=1)
+    limit: int = Field(10, ge=1, le=200)
+    after: Optional[str] = None   # `nextCursor` of the previous page (keyset pagination)
+    total: Literal["cached", "estimated", "none"] = "cached"
+    fields: Optional[str] = None  # candidate fields, e.g. "summary" or "name,email,skills"
+
+    # filters
+    job_id: Optional[str] = None
+    status: Optional[str] = None                    # candidate status, e.g. "active"
+    min_overall_score: Optional[int] = Field(None, ge=0, le=100)
+    max_overall_score: Optional[int] = Field(None, ge=0, le=100)
+    min_fitment_score: Optional[int] = Field(None, ge=0, le=100)
+    max_fitment_score: Optional[int] = Field(None, ge=0, le=100)
+    fitment_status: Optional[List[str]] = None      # e.g. ["Good Fit", "Average"]
+    sort: Literal["recent", "overall_score", "fitment_score"] = "recent"  # scores: highest first
+
+    @model_validator(mode="after")
+    def check_ranges(self):
+        for low, high in ((self.min_overall_score, self.max_overall_score),
+                          (self.min_fitment_score, self.max_fitment_score)):
+            if low is not None and high is not None and low > high:
+                raise ValueError("min score must not exceed max score")
+        return self
+
+    def score_filters(self) -> Dict[str, Any]:
+        """Filter on candidate_scores (empty when no score filter is set)."""
+        query: Dict[str, Any] = {}
+        for field, low, high in (("overall_score", self.min_overall_score, self.max_overall_score),
+                                 ("fitment_score", self.min_fitment_score, self.max_fitment_score)):
+            bounds = {op: v for op, v in (("$gte", low), ("$lte", high)) if v is not None}
+            if bounds:
+                query[field] = bounds
+        if self.fitment_status:
+            query["fitment_status"] = {"$in": self.fitment_status}
+        return query
+
+    def candidate_filters(self) -> Dict[str, Any]:
+        return {k: v for k, v in (("job_id", self.job_id), ("status", self.status)) if v is not None}
+
+    @property
+    def by_score(self) -> bool:
+        """Served from candidate_scores (score sort or score filter) instead of candidates."""
+        return self.sort != "recent" or bool(self.score_filters())
+
+
+# score documents read per round trip when filtering them by candidate status (score mode)
+MAX_SCORE_BATCHES = 5
+
+
+async def _total_count(mode: str, repo=candidate_repo, query: Optional[Dict] = None) -> Optional[int]:
+    if mode == "none":
+        return None
+    if mode == "estimated" and not query:
+        return await repo.estimated_count()
+    return await repo.count_cached(query)  # filtered totals cannot be estimated from metadata
 
 
 @router.post("/list")
@@ -23,91 +87,155 @@ async def list_candidates(payload: CandidateListRequest):
     Accepts JSON body:
     {
         "page": 1,
-        "limit": 10
+        "limit": 10,
+        "after": null,        # optional: pagination.nextCursor from the previous response
+        "total": "cached",    # "cached" | "estimated" | "none"
+        "fields": null,       # optional: "summary" or "name,email,skills" (slim rows)
+        "job_id": null, "status": null,                      # optional candidate filters
+        "min_overall_score": null, "max_overall_score": null, # optional score filters (0-100)
+        "min_fitment_score": null, "max_fitment_score": null,
+        "fitment_status": null,                              # e.g. ["Good Fit"]
+        "sort": "recent"      # "recent" | "overall_score" | "fitment_score" (highest first)
     }
+    Pages after the first should be requested with `after` (keyset pagination:
+    constant cost at any depth). `page` > 1 without `after` still works via skip.
+    With a score filter or score sort, rows are candidates with a score for their
+    own job, read in score order from candidate_scores indexes (e.g. the top
+    candidates for a job above 70 is one indexed range scan); `after` is required
+    past page 1 and totals are approximate.
+    With CANDIDATE_CARDS_READS every variant is one index scan over the
+    pre-joined candidate_cards collection.
     """
 
     page = payload.page
     limit = payload.limit
-    skip = (page - 1) * limit
-
-    # total candidates count
-    total_count = db["candidates"].count_documents({"deleted": False})
-
-    # fetch candidates with pagination
-    candidates_cursor = (
-        db["candidates"]
-        .find({"deleted": False})
-        .sort("_id", -1)
-        .skip(skip)
-        .limit(limit)
-    )
-    candidates = list(candidates_cursor)
-
-    result = []
-
-    for candidate in candidates:
-        # Convert Mongo `_id` → string `id`
-        candidate["id"] = str(candidate["_id"])
-        candidate.pop("_id", None)
-
-        # fetch related job
-        job = None
-        if candidate.get("job_id"):
-            query = (
-                {"_id": ObjectId(candidate["job_id"])}
-                if ObjectId.is_valid(str(candidate["job_id"]))
-                else {"id": candidate["job_id"]}
+
+    sort_field = _score_sort_field(payload) if payload.by_score else "_id"
+    try:
+        fields = parse_fields(payload.fields, CandidateResponse.model_fields, list(CandidateSummary.model_fields))
+        after = decode_cursor(payload.after, sort_field) if payload.after else None
+    except (InvalidCursor, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    scores = None
+    if settings.CANDIDATE_CARDS_READS:
+        query = {**payload.candidate_filters(), **payload.score_filters()}
+        if payload.by_score:
+            query.setdefault(sort_field, {"$type": "number"})  # unscored candidates are not ranked
+        card_fields = {**card_projection(fields), sort_field: 1}
+        if payload.after or page == 1:
+            page_query = card_repo.find_page(
+                query, limit=limit, after=after, sort_field=sort_field, projection=card_fields
             )
-            job = db["jobs"].find_one(query)
-            if job:
-                job["id"] = str(job["_id"])
-                job.pop("_id", None)
-
-        # fetch related resume
-        resume = None
-        if candidate.get("resume_id"):
-            query = (
-                {"_id": ObjectId(candidate["resume_id"])}
-                if ObjectId.is_valid(str(candidate["resume_id"]))
-                else {"id": candidate["resume_id"]}
+        else:
+            page_query = _skip_page(page, limit, card_fields, query, card_repo, sort_field)
+        total_count, (cards, next_cursor) = await asyncio.gather(
+            _total_count(payload.total, card_repo, query), page_query
+        )
+        candidates = None
+    elif payload.by_score:
+        if page > 1 and not payload.after:
+            raise HTTPException(status_code=400, detail="Score-filtered listings page with `after` only")
+        score_query = _score_query(payload)
+        total_count, (candidates, scores, next_cursor) = await asyncio.gather(
+            _total_count(payload.total, score_repo, score_query),
+            _score_page(payload, score_query, sort_field, limit, after, fields),
+        )
+    else:
+        query = payload.candidate_filters()
+        if payload.after or page == 1:
+            page_query = candidate_repo.find_page(
+                query, limit=limit, after=after, projection=candidate_projection(fields)
             )
-            resume = db["resumes"].find_one(query)
-            if resume:
-                resume["id"] = str(resume["_id"])
-                resume.pop("_id", None)
-
-        # fetch related candidate score
-        score = None
-        score_doc = db["candidate_scores"].find_one({"candidate_id": candidate["id"], "deleted": False})
-        if score_doc:
-            score_doc["id"] = str(score_doc["_id"])
-            score_doc.pop("_id", None)
-            try:
-                score = CandidateScore(**score_doc).dict()
-            except Exception:
-                score = score_doc  # fallback raw dict if validation fails
-
-        result.append({
-            "candidate": CandidateResponse(**candidate).dict(),
-            "job": JobResponse(**job).dict() if job else None,
-            "resume": resume if resume else None,
-            "score": score
-        })
+        else:
+            page_query = _skip_page(page, limit, candidate_projection(fields), query)
+        total_count, (candidates, next_cursor) = await asyncio.gather(
+            _total_count(payload.total, candidate_repo, query), page_query
+        )
+
+    if candidates is None:
+        result = [card_row(card, fields) for card in cards]
+    else:
+        result = await hydrate_candidates(candidates, fields, scores)
 
     # pagination info
-    total_pages = (total_count + limit - 1) // limit  # ceil division
-    has_more = page < total_pages
+    total_pages = (total_count + limit - 1) // limit if total_count is not None else None  # ceil division
 
-    return {
+    return FastJSONResponse({
         "candidates": result,
         "pagination": {
             "totalCount": total_count,
             "totalPages": total_pages,
-            "currentPage": page,
-            "hasMore": has_more,
+            "totalIsApproximate": payload.total != "none",  # cached / estimated; score mode counts scores
+            "currentPage": None if payload.after else page,
+            "hasMore": next_cursor is not None,
+            "nextCursor": next_cursor,
         }
-    }
+    })
+
+
+async def _skip_page(
+    page: int, limit: int, fields_projection: Optional[Dict] = None, query: Optional[Dict] = None,
+    repo=candidate_repo, sort_field: str = "_id",
+):
+    """Legacy offset paging (cost grows with page number); returns (docs, next cursor)."""
+    sort = [("_id", -1)] if sort_field == "_id" else [(sort_field, -1), ("_id", -1)]
+    docs = await repo.find_many(
+        query, projection=fields_projection, sort=sort, skip=(page - 1) * limit, limit=limit + 1
+    )
+    if len(docs) <= limit:
+        return docs, None
+    docs = docs[:limit]
+    return docs, encode_cursor(sort_field, docs[-1].get(sort_field), docs[-1]["_id"])
+
+
+def _score_sort_field(payload: CandidateListRequest) -> str:
+    return "overall_score" if payload.sort == "recent" else payload.sort
+
+
+def _score_query(payload: CandidateListRequest) -> Dict[str, Any]:
+    query = payload.score_filters()
+    if payload.job_id:
+        query["job_id"] = payload.job_id
+    return query
+
+
+async def _score_page(
+    payload: CandidateListRequest, score_query: Dict, sort_field: str, limit: int,
+    after: Optional[Tuple[Any, Any]], fields: Optional[List[str]],
+) -> Tuple[List[Dict], Dict[str, Dict], Optional[str]]:
+    """
+    Keyset page over candidate_scores in (score, _id) order, joined to live candidates
+    whose current job is the scored one (and with the requested status). Reads more
+    score batches while rows are filtered out, up to MAX_SCORE_BATCHES round trips;
+    the cursor always points at the last score document read.
+    """
+    candidates: List[Dict] = []
+    scores: Dict[str, Dict] = {}
+    next_cursor = None
+    candidate_fields = projection([*fields, "job_id", "status"]) if fields is not None else None
+    for _ in range(MAX_SCORE_BATCHES):
+        score_docs, next_cursor = await score_repo.find_page(
+            score_query, limit=limit - len(candidates), after=after, sort_field=sort_field,
+        )
+        found = await candidate_repo.find_by_ids(
+            [s["candidate_id"] for s in score_docs], projection=candidate_fields
+        )
+        for score in score_docs:
+            candidate = found.get(score["candidate_id"])
+            if (
+                candidate is None
+                or candidate.get("job_id") != score.get("job_id")
+                or (payload.status and candidate.get("status") != payload.status)
+                or str(candidate["_id"]) in scores
+            ):
+                continue
+            candidates.append(candidate)
+            scores[str(candidate["_id"])] = score
+        if next_cursor is None or len(candidates) >= limit:
+            break
+        after = decode_cursor(next_cursor, sort_field)
+    return candidates, scores, next_cursor
 
 
 @router.post("/get-candidate-by-id")
@@ -131,58 +259,16 @@ async def get_candidate_by_id(payload: dict = Body(...)):
         else {"id": candidate_id}
     )
 
-    candidate = db["candidates"].find_one({**query, "deleted": False})
+    if settings.CANDIDATE_CARDS_READS and "_id" in query:
+        card = await card_repo.find_one(query, card_projection(None))
+        if card:
+            return FastJSONResponse({"candidates": [card_row(card)]})
+
+    candidate = await candidate_repo.find_one({**query, "deleted": False})
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
 
-    candidate["id"] = str(candidate["_id"])
-    candidate.pop("_id", None)
-
-    # Related job
-    job = None
-    if candidate.get("job_id"):
-        job_query = (
-            {"_id": ObjectId(candidate["job_id"])}
-            if ObjectId.is_valid(str(candidate["job_id"]))
-            else {"id": candidate["job_id"]}
-        )
-        job = db["jobs"].find_one(job_query)
-        if job:
-            job["id"] = str(job["_id"])
-            job.pop("_id", None)
-
-    # Related resume
-    resume = None
-    if candidate.get("resume_id"):
-        resume_query = (
-            {"_id": ObjectId(candidate["resume_id"])}
-            if ObjectId.is_valid(str(candidate["resume_id"]))
-            else {"id": candidate["resume_id"]}
-        )
-        resume = db["resumes"].find_one(resume_query)
-        if resume:
-            resume["id"] = str(resume["_id"])
-            resume.pop("_id", None)
-
-    # Related candidate score
-    score = None
-    score_doc = db["candidate_scores"].find_one({"candidate_id": candidate["id"], "deleted": False})
-    if score_doc:
-        score_doc["id"] = str(score_doc["_id"])
-        score_doc.pop("_id", None)
-        try:
-            score = CandidateScore(**score_doc).dict()
-        except Exception:
-            score = score_doc
-
     # Same response structure as list API
-    return {
-        "candidates": [
-            {
-                "candidate": CandidateResponse(**candidate).dict(),
-                "job": JobResponse(**job).dict() if job else None,
-                "resume": resume if resume else None,
-                "score": score
-            }
-        ]
-    }
+    return FastJSONResponse({
+        "candidates": await hydrate_candidates([candidate])
+    })
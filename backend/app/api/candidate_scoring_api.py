@@ -1,15 +1,21 @@
 # app/api/candidate_scoring_api.py
 
+import json
 import logging
 from logging.handlers import RotatingFileHandler
 from fastapi import APIRouter, HTTPException, Body, Request
 from bson import ObjectId
 from datetime import datetime
-from app.core.db import db
+from app.repositories import candidate_repo, job_repo, score_repo
 from app.models.scoring import CandidateScore
 from app.models.candidate import CandidateResponse
 from app.models.job import JobResponse
 from app.chains.scoring_chain import generate_candidate_score
+from app.core.deadline import DeadlineExceeded
+from app.core.executors import PoolSaturated
+from app.core.tracing import span
+from app.services import candidate_cards
+from app.services.idempotency import fingerprint, idempotent
 
 router = APIRouter(prefix="/candidate-scoring", tags=["Candidate Scoring"])
 
@@ -48,6 +54,19 @@ def _safe_log_error(msg: str, candidate_id: str = "-", job_id: str = "-"):
 # -----------------------------
 @router.post("/generate-score")
 async def generate_candidate_score_api(request: Request, payload: dict = Body(...)):
+    """
+    Score a candidate against their job (one LLM call).
+    Send an `Idempotency-Key` header to make retries safe: a repeat returns the
+    stored result instead of scoring again.
+    """
+    with span("generate_candidate_score", candidate_id=str(payload.get("candidate_id"))):
+        return await idempotent(
+            request, "generate-score", fingerprint(json.dumps(payload, sort_keys=True, default=str)),
+            lambda: _generate_candidate_score(request, payload),
+        )
+
+
+async def _generate_candidate_score(request: Request, payload: dict):
     client_host = request.client.host if request.client else "unknown"
     _candidate_id_for_log = "-"
     _job_id_for_log = "-"
@@ -60,7 +79,7 @@ async def generate_candidate_score_api(request: Request, payload: dict = Body(..
 
         # Fetch candidate
         query = {"_id": ObjectId(candidate_id)} if ObjectId.is_valid(candidate_id) else {"id": candidate_id}
-        candidate = db["candidates"].find_one({**query, "deleted": False})
+        candidate = await candidate_repo.find_one({**query, "deleted": False})
         if not candidate:
             _safe_log_warning(f"Candidate not found in DB - candidate_id={candidate_id}")
             raise HTTPException(status_code=404, detail="Candidate not found")
@@ -73,8 +92,7 @@ async def generate_candidate_score_api(request: Request, payload: dict = Body(..
         # Fetch job using job_id from candidate
         job = None
         if candidate.get("job_id"):
-            job_query = {"_id": ObjectId(candidate["job_id"])} if ObjectId.is_valid(str(candidate["job_id"])) else {"id": candidate["job_id"]}
-            job = db["jobs"].find_one(job_query)
+            job = await job_repo.get_cached(candidate["job_id"], include_deleted=True)
             if job:
                 job["id"] = str(job["_id"])
                 job.pop("_id", None)
@@ -91,10 +109,7 @@ async def generate_candidate_score_api(request: Request, payload: dict = Body(..
         resume_parts.append(f"Location: {candidate.get('location', '')}")
         resume_parts.append(f"Years of Experience: {candidate.get('years_of_experience', '')}")
         resume_parts.append(f"Skills: {', '.join(candidate.get('skills', []))}")
-        if job:
-            resume_parts.append(f"Applying for Job: {job.get('title', '')}")
-            resume_parts.append(f"Job Description: {job.get('description', '')}")
-            resume_parts.append(f"Required Skills: {', '.join(job.get('skills', []))}")
+        # Job details are sent once, as the prompt's JOB DESCRIPTION section (see build_scoring_prompt)
         resume_text = "\n".join([p for p in resume_parts if p])
 
         # Candidate/Job objects
@@ -115,18 +130,24 @@ async def generate_candidate_score_api(request: Request, payload: dict = Body(..
         # Generate score
         _safe_log_info(f"Generating dynamic score (client={client_host})", candidate_id=_candidate_id_for_log, job_id=_job_id_for_log)
         try:
-            candidate_score: CandidateScore = await generate_candidate_score(
-                candidate_data=(candidate_obj.model_dump() if candidate_obj else candidate),
-                job_data=(job_obj.model_dump() if job_obj else (job or {})),
-                resume_text=resume_text
-            )
+            with span("score_candidate"):
+                candidate_score: CandidateScore = await generate_candidate_score(
+                    candidate_data=(candidate_obj.model_dump() if candidate_obj else candidate),
+                    # stored updated_at (not the model's utcnow default) versions the cached job context
+                    job_data=(
+                        {**job_obj.model_dump(), "skills": job.get("skills", []), "updated_at": job.get("updated_at")}
+                        if job_obj else (job or {})
+                    ),
+                    resume_text=resume_text
+                )
             _safe_log_info(f"Generated score - overall={candidate_score.overall_score}", candidate_id=_candidate_id_for_log, job_id=_job_id_for_log)
+        except (DeadlineExceeded, PoolSaturated):
+            raise
         except Exception as e:
             _safe_log_error(f"Error generating candidate score: {e}", candidate_id=_candidate_id_for_log, job_id=_job_id_for_log)
             raise HTTPException(status_code=500, detail=f"Error generating candidate score: {str(e)}")
 
         # Upsert candidate_score in DB
-        query = {"candidate_id": candidate_score.candidate_id, "job_id": candidate_score.job_id}
         now = datetime.utcnow()
         doc = candidate_score.model_dump()
         doc["updated_at"] = now
@@ -135,25 +156,25 @@ async def generate_candidate_score_api(request: Request, payload: dict = Body(..
         created_on_insert = {"created_at": candidate_score.created_at}
         set_doc.pop("created_at", None)
 
-        db["candidate_scores"].update_one(
-            query,
-            {"$set": set_doc, "$setOnInsert": created_on_insert},
-            upsert=True
-        )
+        with span("store_score"):
+            await score_repo.upsert_score(
+                candidate_score.candidate_id, candidate_score.job_id, set_doc, created_on_insert
+            )
+            await candidate_cards.refresh_candidate_ids([candidate_score.candidate_id])
         _safe_log_info("Stored/updated candidate score in DB", candidate_id=_candidate_id_for_log, job_id=_job_id_for_log)
 
         return {
             "candidates": [
                 {
-                    "candidate": CandidateResponse(**candidate).dict(),
-                    "job": JobResponse(**job).dict() if job else None,
+                    "candidate": candidate_obj.model_dump() if candidate_obj else candidate,
+                    "job": job_obj.model_dump() if job_obj else job,
                     "resume_text": resume_text,
                     "score": candidate_score.model_dump()
                 }
             ]
         }
 
-    except HTTPException:
+    except (HTTPException, DeadlineExceeded):
         raise
     except Exception as e:
         _safe_log_error(f"Unhandled error while generating score: {e}", candidate_id=_candidate_id_for_log, job_id=_job_id_for_log)
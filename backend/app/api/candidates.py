@@ -1,10 +1,22 @@
 # app/api/candidates.py
 import logging
-from fastapi import APIRouter, HTTPException
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request
 from bson import ObjectId
 from pydantic import ValidationError
-from app.core.db import candidates_collection
-from app.models.candidate import CandidateCreate, CandidateUpdate, CandidateResponse
+from app.repositories import candidate_repo
+from app.models.candidate import (
+    CandidateBulkStatusUpdate,
+    CandidateCreate,
+    CandidateResponse,
+    CandidateSummary,
+    CandidateUpdate,
+)
+from app.utils.fields import parse_fields, pick, projection
+from app.utils.http_cache import conditional_json
+from app.utils.serialization import trusted_row
+from app.services import candidate_cards
+from app.services.embedding_pipeline import embedding_pipeline, RESUME_INDEX
 
 router = APIRouter()
 logger = logging.getLogger("candidates_api")
@@ -29,10 +41,12 @@ async def create_candidate(candidate: CandidateCreate):
         # always enforce defaults
         doc.update({"deleted": False, "status": "active"})
 
-        result = candidates_collection.insert_one(doc)
-        saved = candidates_collection.find_one({"_id": result.inserted_id})
+        # the response is built from the inserted document: no read-back round trip
+        doc["_id"] = await candidate_repo.insert(doc)
+        embedding_pipeline.enqueue_candidate(doc)
+        await candidate_cards.refresh_candidates([doc])
 
-        return CandidateResponse.model_validate(normalize_mongo_doc(saved))
+        return CandidateResponse.model_validate(normalize_mongo_doc(doc))
     except ValidationError as ve:
         logger.exception("Validation error on create_candidate")
         raise HTTPException(status_code=422, detail=ve.errors())
@@ -42,11 +56,28 @@ async def create_candidate(candidate: CandidateCreate):
 
 
 # Get all (exclude soft-deleted)
-@router.get("/", response_model=list[CandidateResponse])
-async def get_all_candidates():
+@router.get(
+    "/",
+    response_model=list[CandidateResponse],
+    responses={200: {"description": "Full documents, or only `fields` (see CandidateSummary for `fields=summary`)"}},
+)
+async def get_all_candidates(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, or 'summary' for table views"),
+):
     try:
-        docs = candidates_collection.find({"deleted": False})
-        return [CandidateResponse.model_validate(normalize_mongo_doc(d)) for d in docs]
+        selected = parse_fields(fields, CandidateResponse.model_fields, list(CandidateSummary.model_fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    try:
+        docs = await candidate_repo.find_many(projection=projection(selected))
+        if selected:
+            rows = [pick(normalize_mongo_doc(d), selected) for d in docs]
+        else:
+            # documents were validated on write: build rows directly, render once with orjson
+            rows = [trusted_row(CandidateResponse, normalize_mongo_doc(d)) for d in docs]
+        # content-hash ETag: an unchanged list is answered with a bodiless 304
+        return conditional_json(request, rows)
     except Exception:
         logger.exception("Failed to fetch candidates")
         raise HTTPException(status_code=500, detail="Failed to fetch candidates")
@@ -56,7 +87,7 @@ async def get_all_candidates():
 @router.get("/{candidate_id}", response_model=CandidateResponse)
 async def get_candidate_by_id(candidate_id: str):
     try:
-        d = candidates_collection.find_one({"_id": ObjectId(candidate_id), "deleted": False})
+        d = await candidate_repo.find_by_id(ObjectId(candidate_id))
         if not d:
             raise HTTPException(status_code=404, detail="Candidate not found")
         return CandidateResponse.model_validate(normalize_mongo_doc(d))
@@ -72,14 +103,12 @@ async def get_candidate_by_id(candidate_id: str):
 async def update_candidate(candidate_id: str, updates: CandidateUpdate):
     try:
         update_data = {k: v for k, v in updates.model_dump().items() if v is not None}
-        res = candidates_collection.update_one(
-            {"_id": ObjectId(candidate_id), "deleted": False},
-            {"$set": update_data},
-        )
-        if res.matched_count == 0:
+        d = await candidate_repo.update_and_get(ObjectId(candidate_id), update_data)
+        if not d:
             raise HTTPException(status_code=404, detail="Candidate not found")
 
-        d = candidates_collection.find_one({"_id": ObjectId(candidate_id)})
+        embedding_pipeline.enqueue_candidate(d)
+        await candidate_cards.refresh_candidates([d])
         return CandidateResponse.model_validate(normalize_mongo_doc(d))
     except HTTPException:
         raise
@@ -92,11 +121,11 @@ async def update_candidate(candidate_id: str, updates: CandidateUpdate):
 @router.delete("/{candidate_id}")
 async def soft_delete_candidate(candidate_id: str):
     try:
-        res = candidates_collection.update_one(
-            {"_id": ObjectId(candidate_id)}, {"$set": {"deleted": True}}
-        )
-        if res.matched_count == 0:
+        matched = await candidate_repo.soft_delete(ObjectId(candidate_id))
+        if matched == 0:
             raise HTTPException(status_code=404, detail="Candidate not found")
+        embedding_pipeline.remove(RESUME_INDEX, candidate_id)
+        await candidate_cards.remove_candidate(ObjectId(candidate_id))
         return {"message": "Candidate soft deleted successfully"}
     except HTTPException:
         raise
@@ -109,15 +138,35 @@ async def soft_delete_candidate(candidate_id: str):
 @router.patch("/{candidate_id}/inactive")
 async def inactivate_candidate(candidate_id: str):
     try:
-        res = candidates_collection.update_one(
-            {"_id": ObjectId(candidate_id), "deleted": False},
-            {"$set": {"status": "inactive"}},
-        )
-        if res.matched_count == 0:
+        d = await candidate_repo.update_and_get(ObjectId(candidate_id), {"status": "inactive"})
+        if not d:
             raise HTTPException(status_code=404, detail="Candidate not found")
+        embedding_pipeline.enqueue_candidate(d)  # status is a search filter field
+        await candidate_cards.refresh_candidates([d])
         return {"message": "Candidate marked as inactive"}
     except HTTPException:
         raise
     except Exception:
         logger.exception(f"Failed to inactivate candidate {candidate_id}")
         raise HTTPException(status_code=500, detail="Failed to inactivate candidate")
+
+
+# Bulk status change
+@router.patch("/bulk-status")
+async def bulk_update_candidate_status(payload: CandidateBulkStatusUpdate):
+    """Set `status` on many candidates with one bulk_write."""
+    try:
+        matched, modified = await candidate_repo.bulk_update(payload.candidate_ids, {"status": payload.status})
+        docs = await candidate_repo.find_by_ids(payload.candidate_ids)
+        unique = list({str(d["_id"]): d for d in docs.values()}.values())
+        for d in unique:
+            embedding_pipeline.enqueue_candidate(d)
+        await candidate_cards.refresh_candidates(unique)
+        return {
+            "matched": matched,
+            "modified": modified,
+            "not_found": [c for c in payload.candidate_ids if c not in docs],
+        }
+    except Exception:
+        logger.exception("Failed to bulk update candidate status")
+        raise HTTPException(status_code=500, detail="Failed to update candidates")
@@ -1,11 +1,16 @@
 # app/api/jobs.py
-from fastapi import APIRouter, Body, HTTPException
-from typing import List
+from fastapi import APIRouter, Body, HTTPException, Query, Request
+from typing import List, Optional
 from datetime import datetime
 from bson import ObjectId
 
-from app.models.job import JobCreate, JobUpdate, JobInDB, JobResponse
-from app.core.db import jobs_collection
+from app.models.job import JobBulkStatusUpdate, JobCreate, JobUpdate, JobInDB, JobResponse, JobSummary
+from app.repositories import job_repo, normalize
+from app.services import candidate_cards
+from app.services.embedding_pipeline import embedding_pipeline, JOB_INDEX
+from app.utils.fields import parse_fields, pick, projection
+from app.utils.http_cache import conditional_json, weak_etag
+from app.utils.serialization import dumps, trusted_row
 
 router = APIRouter(
     prefix="/jobs",
@@ -38,29 +43,59 @@ def job_doc_to_response(doc) -> JobResponse:
         is_deleted=doc.get("is_deleted", False),
     )
 
-@router.get("/", response_model=List[JobResponse])
-async def get_all_jobs():
-    jobs = jobs_collection.find({"is_deleted": False})
-    return [job_doc_to_response(j) for j in jobs]
+@router.get(
+    "/",
+    response_model=List[JobResponse],
+    responses={200: {"description": "Full documents, or only `fields` (see JobSummary for `fields=summary`)"}},
+)
+async def get_all_jobs(
+    request: Request,
+    fields: Optional[str] = Query(None, description="Comma-separated fields, or 'summary' for table views"),
+):
+    """
+    Served from a per-worker rendered-body cache (cleared on any job write) with
+    an ETag: repeat loads are a 304 with no Mongo read and no serialization.
+    """
+    try:
+        selected = parse_fields(fields, JobResponse.model_fields, list(JobSummary.model_fields))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def render() -> bytes:
+        jobs = await job_repo.find_many(projection=projection(selected))
+        if selected:
+            return dumps([pick({**j, "id": str(j["_id"])}, selected) for j in jobs])
+        return dumps([trusted_row(JobResponse, normalize(j)) for j in jobs])
+
+    etag, body = await job_repo.cached_page(",".join(selected) if selected else "*", render)
+    return conditional_json(request, body=body, etag=etag)
+
+@router.get("/cache/stats", response_model=dict)
+async def job_cache_stats():
+    """Hit ratio and size of this worker's job cache."""
+    return job_repo.cache.stats()
 
 @router.get("/{job_id}", response_model=JobResponse)
-async def get_job_by_id(job_id: str):
-    job = jobs_collection.find_one({"_id": ObjectId(job_id), "is_deleted": False})
+async def get_job_by_id(request: Request, job_id: str):
+    job = await job_repo.get_cached(job_id)
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job_doc_to_response(job)
+    # every write sets updated_at, so (id, updated_at) versions the document
+    etag = weak_etag(job["_id"], job.get("updated_at"))
+    return conditional_json(request, trusted_row(JobResponse, normalize(job)), etag=etag)
 
 @router.post("/", response_model=JobResponse, status_code=201)
 async def create_job(payload: JobCreate):
-    new_job = payload.dict()
+    new_job = payload.model_dump()
     new_job.update({
         "created_at": datetime.utcnow(),
         "updated_at": datetime.utcnow(),
         "is_deleted": False,
     })
-    result = jobs_collection.insert_one(new_job)
-    job = jobs_collection.find_one({"_id": result.inserted_id})
-    return job_doc_to_response(job)
+    new_job["_id"] = await job_repo.insert(new_job)  # respond from the inserted document
+    job_repo.invalidate(new_job["_id"])
+    embedding_pipeline.enqueue_job(new_job)
+    return job_doc_to_response(new_job)
 
 
 @router.put("/{job_id}", response_model=JobResponse)
@@ -68,25 +103,24 @@ async def update_job(job_id: str, payload: JobUpdate):
     update_data = payload.dict(exclude_unset=True)
     update_data["updated_at"] = datetime.utcnow()
 
-    result = jobs_collection.update_one(
-        {"_id": ObjectId(job_id), "is_deleted": False},
-        {"$set": update_data},
-    )
-    if result.matched_count == 0:
+    job = await job_repo.update_and_get(ObjectId(job_id), update_data)
+    if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    job_repo.invalidate(job_id)
 
-    job = jobs_collection.find_one({"_id": ObjectId(job_id)})
+    embedding_pipeline.enqueue_job(job)
+    await candidate_cards.refresh_job(job)
     return job_doc_to_response(job)
 
 @router.delete("/{job_id}", response_model=dict)
 async def soft_delete_job(job_id: str):
-    result = jobs_collection.update_one(
-        {"_id": ObjectId(job_id)},
-        {"$set": {"is_deleted": True, "updated_at": datetime.utcnow()}},
-    )
-    if result.matched_count == 0:
+    matched = await job_repo.soft_delete(ObjectId(job_id), {"updated_at": datetime.utcnow()})
+    if matched == 0:
         raise HTTPException(status_code=404, detail="Job not found")
+    job_repo.invalidate(job_id)
 
+    embedding_pipeline.remove(JOB_INDEX, job_id)
+    await candidate_cards.refresh_job(await job_repo.find_by_id(ObjectId(job_id), include_deleted=True))
     return {"message": f"Job {job_id} deleted successfully"}
 
 @router.patch("/{job_id}/status", response_model=JobResponse)
@@ -94,13 +128,33 @@ async def update_job_status(job_id: str, status: int = Body(..., embed=True)):
     if status not in [0, 1]:
         raise HTTPException(status_code=400, detail="Invalid status value")
 
-    result = jobs_collection.update_one(
-        {"_id": ObjectId(job_id), "is_deleted": False},
-        {"$set": {"status": status, "updated_at": datetime.utcnow()}},
+    job = await job_repo.update_and_get(
+        ObjectId(job_id), {"status": status, "updated_at": datetime.utcnow()}
     )
 
-    if result.matched_count == 0:
+    if not job:
         raise HTTPException(status_code=404, detail="Job not found")
+    job_repo.invalidate(job_id)
 
-    job = jobs_collection.find_one({"_id": ObjectId(job_id)})
-    return job_doc_to_response(job)
\ No newline at end of file
+    embedding_pipeline.enqueue_job(job)
+    await candidate_cards.refresh_job(job)
+    return job_doc_to_response(job)
+
+@router.patch("/bulk-status", response_model=dict)
+async def bulk_update_job_status(payload: JobBulkStatusUpdate):
+    """Set `status` on many jobs with one bulk_write."""
+    matched, modified = await job_repo.bulk_update(
+        payload.job_ids, {"status": payload.status, "updated_at": datetime.utcnow()}
+    )
+    for job_id in payload.job_ids:
+        job_repo.invalidate(job_id)
+    jobs = await job_repo.find_by_ids(payload.job_ids)
+    unique = list({str(j["_id"]): j for j in jobs.values()}.values())
+    for job in unique:
+        embedding_pipeline.enqueue_job(job)
+    await candidate_cards.refresh_jobs(unique)
+    return {
+        "matched": matched,
+        "modified": modified,
+        "not_found": [j for j in payload.job_ids if j not in jobs],
+    }
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
+from app.core.deadline import DeadlineExceeded
+from app.core.executors import PoolSaturated
 from app.services.llm  import llm_service
 
 router = APIRouter(prefix="/llm", tags=["LLM"])
@@ -21,6 +23,8 @@ async def generate_text(request: PromptRequest):
     try:
         result = await llm_service.generate_response(request.prompt)
         return {"response": result}
+    except (DeadlineExceeded, PoolSaturated):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -32,5 +36,7 @@ async def chat_with_llm(request: ChatRequest):
     try:
         result = await llm_service.generate_chat(request.history, request.user_input)
         return {"response": result}
+    except (DeadlineExceeded, PoolSaturated):
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -2,18 +2,19 @@ import logging
 from logging.handlers import RotatingFileHandler
 from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 from fastapi.responses import StreamingResponse
-from bson import ObjectId
 import gridfs
-from app.core.db import db
 import mimetypes
-import io
-import asyncio
+from app.core.deadline import DeadlineExceeded
+from app.core.executors import PoolSaturated, extraction_pool, llm_pool
+from app.core.tracing import span
+from app.repositories import resume_repo
 from app.services.resume_parser import ResumeParserService
 from app.utils.text_extractor import extract_text_from_file  # ✅ add util
+from app.utils.http_cache import IMMUTABLE, etag_matches, not_modified, weak_etag
+from app.services.idempotency import fingerprint, idempotent
 
 # Router & GridFS
 router = APIRouter()
-fs = gridfs.GridFS(db)
 parser = ResumeParserService()
 
 # Logging setup
@@ -32,20 +33,31 @@ logger.addHandler(handler)
 @router.post("/upload")
 async def upload_resume(request: Request, file: UploadFile = File(...)):
     logger.info(f"Received resume upload from {request.client.host}")
-    try:
+    with span("upload_resume", filename=file.filename) as trace:
         # Read file content once
         file_bytes = await file.read()
+        trace.set(bytes=len(file_bytes))
+        # with an `Idempotency-Key`, a retried upload returns the first result (no second GridFS write / LLM call)
+        return await idempotent(
+            request, "resume-upload", fingerprint(file.filename, file_bytes),
+            lambda: _store_and_parse(file, file_bytes),
+        )
+
 
+async def _store_and_parse(file: UploadFile, file_bytes: bytes):
+    try:
         # Store in GridFS
-        file_id = fs.put(file_bytes, filename=file.filename, content_type=file.content_type)
+        with span("gridfs_put"):
+            file_id = await resume_repo.put_file(file_bytes, file.filename, file.content_type)
         logger.info(f"Stored file in GridFS: {file_id}")
 
-        # ✅ Extract text from uploaded file
-        text = extract_text_from_file(file.filename, file_bytes)
-
-        # Run parsing in background thread
-        loop = asyncio.get_event_loop()
-        parsed_data = await loop.run_in_executor(None, lambda: parser.parse_resume(text))
+        # ✅ Extract text + parse on their stage pools, both bounded by the request deadline
+        # (the request is cancelled if the client disconnects meanwhile)
+        with span("extract_text") as stage:
+            text = await extraction_pool.run(extract_text_from_file, file.filename, file_bytes)
+            stage.set(chars=len(text))
+        with span("parse_resume"):
+            parsed_data = await llm_pool.run(parser.parse_resume, text)
 
         response = {
             "message": "Resume uploaded & parsed successfully",
@@ -57,6 +69,8 @@ async def upload_resume(request: Request, file: UploadFile = File(...)):
         }
         logger.info(f"Upload success response: {response}")
         return response
+    except (DeadlineExceeded, PoolSaturated):
+        raise
     except Exception as e:
         logger.error(f"Upload error: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=f"Error processing resume: {str(e)}")
@@ -65,21 +79,29 @@ async def upload_resume(request: Request, file: UploadFile = File(...)):
 @router.get("/{file_id}")
 async def download_resume(request: Request, file_id: str):
     logger.info(f"Download request for file {file_id} from {request.client.host}")
+    # GridFS files are never modified in place: the id is the version
+    etag = weak_etag(file_id)
+    if etag_matches(request, etag):
+        return not_modified(etag, IMMUTABLE)
     try:
-        file = fs.get(ObjectId(file_id))
-        if not file:
-            logger.warning(f"File not found: {file_id}")
-            raise HTTPException(status_code=404, detail="File not found")
+        filename, chunks = await resume_repo.open_file(file_id)
 
-        mime_type, _ = mimetypes.guess_type(file.filename)
+        mime_type, _ = mimetypes.guess_type(filename)
         mime_type = mime_type or "application/octet-stream"
 
-        logger.info(f"Serving file {file.filename}")
+        logger.info(f"Serving file {filename}")
         return StreamingResponse(
-            io.BytesIO(file.read()),
+            chunks,
             media_type=mime_type,
-            headers={"Content-Disposition": f"attachment; filename={file.filename}"}
+            headers={
+                "Content-Disposition": f"attachment; filename={filename}",
+                "ETag": etag,
+                "Cache-Control": IMMUTABLE,
+            }
         )
+    except gridfs.NoFile:
+        logger.warning(f"File not found: {file_id}")
+        raise HTTPException(status_code=404, detail="File not found")
     except Exception as e:
         logger.error(f"Download error {file_id}: {str(e)}", exc_info=True)
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,115 @@
+# app/api/search.py
+import logging
+import time
+from typing import Dict
+
+from bson import ObjectId
+from fastapi import APIRouter, HTTPException, Query
+
+from app.api.jobs import job_doc_to_response
+from app.core.deadline import DeadlineExceeded
+from app.core.executors import PoolSaturated, io_pool
+from app.repositories import candidate_repo, job_repo
+from app.models.candidate import CandidateResponse
+from app.models.search import (
+    CandidateSearchRequest,
+    CandidateSearchResponse,
+    CandidateSearchHit,
+    JobRecommendation,
+    JobRecommendationResponse,
+)
+from app.services.embedding_pipeline import embedding_pipeline, location_tokens, RESUME_INDEX
+
+router = APIRouter(prefix="/search", tags=["Search"])
+logger = logging.getLogger("search_api")
+
+
+def _candidate_filters(payload: CandidateSearchRequest) -> Dict:
+    """Search request -> filter over the resume index metadata (see candidate_filter_metadata)."""
+    filters = {}
+    tokens = location_tokens(payload.location)
+    if tokens:
+        # stored as tokens too: "Pune, India" matches candidates in both, in any order
+        filters["location"] = {"$all": tokens}
+    if payload.min_experience is not None or payload.max_experience is not None:
+        years = {}
+        if payload.min_experience is not None:
+            years["$gte"] = payload.min_experience
+        if payload.max_experience is not None:
+            years["$lte"] = payload.max_experience
+        filters["years"] = years
+    if payload.job_id:
+        filters["job_id"] = payload.job_id
+    if payload.status:
+        filters["status"] = payload.status
+    return filters
+
+
+@router.post("/candidates", response_model=CandidateSearchResponse)
+async def search_candidates(payload: CandidateSearchRequest):
+    """
+    Semantic search over resume embeddings, filtered by location, experience,
+    job_id and status. Filters are applied inside the ANN search (not after it).
+    """
+    start = time.time()
+    try:
+        hits = await io_pool.run(
+            embedding_pipeline.search, RESUME_INDEX, payload.query, payload.top_k, _candidate_filters(payload)
+        )
+    except (DeadlineExceeded, PoolSaturated):
+        raise
+    except Exception:
+        logger.exception("Semantic candidate search failed")
+        raise HTTPException(status_code=500, detail="Candidate search failed")
+
+    ids = [ObjectId(ref_id) for ref_id, _ in hits if ObjectId.is_valid(ref_id)]
+    docs = {str(d["_id"]): d for d in await candidate_repo.find_many({"_id": {"$in": ids}})}
+
+    results = []
+    for ref_id, similarity in hits:
+        doc = docs.get(ref_id)
+        if not doc:
+            continue
+        doc = {**doc}
+        doc["id"] = str(doc.pop("_id"))
+        results.append(CandidateSearchHit(candidate=CandidateResponse(**doc), similarity=round(similarity, 4)))
+
+    return CandidateSearchResponse(results=results, took_ms=int((time.time() - start) * 1000))
+
+
+@router.get("/candidates/{candidate_id}/jobs", response_model=JobRecommendationResponse)
+async def recommend_jobs_for_candidate(
+    candidate_id: str,
+    top_n: int = Query(5, ge=1, le=50),
+    include_current: bool = Query(False, description="Include the job the candidate applied for"),
+):
+    """
+    Top-N open jobs (status == 1) for a candidate, ranked by embedding similarity
+    against the job index. No LLM scoring is involved.
+    """
+    start = time.time()
+    if not ObjectId.is_valid(candidate_id):
+        raise HTTPException(status_code=400, detail="Invalid candidate_id")
+    candidate = await candidate_repo.find_by_id(ObjectId(candidate_id))
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+
+    exclude = None if include_current else candidate.get("job_id")
+    try:
+        hits = await io_pool.run(embedding_pipeline.recommend_jobs, candidate, top_n, exclude)
+    except (DeadlineExceeded, PoolSaturated):
+        raise
+    except Exception:
+        logger.exception(f"Job recommendation failed for candidate {candidate_id}")
+        raise HTTPException(status_code=500, detail="Job recommendation failed")
+
+    ids = [ObjectId(ref_id) for ref_id, _ in hits if ObjectId.is_valid(ref_id)]
+    jobs = {str(j["_id"]): j for j in await job_repo.find_many({"_id": {"$in": ids}, "status": 1})}
+    results = [
+        JobRecommendation(job=job_doc_to_response(jobs[ref_id]), similarity=round(similarity, 4))
+        for ref_id, similarity in hits
+        if ref_id in jobs
+    ]
+    return JobRecommendationResponse(
+        candidate_id=candidate_id, results=results, took_ms=int((time.time() - start) * 1000)
+    )
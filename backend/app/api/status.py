@@ -1,13 +1,15 @@
 # app/api/status.py
 
-import socket
-import os
-import time
-import requests
+from typing import Optional
 from fastapi import APIRouter
+from fastapi import HTTPException, Response
 from fastapi.responses import HTMLResponse, JSONResponse
-from app.core.db import client
 from app.core.config import settings
+from app.core import metrics, tracing
+from app.core.executors import pool_stats
+from app.services import idempotency
+from app.services.health import health_monitor
+from app.utils.serialization import FastJSONResponse
 
 router = APIRouter()
 
@@ -15,115 +17,47 @@ router = APIRouter()
 API_HITS = {"health": 0, "system_health": 0}
 
 
-def check_mongodb():
-    start = time.time()
-    try:
-        client.admin.command("ping")
-        return "ok", time.time() - start
-    except Exception as e:
-        return f"error: {str(e)}", time.time() - start
-
-
-def check_logging():
-    start = time.time()
-    try:
-        log_dir = os.path.dirname(settings.LOG_FILE)
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir)
-        with open(settings.LOG_FILE, "a") as f:
-            f.write("")
-        return "ok", time.time() - start
-    except Exception as e:
-        return f"error: {str(e)}", time.time() - start
-
-
-def check_env():
-    start = time.time()
-    required_envs = ["MONGO_URI", "MONGO_DB_NAME", "ENCRYPTION_KEY", "JWT_SECRET_KEY"]
-    missing_envs = [
-        var for var in required_envs
-        if not getattr(settings, var, None) or getattr(settings, var) in ["", "None"]
-    ]
-    result = "ok" if not missing_envs else f"missing: {', '.join(missing_envs)}"
-    return result, time.time() - start
-
-
-def check_network():
-    start = time.time()
-    try:
-        socket.gethostbyname("google.com")
-        return "ok", time.time() - start
-    except Exception as e:
-        return f"error: {str(e)}", time.time() - start
+@router.get("/health/live", response_class=JSONResponse)
+async def liveness():
+    """Liveness probe: the process is serving requests. Runs no checks."""
+    return {"status": "alive"}
 
 
-def check_api(url):
-    """Ping an internal API and return status + response time"""
-    start = time.time()
-    try:
-        response = requests.get(url, timeout=5)
-        if response.status_code == 200:
-            return "ok", time.time() - start
-        else:
-            return f"status {response.status_code}", time.time() - start
-    except Exception as e:
-        return f"error: {str(e)}", time.time() - start
+@router.get("/health/ready", response_class=JSONResponse)
+async def readiness():
+    """Readiness probe from cached checks: 503 until the first round, on a critical failure or during shutdown."""
+    ready, body = health_monitor.readiness()
+    return FastJSONResponse(body, status_code=200 if ready else 503)
 
 
 @router.get("/health", response_class=JSONResponse)
-def health():
-    """Lightweight JSON health check."""
+async def health():
+    """Lightweight JSON health check (cached results of the background checks)."""
     API_HITS["health"] += 1
 
     health_status = {"app": "ok"}
-
-    mongo_status, _ = check_mongodb()
-    health_status["mongodb"] = mongo_status
-
-    logging_status, _ = check_logging()
-    health_status["logging"] = logging_status
-
-    env_status, _ = check_env()
-    health_status["env"] = env_status
-
-    network_status, _ = check_network()
-    health_status["network"] = network_status
-
+    for name, result in health_monitor.snapshot().items():
+        health_status[name] = result["status"]
+    health_status["checked_at"] = health_monitor.checked_at
     health_status["api_hits"] = API_HITS["health"]
 
     return health_status
 
 
 @router.get("/system-health", response_class=HTMLResponse)
-def system_health():
-    """User-friendly system health dashboard."""
+async def system_health():
+    """User-friendly system health dashboard (cached results of the background checks)."""
     API_HITS["system_health"] += 1
 
-    checks = []
-
-    # Core system checks
-    mongodb_status, mongodb_time = check_mongodb()
-    checks.append(("MongoDB", mongodb_status, mongodb_time, mongodb_status == "ok"))
-
-    logging_status, logging_time = check_logging()
-    checks.append(("Logging", logging_status, logging_time, logging_status == "ok"))
-
-    env_status, env_time = check_env()
-    checks.append(("Environment", env_status, env_time, env_status == "ok"))
-
-    network_status, network_time = check_network()
-    checks.append(("Network", network_status, network_time, network_status == "ok"))
-
-    # Internal API checks (update URLs as per your project)
-    internal_apis = [
-        ("Health API", f"http://localhost:{settings.APP_PORT}/health"),
-        # Add other APIs you want to monitor here
-        # ("Users API", f"http://localhost:{settings.APP_PORT}/users"),
-        ("Jobs API", f"http://localhost:{settings.APP_PORT}/api/jobs")
+    labels = {
+        "mongodb": "MongoDB", "env": "Environment", "logging": "Logging", "network": "Network",
+        "executors": "Worker pools", "event_loop": "Event loop",
+    }
+    checks = [
+        (labels.get(name, name), result["status"], result["duration"], result["ok"])
+        for name, result in health_monitor.snapshot().items()
     ]
-    for name, url in internal_apis:
-        status, duration = check_api(url)
-        checks.append((name, status, duration, status == "ok"))
+    checked_at = health_monitor.checked_at.strftime("%Y-%m-%d %H:%M:%S UTC") if health_monitor.checked_at else "pending"
 
     # Build HTML dashboard
     html = f"""
@@ -166,6 +100,7 @@ def system_health():
     html += f"""
             </div>
             <div class="hits">
+                Last checked: {checked_at} |
                 API Hits: /health = {API_HITS['health']} | /system-health = {API_HITS['system_health']}
             </div>
         </body>
@@ -173,3 +108,31 @@ def system_health():
     """
 
     return HTMLResponse(content=html)
+
+
+@router.get("/idempotency/stats", response_class=JSONResponse)
+def idempotency_stats():
+    """Idempotency-Key counters of this worker, including LLM calls saved by replays."""
+    return idempotency.stats
+
+
+@router.get("/executors/stats", response_class=JSONResponse)
+def executor_stats():
+    """Stage thread pools of this worker: running / queued calls, rejections and utilization."""
+    return pool_stats()
+
+
+@router.get("/metrics", include_in_schema=False)
+def prometheus_metrics():
+    """Prometheus scrape endpoint (text format) for this worker."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+@router.get("/debug/traces", response_class=JSONResponse)
+def slowest_traces(limit: int = 10, name: Optional[str] = None):
+    """Slowest recent traces of this worker with per-stage self time (`name`: e.g. upload_resume)."""
+    if not settings.TRACING_ENABLED:
+        raise HTTPException(status_code=404, detail="Tracing is disabled")
+    return tracing.slowest_traces(max(1, min(limit, 100)), name)
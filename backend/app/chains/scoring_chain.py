@@ -2,27 +2,149 @@
 
 import json
 import logging
+import threading
 import uuid
-from typing import Dict, Optional
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 
 from app.models.scoring import CandidateScore, ScoringBreakdown, SentimentAnalysis
 from app.chains.scoring_prompt import scoring_prompt_template
+from app.core.deadline import DeadlineExceeded
+from app.core.executors import PoolSaturated
+from app.core.metrics import track_cache
 from app.services.llm import llm_service
+from app.utils.text_utils import html_to_text, dedupe_lines, estimate_tokens
 
 logger = logging.getLogger("scoring_chain")
 logger.setLevel(logging.INFO)
 
+# Running totals of prompt sizes (estimated tokens) before/after compaction
+PROMPT_TOKEN_STATS = {"prompts": 0, "tokens_before": 0, "tokens_after": 0}
+
+# ------------------------------
+# Prompt construction
+# ------------------------------
+_JOB_CONTEXT_CACHE_SIZE = 512
+_job_context_cache: "OrderedDict[Tuple[str, str], str]" = OrderedDict()
+_job_context_lock = threading.Lock()
+_job_context_stats = {"hits": 0, "misses": 0}
+track_cache("scoring_job_context", lambda: (_job_context_stats["hits"], _job_context_stats["misses"]))
+
+
+def _job_version_key(job_data: Dict) -> Optional[Tuple[str, str]]:
+    # `updated_at` as stored: every job write sets it, documents without one keep an empty version
+    job_id = job_data.get("id") or job_data.get("_id")
+    if not job_id:
+        return None
+    return str(job_id), str(job_data.get("updated_at") or "")
+
+
+def compact_job_description(job_data: Optional[Dict]) -> str:
+    """
+    Plain-text job context for the scoring prompt (title, description, required skills).
+    Converted from HTML once per job version (id + updated_at) and cached.
+    """
+    if not job_data:
+        return ""
+
+    key = _job_version_key(job_data)
+    if key is not None:
+        with _job_context_lock:
+            cached = _job_context_cache.get(key)
+            if cached is not None:
+                _job_context_cache.move_to_end(key)
+                _job_context_stats["hits"] += 1
+                return cached
+            _job_context_stats["misses"] += 1
+
+    parts = []
+    if job_data.get("title"):
+        parts.append(f"Title: {job_data['title']}")
+    description = html_to_text(job_data.get("description"))
+    if description:
+        parts.append(description)
+    skills = job_data.get("skills") or []
+    if skills:
+        parts.append(f"Required Skills: {', '.join(skills)}")
+    text = dedupe_lines("\n".join(parts))
+
+    if key is not None:
+        with _job_context_lock:
+            _job_context_cache[key] = text
+            _job_context_cache.move_to_end(key)
+            while len(_job_context_cache) > _JOB_CONTEXT_CACHE_SIZE:
+                _job_context_cache.popitem(last=False)
+    return text
+
+
+def _legacy_resume_text(resume_text: str, job_data: Optional[Dict]) -> str:
+    parts = [resume_text or ""]
+    if job_data:
+        parts.append(f"Applying for Job: {job_data.get('title', '')}")
+        parts.append(f"Job Description: {job_data.get('description', '')}")
+        parts.append(f"Required Skills: {', '.join(job_data.get('skills', []) or [])}")
+    return "\n".join(p for p in parts if p)
+
+
+def build_scoring_prompt(candidate_data: Dict, job_data: Dict, resume_text: str) -> Tuple[str, Dict]:
+    """
+    Build the compacted scoring prompt.
+    - job HTML is reduced to cached plain text and sent once (JOB DESCRIPTION section only)
+    - resume lines repeating the candidate header or the job context are removed
+    Returns (prompt, stats) where stats holds estimated token counts before/after compaction.
+    """
+    candidate_name = candidate_data.get("name", "") or ""
+    skills = ", ".join(candidate_data.get("skills", []) or [])
+    experience = str(candidate_data.get("years_of_experience", 0))
+
+    job_context = compact_job_description(job_data)
+    header_lines = [
+        f"Name: {candidate_name}",
+        f"Candidate Name: {candidate_name}",
+        f"Skills: {skills}",
+        f"Years of Experience: {experience}",
+    ]
+    compact_resume = dedupe_lines(
+        html_to_text(resume_text),
+        seen=header_lines + job_context.split("\n"),
+    )
+
+    prompt = scoring_prompt_template.format(
+        candidate_name=candidate_name,
+        skills=skills,
+        experience=experience,
+        resume_text=compact_resume,
+        job_description=job_context,
+    )
+
+    # Size of the prompt as it was built before compaction: raw HTML, and the job
+    # title / description / skills repeated inside resume_text by the scoring API
+    raw_prompt = scoring_prompt_template.format(
+        candidate_name=candidate_name,
+        skills=skills,
+        experience=experience,
+        resume_text=_legacy_resume_text(resume_text, job_data),
+        job_description=(job_data.get("description") if job_data else "") or "",
+    )
+    stats = {
+        "tokens_before": estimate_tokens(raw_prompt),
+        "tokens_after": estimate_tokens(prompt),
+    }
+    PROMPT_TOKEN_STATS["prompts"] += 1
+    PROMPT_TOKEN_STATS["tokens_before"] += stats["tokens_before"]
+    PROMPT_TOKEN_STATS["tokens_after"] += stats["tokens_after"]
+    return prompt, stats
+
+
 # ------------------------------
 # LLM-assisted extraction
 # ------------------------------
 async def extract_scores(candidate_data: Dict, job_data: Dict, resume_text: str) -> Dict:
-    prompt = scoring_prompt_template.format(
-        candidate_name=candidate_data.get("name", ""),
-        skills=", ".join(candidate_data.get("skills", []) or []),
-        experience=str(candidate_data.get("years_of_experience", 0)),
-        resume_text=resume_text or "",
-        job_description=(job_data.get("description") if job_data else "") or ""
+    prompt, stats = build_scoring_prompt(candidate_data, job_data, resume_text)
+    logger.info(
+        f"Scoring prompt tokens (estimated): before={stats['tokens_before']} "
+        f"after={stats['tokens_after']}"
     )
 
     logger.info("===== LLM Scoring Prompt =====")
@@ -32,7 +154,7 @@ async def extract_scores(candidate_data: Dict, job_data: Dict, resume_text: str)
     logger.info("===== END PROMPT =====")
 
     try:
-        raw = await llm_service.generate_response(prompt)
+        raw = await llm_service.generate_response(prompt, site="extract_scores")
         logger.info("===== LLM Raw Response =====")
         logger.info(raw[:2000])
         logger.info("===== END LLM Raw Response =====")
@@ -62,6 +184,8 @@ async def extract_scores(candidate_data: Dict, job_data: Dict, resume_text: str)
 
         return data
 
+    except (DeadlineExceeded, PoolSaturated):
+        raise  # abandoned / expired / shed request: store nothing rather than all-zero scores
     except Exception as e:
         logger.exception(f"[extract_scores] Error: {e}")
         return {}
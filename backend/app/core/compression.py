@@ -0,0 +1,173 @@
+# app/core/compression.py
+# Response compression: brotli when the client accepts it and the `brotli`
+# package is installed, gzip otherwise; bodies under COMPRESSION_MIN_SIZE are sent as is.
+# Self-contained ASGI send wrapper: only Starlette's public Headers types are used.
+import zlib
+from typing import Callable, Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+THREAD_MINIMUM_SIZE = 128 * 1024
+# media types that are already compressed (or must be streamed as is); "type/*" matches a whole family
+EXCLUDED_CONTENT_TYPES = frozenset({
+    "application/gzip",
+    "application/x-gzip",
+    "application/zip",
+    "application/grpc",
+    "audio/*",
+    "font/woff",
+    "font/woff2",
+    "image/avif",
+    "image/gif",
+    "image/jpeg",
+    "image/png",
+    "image/webp",
+    "text/event-stream",
+    "video/*",
+    # resume downloads
+    "application/pdf",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+})
+
+# (body, more_body) -> compressed bytes; one instance per response stream
+Compressor = Callable[[bytes, bool], bytes]
+
+
+def accepted_encodings(header: str) -> set:
+    """Accept-Encoding -> codings with a non-zero q value."""
+    accepted = set()
+    for item in header.split(","):
+        coding, _, params = item.strip().partition(";")
+        q = params.strip().removeprefix("q=")
+        try:
+            if params and float(q) == 0:
+                continue
+        except ValueError:
+            pass
+        if coding:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def is_excluded(content_type: str) -> bool:
+    media_type = content_type.partition(";")[0].strip().lower()
+    if media_type.startswith("application/grpc+"):
+        media_type = "application/grpc"
+    return media_type in EXCLUDED_CONTENT_TYPES or media_type.partition("/")[0] + "/*" in EXCLUDED_CONTENT_TYPES
+
+
+def gzip_compressor(level: int) -> Compressor:
+    stream = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)  # gzip container
+    return lambda body, more_body: stream.compress(body) + stream.flush(
+        zlib.Z_SYNC_FLUSH if more_body else zlib.Z_FINISH
+    )
+
+
+def brotli_compressor(quality: int) -> Compressor:
+    stream = brotli.Compressor(quality=quality)
+    return lambda body, more_body: stream.process(body) + (stream.flush() if more_body else stream.finish())
+
+
+class CompressionResponder:
+    """
+    Wraps `send` for one response. The start message is held back until the first
+    body chunk shows whether to compress: not when the app already set a
+    Content-Encoding, for 206 responses, excluded media types, or a complete body
+    under `minimum_size`. Streamed bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int, encoding: str, compressor: Compressor):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoding = encoding
+        self.compressor = compressor
+        self.send: Optional[Send] = None
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.compressing = False
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        self.send = send
+        await self.app(scope, receive, self.send_compressed)
+
+    async def compress(self, body: bytes, more_body: bool) -> bytes:
+        if len(body) >= THREAD_MINIMUM_SIZE:
+            # compressing large bodies inline would block the event loop
+            return await anyio.to_thread.run_sync(self.compressor, body, more_body)
+        return self.compressor(body, more_body)
+
+    async def send_compressed(self, message: Message) -> None:
+        kind = message["type"]
+        if kind == "http.response.start":
+            headers = Headers(raw=message["headers"])
+            self.passthrough = (
+                "content-encoding" in headers
+                or message["status"] == 206
+                or is_excluded(headers.get("content-type", ""))
+            )
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+        if self.passthrough or kind != "http.response.body":
+            # early hints / trailers, or a pathsend (file sent by the server, never compressed)
+            if self.start is not None and kind == "http.response.pathsend":
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is None:
+            # later chunk of a stream
+            if self.compressing:
+                message = {**message, "body": await self.compress(body, more_body)}
+            await self.send(message)
+            return
+
+        start, self.start = self.start, None
+        self.compressing = more_body or len(body) >= self.minimum_size
+        if self.compressing:
+            body = await self.compress(body, more_body)
+            headers = MutableHeaders(raw=list(start["headers"]))
+            headers["Content-Encoding"] = self.encoding
+            headers.add_vary_header("Accept-Encoding")
+            if more_body or start.get("trailers", False):
+                del headers["Content-Length"]
+            else:
+                headers["Content-Length"] = str(len(body))
+            start = {**start, "headers": headers.raw}
+            message = {**message, "body": body}
+        await self.send(start)
+        await self.send(message)
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_quality: int = 5):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        accepted = accepted_encodings(Headers(scope=scope).get("accept-encoding", ""))
+        if brotli is not None and "br" in accepted:
+            responder = CompressionResponder(self.app, self.minimum_size, "br", brotli_compressor(self.brotli_quality))
+        elif "gzip" in accepted:
+            responder = CompressionResponder(self.app, self.minimum_size, "gzip", gzip_compressor(self.gzip_level))
+        else:
+            await self.app(scope, receive, send)
+            return
+        await responder(scope, receive, send)
@@ -27,6 +27,43 @@ class Settings(BaseSettings):
     MONGO_URI: str
     MONGO_DB_NAME: str
     ASTRA_DB_API_KEY: str = None  # optional Cassandra/Astra
+    MONGO_ENSURE_INDEXES: bool = True   # apply app/core/indexes.py registry on startup
+    COUNT_CACHE_TTL: int = 30           # seconds listing totals are reused
+    COUNT_CACHE_SIZE: int = 256         # distinct filtered totals kept per collection (LRU)
+    BULK_IMPORT_CHUNK: int = 1000       # NDJSON rows validated + inserted per insert_many
+    JOB_CACHE_SIZE: int = 2000          # cached job documents per worker (2 keys when a legacy id exists)
+    JOB_CACHE_TTL: int = 300            # seconds; bounds staleness when change streams are unavailable
+    JOB_CACHE_WATCH: bool = True        # invalidate across workers via a change stream (replica set only)
+    CANDIDATE_CARDS_READS: bool = False  # serve the listing from candidate_cards (run `rebuild` first)
+    IDEMPOTENCY_TTL: int = 86400        # seconds a stored Idempotency-Key response is replayed
+    IDEMPOTENCY_LOCK_TIMEOUT: int = 300  # seconds before a stuck in-progress key can be taken over
+    IDEMPOTENCY_WAIT_TIMEOUT: int = 120  # seconds a duplicate waits for the first request, then 409 (capped by the request deadline)
+
+    # ========================
+    # HTTP
+    # ========================
+    COMPRESSION_MIN_SIZE: int = 1024    # bytes; smaller responses are not compressed
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5             # used when the optional `brotli` package is installed
+    REQUEST_TIMEOUT: float = 60         # seconds per request (Mongo + extraction + LLM), then 504
+    REQUEST_TIMEOUT_MAX: float = 300    # cap for the client's `X-Request-Timeout` header
+    REQUEST_TIMEOUT_EXEMPT: str = "/api/bulk/"  # comma-separated path prefixes without a deadline
+    METRICS_ENABLED: bool = True        # GET /metrics (Prometheus) + HTTP / Mongo instrumentation
+    TRACING_ENABLED: bool = True        # stage spans; slowest recent traces at GET /debug/traces
+    TRACE_BUFFER: int = 500             # finished traces kept in memory per worker
+    TRACE_EXPORT: str = "none"          # none | file | otlp
+    TRACE_FILE: str = "logs/traces.jsonl"
+    TRACE_OTLP_ENDPOINT: str = "http://localhost:4318/v1/traces"  # OTLP/HTTP (JSON) collector
+    HEALTH_CHECK_INTERVAL: float = 15   # seconds between background health check rounds (probes read the cache)
+    HEALTH_CHECK_TIMEOUT: float = 5     # seconds per check before it reports an error
+    HEALTH_DNS_HOST: str = "google.com"  # resolved by the network check ("" disables it)
+    # stage thread pools (app/core/executors.py): calls beyond workers + queue get 503
+    EXTRACTION_WORKERS: int = 4         # pdfminer / docx text extraction (CPU bound)
+    EXTRACTION_QUEUE: int = 16
+    LLM_WORKERS: int = 16               # concurrent Gemini calls (parse, score, chat, job generation)
+    LLM_QUEUE: int = 32
+    IO_WORKERS: int = 8                 # vector search / query embedding
+    IO_QUEUE: int = 32
 
     # ========================
     # Security / JWT
@@ -54,6 +91,30 @@ class Settings(BaseSettings):
     VECTORSTORE_PATH: str = "./vectorstore"
     EMBEDDING_MODEL_NAME: str = "gemini-embedding-001"
     VECTOR_DIM: int = 768
+    VECTOR_INDEX_TYPE: str = "flat"          # flat | ivfpq | hnsw
+    VECTOR_IVF_NLIST: int = 1024             # upper bound; scaled down to ~4*sqrt(N) at training time
+    VECTOR_IVF_NPROBE: int = 16
+    VECTOR_PQ_M: int = 64                    # sub-quantizers (must divide VECTOR_DIM)
+    VECTOR_HNSW_M: int = 32
+    VECTOR_HNSW_EF_CONSTRUCTION: int = 200
+    VECTOR_HNSW_EF_SEARCH: int = 64
+    VECTOR_TRAIN_MIN: int = 20000            # ivfpq stays flat until this many vectors exist
+    VECTOR_TRAIN_SAMPLE: int = 100000        # training sample size
+    VECTOR_SNAPSHOT_EVERY: int = 10000       # append-log records before a snapshot
+    VECTOR_SNAPSHOT_INTERVAL: int = 300      # seconds; snapshot a non-empty log at least this often
+    VECTOR_REBUILD_DEAD_RATIO: float = 0.2   # rebuild flat/hnsw bases with more deleted slots than this
+    VECTOR_LOG_FSYNC: bool = True
+    VECTOR_MMAP: bool = False                # load snapshots with IO_FLAG_MMAP (read-only base)
+    VECTOR_PREFILTER_MAX: int = 200000       # filtered searches matching more ids over-fetch instead
+
+    # ========================
+    # Embeddings
+    # ========================
+    EMBEDDING_PROVIDER: str = "gemini"   # gemini | sentence-transformers | hashing (offline, no model)
+    LOCAL_EMBEDDING_MODEL: str = "sentence-transformers/all-mpnet-base-v2"
+    EMBEDDING_BATCH_SIZE: int = 32
+    EMBEDDING_FLUSH_INTERVAL: float = 2.0   # seconds a partial batch may wait before being embedded
+    EMBEDDING_CACHE_SIZE: int = 10000       # in-process entries; Mongo cache is unbounded
 
     # ========================
     # Email / Notifications
@@ -1,14 +1,26 @@
 # app/core/db.py
 import os
 from pymongo import MongoClient
+from motor.motor_asyncio import AsyncIOMotorClient
 from cryptography.fernet import Fernet
 from app.core.config import settings
+from app.core.metrics import mongo_listener
+from app.core.tracing import mongo_span_listener
 
 # Setup encryption
 fernet = Fernet(settings.ENCRYPTION_KEY.encode())
 
-# MongoDB client
-client = MongoClient(settings.MONGO_URI)
+# per-collection command timings for GET /metrics; commands inside a trace as spans
+event_listeners = [mongo_listener] if settings.METRICS_ENABLED else []
+if settings.TRACING_ENABLED:
+    event_listeners.append(mongo_span_listener)
+
+# Async MongoDB client (Motor) - used by routers through app.repositories
+async_client = AsyncIOMotorClient(settings.MONGO_URI, event_listeners=event_listeners)
+async_db = async_client[settings.MONGO_DB_NAME]
+
+# Sync MongoDB client - for scripts, CLI tools and worker threads (embedding pipeline)
+client = MongoClient(settings.MONGO_URI, event_listeners=event_listeners)
 db = client[settings.MONGO_DB_NAME]
 
 # Collections
@@ -19,6 +31,9 @@ keka_tokens_collection = db["keka_tokens"]
 candidates_collection = db["candidates"]
 jobs_collection = db["jobs"]
 candidate_scores_collection = db["candidate_scores"]
+resumes_collection = db["resumes"]
+embedding_cache_collection = db["embedding_cache"]
+vector_refs_collection = db["vector_refs"]
 
 # Encryption helpers
 def encrypt_token(token: str) -> str:
@@ -0,0 +1,188 @@
+# app/core/deadline.py
+# Per-request deadlines: every HTTP request gets a time budget (REQUEST_TIMEOUT, or the
+# client's `X-Request-Timeout` header up to REQUEST_TIMEOUT_MAX). The budget bounds Mongo
+# calls (pymongo.timeout), blocking work run on the stage pools (app/core/executors.py)
+# and LLM transport timeouts. A request whose client disconnects, or whose budget runs out before the
+# response starts, is cancelled and its pending work released.
+import asyncio
+import contextvars
+import logging
+import time
+from contextvars import ContextVar
+from typing import Any, Awaitable, Dict, Optional, Sequence
+
+import pymongo
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import HTTP_REQUESTS_ABORTED
+from app.utils.serialization import dumps
+
+logger = logging.getLogger("deadline")
+
+HEADER = "X-Request-Timeout"  # seconds
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of time, or its client went away."""
+
+
+class Budget:
+    """Time left for one request; shared by reference with the threads it starts."""
+
+    __slots__ = ("expires_at", "cancelled")
+
+    def __init__(self, seconds: float):
+        self.expires_at = time.monotonic() + seconds
+        self.cancelled = False  # client disconnected
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.cancelled or time.monotonic() >= self.expires_at
+
+
+_budget: ContextVar[Optional[Budget]] = ContextVar("request_budget", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request (None outside a request: scripts, workers)."""
+    budget = _budget.get()
+    return budget.remaining() if budget is not None else None
+
+
+def check():
+    """Raise DeadlineExceeded if the current request expired or was abandoned (safe in threads)."""
+    budget = _budget.get()
+    if budget is not None and budget.expired():
+        raise DeadlineExceeded("client disconnected" if budget.cancelled else "request deadline exceeded")
+
+
+async def outside_deadline(awaitable: Awaitable) -> Any:
+    """Run cleanup (e.g. releasing a claim) with no request budget, even after it expired."""
+    return await asyncio.create_task(_await(awaitable), context=contextvars.Context())
+
+
+async def _await(awaitable: Awaitable) -> Any:
+    return await awaitable
+
+
+def timeout_response_messages(detail: str) -> Sequence[Message]:
+    body = dumps({"detail": detail})
+    return (
+        {
+            "type": "http.response.start",
+            "status": 504,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        },
+        {"type": "http.response.body", "body": body},
+    )
+
+
+class DeadlineMiddleware:
+    """
+    Runs each request as a task with its own Budget. A single pump task owns the
+    server's `receive` so a disconnect is noticed while the handler is still working
+    (e.g. waiting on Gemini); the handler task is then cancelled. When the budget runs
+    out before the response has started, the handler is cancelled and a 504 is sent;
+    responses already streaming are left to finish. Paths in `exempt` (long streams
+    such as bulk import / export) get no budget.
+    """
+
+    def __init__(self, app: ASGIApp, default: float = 60, maximum: float = 300, exempt: Sequence[str] = ()):
+        self.app = app
+        self.default = default
+        self.maximum = maximum
+        self.exempt = tuple(exempt)
+
+    def timeout_for(self, headers: Headers) -> float:
+        value = headers.get(HEADER)
+        if value:
+            try:
+                seconds = float(value)
+                if seconds > 0:
+                    return min(seconds, self.maximum)
+            except ValueError:
+                pass
+        return self.default
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"].startswith(self.exempt):
+            await self.app(scope, receive, send)
+            return
+
+        budget = Budget(self.timeout_for(Headers(scope=scope)))
+        inbox: asyncio.Queue = asyncio.Queue(maxsize=1)  # keeps backpressure on uploads
+        disconnected = asyncio.Event()
+        response: Dict[str, Any] = {"started": False, "replaced": False}
+
+        async def pump():
+            while True:
+                message = await receive()
+                if message["type"] == "http.disconnect":
+                    budget.cancelled = not handler.done()
+                    disconnected.set()
+                    if budget.cancelled:
+                        handler.cancel()
+                    return
+                await inbox.put(message)
+
+        async def receive_from_pump() -> Message:
+            if inbox.empty() and not disconnected.is_set():
+                get = asyncio.ensure_future(inbox.get())
+                gone = asyncio.ensure_future(disconnected.wait())
+                try:
+                    await asyncio.wait({get, gone}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    gone.cancel()
+                    if not get.done():
+                        get.cancel()
+                if get.done() and not get.cancelled():
+                    return get.result()
+            if not inbox.empty():
+                return inbox.get_nowait()
+            return {"type": "http.disconnect"}
+
+        async def send_within_budget(message: Message):
+            if message["type"] == "http.response.start":
+                if message["status"] >= 500 and budget.expired():
+                    # the handler turned a timeout into a generic error: report it as one
+                    response["replaced"] = True
+                    for replacement in timeout_response_messages("Request deadline exceeded"):
+                        await send(replacement)
+                    return
+                response["started"] = True
+            elif response["replaced"]:
+                return
+            await send(message)
+
+        handler = asyncio.create_task(self._handle(budget, scope, receive_from_pump, send_within_budget))
+        reader = asyncio.create_task(pump())
+        try:
+            done, _ = await asyncio.wait({handler}, timeout=budget.remaining())
+            if not done and not response["started"]:
+                handler.cancel()
+                HTTP_REQUESTS_ABORTED.inc("deadline")
+                logger.warning(f"{scope['method']} {scope['path']} cancelled: deadline exceeded")
+            try:
+                await handler
+            except asyncio.CancelledError:
+                if asyncio.current_task().cancelling():  # server shutdown, not ours
+                    raise
+                if budget.cancelled:
+                    HTTP_REQUESTS_ABORTED.inc("disconnect")
+                    logger.info(f"{scope['method']} {scope['path']} cancelled: client disconnected")
+                    return
+                if response["started"] or response["replaced"]:
+                    raise
+                for message in timeout_response_messages("Request deadline exceeded"):
+                    await send(message)
+        finally:
+            handler.cancel()
+            reader.cancel()
+
+    async def _handle(self, budget: Budget, scope: Scope, receive: Receive, send: Send):
+        _budget.set(budget)
+        with pymongo.timeout(budget.remaining()):
+            await self.app(scope, receive, send)
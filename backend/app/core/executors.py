@@ -0,0 +1,172 @@
+# app/core/executors.py
+# Named, separately sized thread pools per pipeline stage, so a burst of uploads
+# cannot starve LLM chat or search (and vice versa):
+#   extraction  pdfminer / python-docx text extraction (CPU)
+#   llm         Gemini calls (resume parsing, scoring, chat, job generation)
+#   io          other blocking calls on the request path (vector search, embeddings)
+# Each pool admits at most `workers + queue_limit` calls; past that `run` raises
+# PoolSaturated (503 + Retry-After) instead of queueing without bound.
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+from app.core.deadline import DeadlineExceeded, check, remaining
+from app.core.metrics import register_collector
+from app.core.tracing import span
+
+logger = logging.getLogger("executors")
+
+
+class PoolSaturated(HTTPException):
+    """A stage pool has no free worker and its queue is full: 503, retry shortly."""
+
+    def __init__(self, pool: str, retry_after: int = 1):
+        super().__init__(
+            status_code=503, detail=f"Server busy ({pool} pool full), retry shortly",
+            headers={"Retry-After": str(retry_after)},
+        )
+        self.pool = pool
+
+
+class _Slot:
+    __slots__ = ("started", "dropped", "submitted", "waited")
+
+    def __init__(self):
+        self.started = False
+        self.dropped = False
+        self.submitted = time.monotonic()
+        self.waited = 0.0  # seconds queued before a worker picked the call up
+
+
+class StagePool:
+    def __init__(self, name: str, workers: int, queue_limit: int):
+        self.name = name
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"{name}-pool")
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+        self.admitted = 0       # holding a slot: queued + running
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0       # refused with PoolSaturated
+        self.dropped = 0        # cancelled while still queued: never ran
+        self.busy_seconds = 0.0
+
+    @property
+    def queued(self) -> int:
+        return max(0, self.admitted - self.running)
+
+    async def run(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Run `func` on this pool within the current request's deadline. A call that is
+        cancelled (client gone) or expires while still queued never runs and frees its slot.
+        """
+        check()
+        with span(f"pool.{self.name}", call=getattr(func, "__name__", "call")) as current:
+            with self._lock:  # check + admit atomically (worker threads update the counters too)
+                admitted = self.admitted
+                saturated = admitted >= self.workers + self.queue_limit
+                if saturated:
+                    self.rejected += 1
+                else:
+                    self.admitted += 1
+            if saturated:
+                logger.warning(f"{self.name} pool saturated ({admitted} admitted): rejecting")
+                raise PoolSaturated(self.name)
+            slot = _Slot()
+            ctx = contextvars.copy_context()  # request budget, pymongo timeout and trace follow the call
+            future = asyncio.get_running_loop().run_in_executor(
+                self._executor, partial(self._call, slot, ctx, func, *args, **kwargs)
+            )
+            future.add_done_callback(partial(self._abandoned, slot))
+            try:
+                return await asyncio.wait_for(future, remaining())
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(f"request deadline exceeded in {self.name} pool")
+            finally:
+                current.set(queued_ms=round(slot.waited * 1000, 3))
+
+    def _call(self, slot: "_Slot", ctx: contextvars.Context, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if slot.dropped:  # cancelled while queued
+                return None
+            slot.started = True
+            slot.waited = time.monotonic() - slot.submitted
+            self.running += 1
+        start = time.monotonic()
+        try:
+            return ctx.run(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+                self.admitted -= 1
+                self.completed += 1
+                self.busy_seconds += time.monotonic() - start
+
+    def _abandoned(self, slot: "_Slot", future: asyncio.Future):
+        if not future.cancelled():
+            return
+        with self._lock:
+            # a call already running keeps its worker (threads cannot be killed) until it returns
+            if not slot.started:
+                slot.dropped = True
+                self.admitted -= 1
+                self.dropped += 1
+
+    def stats(self) -> Dict[str, Any]:
+        uptime = max(time.monotonic() - self._started_at, 1e-9)
+        return {
+            "workers": self.workers,
+            "queue_limit": self.queue_limit,
+            "running": self.running,
+            "queued": self.queued,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "dropped": self.dropped,
+            "utilization": round(self.running / self.workers, 3),                       # now
+            "avg_utilization": round(self.busy_seconds / (uptime * self.workers), 4),  # since start
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+extraction_pool = StagePool("extraction", settings.EXTRACTION_WORKERS, settings.EXTRACTION_QUEUE)
+llm_pool = StagePool("llm", settings.LLM_WORKERS, settings.LLM_QUEUE)
+io_pool = StagePool("io", settings.IO_WORKERS, settings.IO_QUEUE)
+
+POOLS = {pool.name: pool for pool in (extraction_pool, llm_pool, io_pool)}
+
+
+def pool_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: pool.stats() for name, pool in POOLS.items()}
+
+
+def _collect_pools():
+    snapshot = {name: pool.stats() for name, pool in POOLS.items()}
+    for key, kind, documentation in (
+        ("running", "gauge", "Calls running on a stage pool"),
+        ("queued", "gauge", "Calls waiting for a stage pool worker (queue depth)"),
+        ("utilization", "gauge", "Busy workers / workers"),
+        ("rejected", "counter", "Calls refused because the pool was full (503)"),
+        ("dropped", "counter", "Queued calls cancelled before they ran"),
+    ):
+        name = f"executor_{key}_total" if kind == "counter" else f"executor_{key}"
+        yield name, kind, documentation, [({"pool": pool}, stats[key]) for pool, stats in snapshot.items()]
+
+
+register_collector(_collect_pools)
+
+
+def shutdown_pools():
+    for pool in POOLS.values():
+        pool.shutdown()
@@ -0,0 +1,243 @@
+# app/core/indexes.py
+# Declarative MongoDB index registry.
+#
+#   python -m app.core.indexes apply   # create missing indexes (idempotent)
+#   python -m app.core.indexes check   # explain() every hot query, report COLLSCANs
+#   python -m app.core.indexes show    # declared vs existing indexes
+#
+# Indexes are also applied on startup when MONGO_ENSURE_INDEXES is enabled.
+
+import logging
+import sys
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger("indexes")
+
+LIVE_CANDIDATE = {"deleted": False}
+LIVE_JOB = {"is_deleted": False}
+HAS_LEGACY_ID = {"id": {"$type": "string"}}
+
+
+class IndexSpec(NamedTuple):
+    name: str
+    keys: Sequence[Tuple[str, int]]
+    unique: bool = False
+    partial: Optional[Dict[str, Any]] = None   # partialFilterExpression
+    ttl_seconds: Optional[int] = None          # expireAfterSeconds
+
+    def model(self) -> IndexModel:
+        options: Dict[str, Any] = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.partial:
+            options["partialFilterExpression"] = self.partial
+        if self.ttl_seconds is not None:
+            options["expireAfterSeconds"] = self.ttl_seconds
+        return IndexModel(list(self.keys), **options)
+
+
+class HotQuery(NamedTuple):
+    name: str
+    collection: str
+    filter: Dict[str, Any]
+    sort: Optional[Sequence[Tuple[str, int]]] = None
+
+
+# ------------------------------
+# Registry: collection -> indexes
+# ------------------------------
+INDEXES: Dict[str, List[IndexSpec]] = {
+    "candidates": [
+        IndexSpec("live_recent", [("_id", DESCENDING)], partial=LIVE_CANDIDATE),
+        IndexSpec("live_by_job", [("job_id", ASCENDING), ("_id", DESCENDING)], partial=LIVE_CANDIDATE),
+        IndexSpec("live_by_status", [("status", ASCENDING), ("_id", DESCENDING)], partial=LIVE_CANDIDATE),
+        IndexSpec(
+            "live_by_job_status", [("job_id", ASCENDING), ("status", ASCENDING), ("_id", DESCENDING)],
+            partial=LIVE_CANDIDATE,
+        ),
+        IndexSpec("legacy_id", [("id", ASCENDING)], partial=HAS_LEGACY_ID),
+        # incremental backups: changed since the previous watermark (scripts/backup_db.py)
+        IndexSpec("updated", [("updated_at", ASCENDING)]),
+    ],
+    "jobs": [
+        IndexSpec("live_recent", [("_id", DESCENDING)], partial=LIVE_JOB),
+        IndexSpec("live_by_status", [("status", ASCENDING), ("_id", DESCENDING)], partial=LIVE_JOB),
+        IndexSpec("legacy_id", [("id", ASCENDING)], partial=HAS_LEGACY_ID),
+        IndexSpec("updated", [("updated_at", ASCENDING)]),
+    ],
+    "candidate_scores": [
+        IndexSpec("candidate_job", [("candidate_id", ASCENDING), ("job_id", ASCENDING)], unique=True),
+        IndexSpec("live_by_candidate", [("candidate_id", ASCENDING)], partial={"deleted": False}),
+        # listing by score (highest first), optionally for one job; range filters use the same keys
+        IndexSpec("live_overall", [("overall_score", DESCENDING), ("_id", DESCENDING)], partial={"deleted": False}),
+        IndexSpec("live_fitment", [("fitment_score", DESCENDING), ("_id", DESCENDING)], partial={"deleted": False}),
+        IndexSpec(
+            "live_job_overall", [("job_id", ASCENDING), ("overall_score", DESCENDING), ("_id", DESCENDING)],
+            partial={"deleted": False},
+        ),
+        IndexSpec(
+            "live_job_fitment", [("job_id", ASCENDING), ("fitment_score", DESCENDING), ("_id", DESCENDING)],
+            partial={"deleted": False},
+        ),
+        IndexSpec("updated", [("updated_at", ASCENDING)]),
+    ],
+    "resumes": [
+        IndexSpec("legacy_id", [("id", ASCENDING)], partial=HAS_LEGACY_ID),
+    ],
+    "vector_refs": [
+        IndexSpec("index_vid", [("index", ASCENDING), ("vid", ASCENDING)], unique=True),
+        # (index, filter field(s), vid): metadata pre-filtering for ANN search
+        IndexSpec("index_location_years", [("index", ASCENDING), ("location", ASCENDING), ("years", ASCENDING), ("vid", ASCENDING)]),
+        IndexSpec("index_status", [("index", ASCENDING), ("status", ASCENDING), ("vid", ASCENDING)]),
+        IndexSpec("index_job_status", [("index", ASCENDING), ("job_id", ASCENDING), ("status", ASCENDING), ("vid", ASCENDING)]),
+    ],
+    "candidate_cards": [
+        # one card per live candidate: no partial filters needed
+        IndexSpec("job_recent", [("job_id", ASCENDING), ("_id", DESCENDING)]),
+        IndexSpec("status_recent", [("status", ASCENDING), ("_id", DESCENDING)]),
+        IndexSpec("job_status_recent", [("job_id", ASCENDING), ("status", ASCENDING), ("_id", DESCENDING)]),
+        IndexSpec("overall", [("overall_score", DESCENDING), ("_id", DESCENDING)]),
+        IndexSpec("fitment", [("fitment_score", DESCENDING), ("_id", DESCENDING)]),
+        IndexSpec("job_overall", [("job_id", ASCENDING), ("overall_score", DESCENDING), ("_id", DESCENDING)]),
+        IndexSpec("job_fitment", [("job_id", ASCENDING), ("fitment_score", DESCENDING), ("_id", DESCENDING)]),
+    ],
+    "idempotency_keys": [
+        IndexSpec("expires", [("expires_at", ASCENDING)], ttl_seconds=0),
+    ],
+    "tokens": [
+        IndexSpec("user_provider", [("user_id", ASCENDING), ("provider", ASCENDING)], unique=True),
+    ],
+}
+
+# Queries the API issues on every request; `check` fails if any of them scans a collection.
+_SAMPLE_ID = ObjectId()
+HOT_QUERIES: List[HotQuery] = [
+    HotQuery("candidate list", "candidates", LIVE_CANDIDATE, [("_id", DESCENDING)]),
+    HotQuery("candidate by legacy id", "candidates", {"id": "sample", **LIVE_CANDIDATE}),
+    HotQuery("candidates for job", "candidates", {"job_id": str(_SAMPLE_ID), **LIVE_CANDIDATE}),
+    HotQuery("job list", "jobs", LIVE_JOB),
+    HotQuery("job by legacy id", "jobs", {"id": "sample"}),
+    HotQuery("open jobs", "jobs", {"status": 1, **LIVE_JOB}),
+    HotQuery("score for candidate", "candidate_scores", {"candidate_id": str(_SAMPLE_ID), "deleted": False}),
+    HotQuery("top scores", "candidate_scores", {"deleted": False}, [("overall_score", DESCENDING), ("_id", DESCENDING)]),
+    HotQuery(
+        "top scores for job", "candidate_scores",
+        {"job_id": str(_SAMPLE_ID), "overall_score": {"$gte": 70}, "deleted": False},
+        [("overall_score", DESCENDING), ("_id", DESCENDING)],
+    ),
+    HotQuery("candidates by status", "candidates", {"status": "active", **LIVE_CANDIDATE}, [("_id", DESCENDING)]),
+    HotQuery(
+        "top cards for job", "candidate_cards", {"job_id": str(_SAMPLE_ID), "overall_score": {"$gte": 70}},
+        [("overall_score", DESCENDING), ("_id", DESCENDING)],
+    ),
+    HotQuery("score upsert", "candidate_scores", {"candidate_id": str(_SAMPLE_ID), "job_id": str(_SAMPLE_ID)}),
+    HotQuery("resume by legacy id", "resumes", {"id": "sample"}),
+    HotQuery("vector ref lookup", "vector_refs", {"index": "resumes", "vid": {"$in": [1, 2]}}),
+    HotQuery("vector prefilter", "vector_refs", {"index": "resumes", "location": "pune", "years": {"$gte": 5}}),
+    HotQuery("open job vectors", "vector_refs", {"index": "jobs", "status": 1}),
+]
+
+
+# ------------------------------
+# Apply / check
+# ------------------------------
+def ensure_indexes(database, registry: Optional[Dict[str, List[IndexSpec]]] = None) -> Dict[str, List[str]]:
+    """
+    Create every declared index that does not exist yet (by name). Idempotent.
+    Indexes that exist with a different definition are reported, never dropped.
+    Returns {"created": [...], "conflicts": [...]}.
+    """
+    report: Dict[str, List[str]] = {"created": [], "conflicts": []}
+    for collection_name, specs in (registry or INDEXES).items():
+        collection = database[collection_name]
+        existing = collection.index_information()
+        missing = []
+        for spec in specs:
+            current = existing.get(spec.name)
+            if current is None:
+                missing.append(spec)
+            elif [tuple(k) for k in current["key"]] != [tuple(k) for k in spec.keys]:
+                report["conflicts"].append(f"{collection_name}.{spec.name}: existing keys {current['key']}")
+        for spec in missing:
+            try:
+                collection.create_indexes([spec.model()])
+                report["created"].append(f"{collection_name}.{spec.name}")
+            except OperationFailure as e:
+                # e.g. duplicate data for a unique index, or same keys under another name
+                report["conflicts"].append(f"{collection_name}.{spec.name}: {e.details.get('errmsg', e)}")
+    for name in report["created"]:
+        logger.info(f"Created index {name}")
+    for conflict in report["conflicts"]:
+        logger.warning(f"Index conflict {conflict}")
+    return report
+
+
+def _stages(plan: Any) -> List[str]:
+    """All stage names in an explain() plan tree (classic and SBE layouts)."""
+    found = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            found.append(plan["stage"])
+        for value in plan.values():
+            found.extend(_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            found.extend(_stages(item))
+    return found
+
+
+def check_hot_queries(database, queries: Optional[List[HotQuery]] = None) -> List[Dict[str, Any]]:
+    """explain() each hot query; returns one row per query with its stages and a COLLSCAN flag."""
+    rows = []
+    for query in queries or HOT_QUERIES:
+        cursor = database[query.collection].find(query.filter)
+        if query.sort:
+            cursor = cursor.sort(list(query.sort))
+        plan = cursor.limit(20).explain().get("queryPlanner", {}).get("winningPlan", {})
+        stages = _stages(plan)
+        rows.append({
+            "query": query.name,
+            "collection": query.collection,
+            "stages": stages,
+            "collscan": "COLLSCAN" in stages,
+        })
+    return rows
+
+
+def _main(argv: List[str]) -> int:
+    from app.core.db import db
+
+    command = argv[1] if len(argv) > 1 else "apply"
+    if command == "apply":
+        report = ensure_indexes(db)
+        print(f"✅ created={len(report['created'])} conflicts={len(report['conflicts'])}")
+        for line in report["created"]:
+            print(f"  + {line}")
+        for line in report["conflicts"]:
+            print(f"  ! {line}")
+        return 1 if report["conflicts"] else 0
+    if command == "check":
+        rows = check_hot_queries(db)
+        for row in rows:
+            mark = "❌ COLLSCAN" if row["collscan"] else "✅"
+            print(f"{mark:12} {row['collection']:18} {row['query']:28} {' > '.join(row['stages'])}")
+        return 1 if any(r["collscan"] for r in rows) else 0
+    if command == "show":
+        for collection_name, specs in INDEXES.items():
+            existing = db[collection_name].index_information()
+            print(collection_name)
+            for spec in specs:
+                print(f"  {'✅' if spec.name in existing else '❌'} {spec.name} {list(spec.keys)}")
+            for name in sorted(set(existing) - {s.name for s in specs} - {"_id_"}):
+                print(f"  ?  {name} (not declared)")
+        return 0
+    print("usage: python -m app.core.indexes [apply|check|show]")
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(_main(sys.argv))
@@ -0,0 +1,322 @@
+# app/core/metrics.py
+# Prometheus metrics (text exposition format 0.0.4) without a client library:
+# counters / gauges / histograms are dicts keyed by label values behind a lock,
+# so recording is a few dict operations per event. Values owned by other modules
+# (cache stats, pool gauges) are read at scrape time through collectors.
+# Served by GET /metrics (app/api/status.py); METRICS_ENABLED=false removes the HTTP and
+# Mongo hooks and the endpoint.
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from pymongo import monitoring
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.tracing import span
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# (name, type, help, [(labels, value), ...]) produced by a collector at scrape time
+Family = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+_metrics: List["_Metric"] = []
+_collectors: List[Callable[[], Iterable[Family]]] = []
+_caches: Dict[str, Callable[[], Tuple[int, int]]] = {}  # name -> () -> (hits, misses)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) and not value.is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple, Any] = {}
+        self._lock = threading.Lock()
+        _metrics.append(self)
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted(self._values.items())
+        return self._header() + [
+            f"{self.name}{_labels(self.labelnames, key)} {_number(value)}" for key, value in items
+        ]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: Any, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, *labels: Any):
+        with self._lock:
+            self._values[labels] = value
+
+    def inc(self, *labels: Any, amount: float = 1):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: Any, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: Any):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(labels)
+            if state is None:
+                # per-bucket counts (not cumulative; the last slot is +Inf), sum, count
+                state = self._values[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    @contextmanager
+    def time(self, *labels: Any) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, *labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            items = sorted((key, ([*counts], total, count)) for key, (counts, total, count) in self._values.items())
+        lines = self._header()
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, float("inf")), counts):
+                cumulative += bucket_count
+                le = _labels(self.labelnames, key, f'le="{_number(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, key)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+def register_collector(collect: Callable[[], Iterable[Family]]):
+    """`collect()` is called on every scrape and returns metric families owned elsewhere."""
+    _collectors.append(collect)
+
+
+def render() -> str:
+    lines: List[str] = []
+    for metric in _metrics:
+        lines.extend(metric.render())
+    for collect in _collectors:
+        for name, kind, documentation, samples in collect():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                lines.append(f"{name}{_labels(list(labels), list(labels.values()))} {_number(value)}")
+    return "\n".join(lines) + "\n"
+
+
+# ------------------------------
+# Application metrics
+# ------------------------------
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "Requests being handled")
+HTTP_REQUEST_SECONDS = Histogram(
+    "http_request_duration_seconds", "Request latency by route template", ("method", "route", "status"),
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60),
+)
+HTTP_REQUESTS_ABORTED = Counter(
+    "http_requests_aborted_total", "Requests cancelled by DeadlineMiddleware", ("reason",)
+)
+
+MONGO_COMMAND_SECONDS = Histogram(
+    "mongo_command_duration_seconds", "MongoDB command latency by collection", ("collection", "command"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+MONGO_COMMAND_ERRORS = Counter(
+    "mongo_command_errors_total", "Failed MongoDB commands by collection", ("collection", "command")
+)
+
+LLM_SECONDS = Histogram(
+    "llm_request_duration_seconds", "Gemini call latency by call site", ("site",),
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120),
+)
+LLM_TOKENS = Counter("llm_tokens_total", "Gemini tokens by call site", ("site", "kind"))  # kind: prompt | completion
+LLM_ERRORS = Counter("llm_errors_total", "Failed Gemini calls by call site", ("site",))
+
+EXTRACTION_SECONDS = Histogram(
+    "resume_extraction_duration_seconds", "Resume text extraction time by file type", ("kind",),
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+EXTRACTION_PAGES = Counter(
+    "resume_extraction_pages_total",
+    'PDF pages extracted (pages/sec: rate of this / rate of resume_extraction_duration_seconds_sum{kind="pdf"})',
+)
+
+
+# ------------------------------
+# Instrumentation helpers
+# ------------------------------
+def usage_tokens(response: Any) -> Tuple[int, int]:
+    """(prompt, completion) tokens of a google-generativeai or langchain response; zeros if absent."""
+    usage = getattr(response, "usage_metadata", None)
+    if not usage:
+        return 0, 0
+    if isinstance(usage, dict):  # langchain AIMessage
+        return usage.get("input_tokens", 0) or 0, usage.get("output_tokens", 0) or 0
+    return getattr(usage, "prompt_token_count", 0) or 0, getattr(usage, "candidates_token_count", 0) or 0
+
+
+@contextmanager
+def track_llm(site: str) -> Iterator[Dict[str, Any]]:
+    """
+    Time one Gemini call: `with track_llm("parse_resume") as call: call["response"] = ...`.
+    Token counts are read from the stored response; exceptions count as errors.
+    The call is also an `llm.<site>` trace span.
+    """
+    call: Dict[str, Any] = {"response": None}
+    start = time.perf_counter()
+    with span(f"llm.{site}") as current:
+        try:
+            yield call
+        except Exception:
+            LLM_ERRORS.inc(site)
+            raise
+        finally:
+            LLM_SECONDS.observe(time.perf_counter() - start, site)
+            if call["response"] is not None:
+                prompt, completion = usage_tokens(call["response"])
+                current.set(prompt_tokens=prompt, completion_tokens=completion)
+                if prompt:
+                    LLM_TOKENS.inc(site, "prompt", amount=prompt)
+                if completion:
+                    LLM_TOKENS.inc(site, "completion", amount=completion)
+
+
+def track_cache(name: str, counts: Callable[[], Tuple[int, int]]):
+    """Export a cache's (hits, misses), read at scrape time, as lookup counters + a hit ratio."""
+    _caches[name] = counts
+
+
+def _collect_caches() -> Iterable[Family]:
+    lookups, ratios = [], []
+    for name, counts in _caches.items():
+        hits, misses = counts()
+        lookups.append(({"cache": name, "result": "hit"}, hits))
+        lookups.append(({"cache": name, "result": "miss"}, misses))
+        ratios.append(({"cache": name}, round(hits / (hits + misses), 4) if hits + misses else 0.0))
+    yield "cache_lookups_total", "counter", "Cache lookups by result", lookups
+    yield "cache_hit_ratio", "gauge", "Hits / lookups since start", ratios
+
+
+register_collector(_collect_caches)
+
+
+def route_template(scope: Scope) -> str:
+    """/api/resume/{file_id} rather than the raw path, so each route is one series."""
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    # FastAPI >= 0.140 leaves the router-relative route in scope (no include_router prefix):
+    # the prefix is what precedes the suffix the route itself matched with the same params
+    path, params = scope["path"], scope.get("path_params") or {}
+    for start in (i for i, char in enumerate(path) if char == "/"):
+        match = route.path_regex.match(path[start:])
+        if match is None:
+            continue
+        values = {name: route.param_convertors[name].convert(value) for name, value in match.groupdict().items()}
+        if values == params:
+            return path[:start] + template
+    return template
+
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """pymongo command listener (sync + Motor clients): latency and errors per collection."""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Tuple[str, str]] = {}
+
+    @staticmethod
+    def _collection(event: monitoring.CommandStartedEvent) -> str:
+        target = event.command.get(event.command_name)
+        if event.command_name == "getMore":
+            target = event.command.get("collection")
+        return target if isinstance(target, str) else "-"
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        self._pending[(event.connection_id, event.request_id)] = (self._collection(event), event.command_name)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels:
+            MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, *labels)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        labels = self._pending.pop((event.connection_id, event.request_id), None)
+        if labels:
+            MONGO_COMMAND_SECONDS.observe(event.duration_micros / 1e6, *labels)
+            MONGO_COMMAND_ERRORS.inc(*labels)
+
+
+mongo_listener = MongoCommandMetrics()
+
+
+class MetricsMiddleware:
+    """Outermost middleware: in-flight gauge + latency histogram labelled with the route template."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start, scope["method"], route_template(scope), status["code"]
+            )
@@ -0,0 +1,294 @@
+# app/core/tracing.py
+# Lightweight tracing: `with span("extract_text"):` records a timed span under the
+# current one (contextvar, so it follows awaits and the stage pools' worker threads).
+# A span opened with no parent starts a trace; when that root ends the trace is kept
+# in a ring buffer (GET /debug/traces shows the slowest) and handed to the exporter:
+#   TRACE_EXPORT=file  JSON lines appended to TRACE_FILE
+#   TRACE_EXPORT=otlp  OTLP/HTTP JSON posted to TRACE_OTLP_ENDPOINT (collector :4318)
+# Mongo commands issued inside a trace become child spans (pymongo command listener).
+import json
+import logging
+import os
+import queue
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+import requests
+from pymongo import monitoring
+
+from app.core.config import settings
+
+logger = logging.getLogger("tracing")
+
+SERVICE_NAME = "smart-hr-bot"
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans", "root")
+
+    def __init__(self):
+        self.trace_id = secrets.token_hex(16)
+        self.spans: List["Span"] = []
+        self.root: Optional["Span"] = None
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, trace: Trace, name: str, parent_id: Optional[str], attributes: Dict[str, Any]):
+        self.trace = trace
+        self.span_id = secrets.token_hex(8)
+        self.parent_id = parent_id
+        self.name = name
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        trace.spans.append(self)
+
+    def set(self, **attributes: Any):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+
+class _NoopSpan:
+    def set(self, **attributes: Any):
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+_recent: Deque[Trace] = deque(maxlen=settings.TRACE_BUFFER)
+
+
+def current_trace_id() -> Optional[str]:
+    current = _current.get()
+    return current.trace.trace_id if current is not None else None
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Any]:
+    """Time a stage; exceptions (including cancellation) are recorded on the span and re-raised."""
+    if not settings.TRACING_ENABLED:
+        yield _NOOP
+        return
+    parent = _current.get()
+    trace = parent.trace if parent is not None else Trace()
+    current = Span(trace, name, parent.span_id if parent is not None else None, attributes)
+    if parent is None:
+        trace.root = current
+    token = _current.set(current)
+    try:
+        yield current
+    except BaseException as e:
+        current.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        current.end_ns = time.time_ns()
+        _current.reset(token)
+        if parent is None:
+            _finish(trace)
+
+
+def _finish(trace: Trace):
+    _recent.append(trace)
+    if _exporter is not None:
+        _exporter.submit(trace)
+
+
+# ------------------------------
+# Debug view
+# ------------------------------
+def _describe(trace: Trace) -> Dict[str, Any]:
+    root = trace.root
+    spans = sorted(trace.spans, key=lambda s: s.start_ns)
+    depth = {root.span_id: 0}
+    child_ms: Dict[str, float] = {}
+    for s in spans:
+        if s.parent_id is not None:
+            depth[s.span_id] = depth.get(s.parent_id, 0) + 1
+            child_ms[s.parent_id] = child_ms.get(s.parent_id, 0.0) + s.duration_ms
+    # self time per stage name: where the time went, children excluded
+    breakdown: Dict[str, float] = {}
+    for s in spans:
+        own = max(0.0, s.duration_ms - child_ms.get(s.span_id, 0.0))
+        breakdown[s.name] = round(breakdown.get(s.name, 0.0) + own, 3)
+    return {
+        "trace_id": trace.trace_id,
+        "name": root.name,
+        "started_at": datetime.fromtimestamp(root.start_ns / 1e9, timezone.utc).isoformat(),
+        "duration_ms": round(root.duration_ms, 3),
+        "error": root.error,
+        "attributes": root.attributes,
+        "breakdown_ms": dict(sorted(breakdown.items(), key=lambda item: -item[1])),
+        "spans": [
+            {
+                "name": s.name,
+                "depth": depth.get(s.span_id, 1),
+                "offset_ms": round((s.start_ns - root.start_ns) / 1e6, 3),
+                "duration_ms": round(s.duration_ms, 3),
+                "attributes": s.attributes,
+                "error": s.error,
+                "unfinished": s.end_ns is None,
+            }
+            for s in spans
+        ],
+    }
+
+
+def slowest_traces(limit: int = 10, name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """The slowest of the last TRACE_BUFFER traces (optionally only roots called `name`)."""
+    traces = [t for t in list(_recent) if t.root is not None and (name is None or t.root.name == name)]
+    traces.sort(key=lambda t: t.root.duration_ms, reverse=True)
+    return [_describe(t) for t in traces[:limit]]
+
+
+# ------------------------------
+# Export
+# ------------------------------
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(s: Span, root_end: int) -> Dict[str, Any]:
+    out = {
+        "traceId": s.trace.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": 1 if s.parent_id else 2,  # INTERNAL / SERVER
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns if s.end_ns is not None else root_end),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+        "status": {"code": 2, "message": s.error} if s.error else {"code": 1},
+    }
+    if s.parent_id:
+        out["parentSpanId"] = s.parent_id
+    return out
+
+
+class TraceExporter:
+    """Background thread batching finished traces to a JSON-lines file or an OTLP/HTTP collector."""
+
+    def __init__(self, mode: str, path: str, endpoint: str, batch_size: int = 64, interval: float = 2.0):
+        self.mode = mode
+        self.path = path
+        self.endpoint = endpoint
+        self.batch_size = batch_size
+        self.interval = interval
+        self.dropped = 0
+        self._queue: "queue.Queue[Optional[Trace]]" = queue.Queue(maxsize=2048)
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, trace: Trace):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+            self._thread.start()
+        try:
+            self._queue.put_nowait(trace)
+        except queue.Full:
+            self.dropped += 1  # never slow requests down for telemetry
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        running = True
+        while running:
+            batch: List[Trace] = []
+            deadline = time.monotonic() + self.interval
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                batch.append(item)
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    logger.warning(f"Trace export of {len(batch)} traces failed: {e}")
+
+    def _write(self, batch: List[Trace]):
+        if self.mode == "file":
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                for trace in batch:
+                    f.write(json.dumps(_describe(trace), default=str) + "\n")
+            return
+        spans = [_otlp_span(s, t.root.end_ns) for t in batch for s in list(t.spans)]
+        payload = {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+            "scopeSpans": [{"scope": {"name": "app.core.tracing"}, "spans": spans}],
+        }]}
+        requests.post(self.endpoint, json=payload, timeout=5).raise_for_status()
+
+
+_exporter: Optional[TraceExporter] = (
+    TraceExporter(settings.TRACE_EXPORT, settings.TRACE_FILE, settings.TRACE_OTLP_ENDPOINT)
+    if settings.TRACING_ENABLED and settings.TRACE_EXPORT in ("file", "otlp") else None
+)
+
+
+def stop_exporter():
+    """Flush queued traces (app shutdown)."""
+    if _exporter is not None:
+        _exporter.stop()
+
+
+# ------------------------------
+# Mongo commands as child spans
+# ------------------------------
+class MongoCommandSpans(monitoring.CommandListener):
+    """Each command run inside a trace becomes a `mongo.<command>` span (Motor copies the context)."""
+
+    def __init__(self):
+        self._pending: Dict[Tuple[Any, int], Span] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        parent = _current.get()
+        if parent is None:
+            return
+        target = event.command.get("collection" if event.command_name == "getMore" else event.command_name)
+        attributes = {"collection": target} if isinstance(target, str) else {}
+        self._pending[(event.connection_id, event.request_id)] = Span(
+            parent.trace, f"mongo.{event.command_name}", parent.span_id, attributes
+        )
+
+    def _end(self, event, error: Optional[str] = None):
+        current = self._pending.pop((event.connection_id, event.request_id), None)
+        if current is not None:
+            current.end_ns = current.start_ns + event.duration_micros * 1000
+            current.error = error
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._end(event)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._end(event, str(event.failure.get("errmsg", "command failed")))
+
+
+mongo_span_listener = MongoCommandSpans()
@@ -1,15 +1,25 @@
 # app/main.py
 
+import asyncio
 import os
-import socket
-from fastapi import FastAPI, APIRouter
+from fastapi import FastAPI, APIRouter, Request
 from app.core.db import db, client
 from app.core.logger import setup_logger
 from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
+from app.core.compression import CompressionMiddleware
+from app.core.deadline import DeadlineExceeded, DeadlineMiddleware
+from app.core.executors import shutdown_pools
+from app.core.metrics import MetricsMiddleware
+from app.core.tracing import stop_exporter
 from app.core.logger import setup_logger
-from app.api import auth, users, resume, interview, calendar, notifications, llm, candidates, ai_jobs, jobs, status, candidate_listing, candidate_scoring_api
+from app.core.indexes import ensure_indexes
+from app.api import auth, users, resume, interview, calendar, notifications, llm, candidates, ai_jobs, jobs, status, candidate_listing, candidate_scoring_api, search, bulk_data
 from fastapi.responses import HTMLResponse
+from app.services.embedding_pipeline import embedding_pipeline
+from app.services.health import health_monitor
+from app.repositories import job_repo
+from app.utils.serialization import FastJSONResponse
 
 
 # Setup logger
@@ -18,7 +28,16 @@ logger = setup_logger()
 app = FastAPI(
     title="Smart HR Bot API",
     version="1.0.0",
-    description="AI-powered Smart HR Bot backend"
+    description="AI-powered Smart HR Bot backend",
+    default_response_class=FastJSONResponse,
+)
+
+# per-request deadline + cancellation on disconnect (innermost: sees the raw handler)
+app.add_middleware(
+    DeadlineMiddleware,
+    default=settings.REQUEST_TIMEOUT,
+    maximum=settings.REQUEST_TIMEOUT_MAX,
+    exempt=[p.strip() for p in settings.REQUEST_TIMEOUT_EXEMPT.split(",") if p.strip()],
 )
 
 origins = [
@@ -33,8 +52,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # allow all HTTP methods (GET, POST, PUT, DELETE, etc.)
     allow_headers=["*"],  # allow all headers
+    expose_headers=["ETag"],
 )
 
+# gzip / brotli above COMPRESSION_MIN_SIZE
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MIN_SIZE,
+    gzip_level=settings.GZIP_LEVEL,
+    brotli_quality=settings.BROTLI_QUALITY,
+)
+
+# route latency / in-flight requests for GET /metrics (outermost: times the whole response)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Routers
 app.include_router(status.router, tags=["Status"])
 app.include_router(auth.router, prefix="/api/auth", tags=["Auth"])
@@ -49,6 +81,35 @@ app.include_router(ai_jobs.router, prefix="/api", tags=["AI Jobs"])
 app.include_router(jobs.router, prefix="/api", tags=["Jobs"])
 app.include_router(candidate_listing.router, prefix="/api", tags=["Candidate Listing with scoring"])
 app.include_router(candidate_scoring_api.router, prefix="/api", tags=["Candidate Scoring"])
+app.include_router(search.router, prefix="/api", tags=["Search"])
+app.include_router(bulk_data.router, prefix="/api", tags=["Bulk import / export"])
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return FastJSONResponse({"detail": f"Request deadline exceeded: {exc}"}, status_code=504)
+
+
+@app.on_event("startup")
+async def start_background_workers():
+    if settings.MONGO_ENSURE_INDEXES:
+        try:
+            await asyncio.to_thread(ensure_indexes, db)
+        except Exception:
+            logger.exception("Index creation failed; run `python -m app.core.indexes apply`")
+    await embedding_pipeline.start()
+    if settings.JOB_CACHE_WATCH:
+        job_repo.start_watch()
+    await health_monitor.start()
+
+
+@app.on_event("shutdown")
+async def stop_background_workers():
+    await health_monitor.stop()
+    await job_repo.stop_watch()
+    await embedding_pipeline.stop()
+    shutdown_pools()
+    stop_exporter()
+
 
 @app.get("/")
 def root():
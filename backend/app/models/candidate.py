@@ -1,6 +1,6 @@
 # app/models/candidate.py
 from pydantic import BaseModel, EmailStr, ConfigDict, Field, model_validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Literal
 
 class CandidateBase(BaseModel):
     # Pydantic v2 config
@@ -51,3 +51,24 @@ class CandidateUpdate(CandidateBase):
 
 class CandidateResponse(CandidateBase):
     id: str
+
+
+class CandidateSummary(BaseModel):
+    """Slim row for table views (`?fields=summary`): no experience_summary / extra_data."""
+    id: str
+    name: Optional[str] = ""
+    email: Optional[str] = None
+    phone: Optional[str] = ""
+    location: Optional[str] = ""
+    years_of_experience: Optional[str] = ""
+    skills: List[str] = Field(default_factory=list)
+    position: Optional[str] = ""
+    job_id: Optional[str] = None
+    status: Optional[str] = "active"
+    resume_id: Optional[str] = None
+    resume_url: Optional[str] = None
+
+
+class CandidateBulkStatusUpdate(BaseModel):
+    candidate_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    status: Literal["active", "inactive"]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 import uuid
 
@@ -47,3 +47,27 @@ class JobInDB(JobBase):
 class JobResponse(JobInDB):
     """Returned in API after DB insert/update"""
     pass
+
+
+class JobSummary(BaseModel):
+    """Slim row for table views (`?fields=summary`): no HTML description/responsibilities/requirements."""
+    id: str
+    title: str
+    department: Optional[str] = None
+    location: Optional[str] = None
+    workMode: Optional[str] = None
+    type: Optional[str] = None
+    experience: Optional[str] = None
+    openings: Optional[int] = None
+    salary: Optional[str] = None
+    deadline: Optional[datetime] = None
+    status: Optional[int] = None
+    hiringManager: Optional[str] = None
+    visibility: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+
+class JobBulkStatusUpdate(BaseModel):
+    job_ids: List[str] = Field(..., min_length=1, max_length=1000)
+    status: Literal[0, 1]
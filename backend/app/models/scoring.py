@@ -52,3 +52,15 @@ class CandidateScore(BaseModel):
     deleted_at: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
+
+
+class ScoreSummary(BaseModel):
+    """Score fields shown in the candidate listing table (no breakdown / analysis)."""
+    candidate_id: str
+    job_id: Optional[str] = None
+    overall_score: Optional[int] = None
+    fitment_score: Optional[int] = None
+    fitment_status: Optional[str] = None
+    ranking_score: Optional[int] = None
+    percentile: Optional[int] = None
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,37 @@
+# app/models/search.py
+from pydantic import BaseModel, Field
+from typing import Optional, List
+
+from app.models.candidate import CandidateResponse
+from app.models.job import JobResponse
+
+
+class CandidateSearchRequest(BaseModel):
+    query: str = Field(..., min_length=2, description="Free-text query, e.g. 'Kubernetes + Go'")
+    location: Optional[str] = Field(None, description="City/country, e.g. 'Pune'")
+    min_experience: Optional[float] = Field(None, ge=0, description="Minimum years of experience")
+    max_experience: Optional[float] = Field(None, ge=0, description="Maximum years of experience")
+    job_id: Optional[str] = None
+    status: Optional[str] = Field(None, description="Candidate status, e.g. 'active'")
+    top_k: int = Field(20, ge=1, le=200)
+
+
+class CandidateSearchHit(BaseModel):
+    candidate: CandidateResponse
+    similarity: float
+
+
+class CandidateSearchResponse(BaseModel):
+    results: List[CandidateSearchHit]
+    took_ms: int
+
+
+class JobRecommendation(BaseModel):
+    job: JobResponse
+    similarity: float
+
+
+class JobRecommendationResponse(BaseModel):
+    candidate_id: str
+    results: List[JobRecommendation]
+    took_ms: int
@@ -0,0 +1,56 @@
+# app/repositories/__init__.py
+# Async (Motor) repository layer used by the API routers.
+#
+# Scripts and other sync code can call repository coroutines through `run_sync`,
+# which runs them on one long-lived background event loop (Motor clients are
+# bound to the loop they are first used on, so a fresh asyncio.run() per call
+# would not work).
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Optional
+
+from app.repositories.base import BaseRepository, id_query, normalize
+from app.repositories.candidates import CandidateRepository, candidate_repo
+from app.repositories.jobs import JobRepository, job_repo
+from app.repositories.scores import ScoreRepository, score_repo
+from app.repositories.resumes import ResumeRepository, resume_repo
+from app.repositories.idempotency import IdempotencyRepository, idempotency_repo
+from app.repositories.cards import CardRepository, card_repo
+
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_lock = threading.Lock()
+
+
+def _loop() -> asyncio.AbstractEventLoop:
+    global _sync_loop
+    with _sync_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="repo-sync-loop", daemon=True).start()
+    return _sync_loop
+
+
+def run_sync(awaitable: Awaitable[Any]) -> Any:
+    """Sync shim for scripts: run a repository coroutine and return its result."""
+    return asyncio.run_coroutine_threadsafe(awaitable, _loop()).result()
+
+
+__all__ = [
+    "BaseRepository",
+    "CandidateRepository",
+    "JobRepository",
+    "ScoreRepository",
+    "ResumeRepository",
+    "IdempotencyRepository",
+    "CardRepository",
+    "candidate_repo",
+    "job_repo",
+    "score_repo",
+    "resume_repo",
+    "idempotency_repo",
+    "card_repo",
+    "id_query",
+    "normalize",
+    "run_sync",
+]
@@ -0,0 +1,209 @@
+# app/repositories/base.py
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError
+
+from app.core.config import settings
+from app.core.db import async_db
+from app.utils.cache import TTLCache
+from app.utils.pagination import encode_cursor, keyset_query
+
+
+def id_query(value: Any) -> Dict:
+    """Query for a document by Mongo ObjectId, falling back to the legacy string `id` field."""
+    if isinstance(value, ObjectId):
+        return {"_id": value}
+    return {"_id": ObjectId(value)} if ObjectId.is_valid(str(value)) else {"id": value}
+
+
+def stamped(fields: Dict) -> Dict:
+    """$set fields plus `updated_at` (unless given): incremental backups select changed documents by it."""
+    return {"updated_at": datetime.utcnow(), **fields}
+
+
+def normalize(doc: Optional[Dict]) -> Optional[Dict]:
+    """Copy of a Mongo document with `_id` replaced by a string `id`."""
+    if not doc:
+        return doc
+    doc = {**doc}
+    if "_id" in doc:
+        doc["id"] = str(doc.pop("_id"))
+    return doc
+
+
+class BaseRepository:
+    """
+    Async (Motor) access to one collection.
+    Subclasses set `collection_name` and the soft-delete flag used by the collection.
+    """
+
+    collection_name: str = ""
+    deleted_field: Optional[str] = None
+
+    def __init__(self, database=None):
+        self.db = database if database is not None else async_db
+        self.collection = self.db[self.collection_name]
+        self._counts = TTLCache(settings.COUNT_CACHE_SIZE, settings.COUNT_CACHE_TTL)  # query -> total
+
+    def _live(self, query: Dict, include_deleted: bool = False) -> Dict:
+        if self.deleted_field and not include_deleted:
+            return {**query, self.deleted_field: False}
+        return query
+
+    async def find_by_id(
+        self, value: Any, include_deleted: bool = False, projection: Optional[Dict] = None
+    ) -> Optional[Dict]:
+        return await self.collection.find_one(self._live(id_query(value), include_deleted), projection)
+
+    async def find_one(self, query: Dict, projection: Optional[Dict] = None) -> Optional[Dict]:
+        return await self.collection.find_one(query, projection)
+
+    async def find_by_ids(
+        self, values: Sequence[Any], include_deleted: bool = False, projection: Optional[Dict] = None
+    ) -> Dict[str, Dict]:
+        """
+        One `$in` query for many ids (ObjectId strings and/or legacy `id` values).
+        Returns {requested id (str): document}; ids that were not found are absent.
+        """
+        wanted = {str(v) for v in values if v}
+        if not wanted:
+            return {}
+        object_ids = [ObjectId(v) for v in wanted if ObjectId.is_valid(v)]
+        legacy = [v for v in wanted if not ObjectId.is_valid(v)]
+        clauses = []
+        if object_ids:
+            clauses.append({"_id": {"$in": object_ids}})
+        if legacy:
+            clauses.append({"id": {"$in": legacy}})
+        query = clauses[0] if len(clauses) == 1 else {"$or": clauses}
+        found = {}
+        async for doc in self.collection.find(self._live(query, include_deleted), projection):
+            for key in (str(doc["_id"]), doc.get("id")):
+                if key in wanted:
+                    found[key] = doc
+        return found
+
+    async def find_many(
+        self,
+        query: Optional[Dict] = None,
+        projection: Optional[Dict] = None,
+        sort: Optional[Sequence[Tuple[str, int]]] = None,
+        skip: int = 0,
+        limit: int = 0,
+        include_deleted: bool = False,
+    ) -> List[Dict]:
+        cursor = self.collection.find(self._live(query or {}, include_deleted), projection)
+        if sort:
+            cursor = cursor.sort(list(sort))
+        if skip:
+            cursor = cursor.skip(skip)
+        if limit:
+            cursor = cursor.limit(limit)
+        return await cursor.to_list(length=None)
+
+    def cursor(self, query: Optional[Dict] = None, projection: Optional[Dict] = None, include_deleted: bool = False):
+        """Raw Motor cursor for streaming (`async for doc in repo.cursor(...)`)."""
+        return self.collection.find(self._live(query or {}, include_deleted), projection)
+
+    async def find_page(
+        self,
+        query: Optional[Dict] = None,
+        limit: int = 10,
+        after: Optional[Tuple[Any, Any]] = None,
+        sort_field: str = "_id",
+        direction: int = -1,
+        projection: Optional[Dict] = None,
+        include_deleted: bool = False,
+    ) -> Tuple[List[Dict], Optional[str]]:
+        """
+        Keyset page ordered by (sort_field, _id). `after` is a decoded cursor
+        (see app.utils.pagination.decode_cursor). Returns (docs, next cursor or None);
+        cost does not depend on how deep the page is.
+        """
+        live = self._live(query or {}, include_deleted)
+        condition = keyset_query(sort_field, direction, after)
+        filter_ = {"$and": [live, condition]} if condition else live
+        sort = [("_id", direction)] if sort_field == "_id" else [(sort_field, direction), ("_id", direction)]
+        docs = await self.collection.find(filter_, projection).sort(sort).limit(limit + 1).to_list(length=None)
+        if len(docs) <= limit:
+            return docs, None
+        docs = docs[:limit]
+        last = docs[-1]
+        return docs, encode_cursor(sort_field, last.get(sort_field), last["_id"])
+
+    async def count(self, query: Optional[Dict] = None, include_deleted: bool = False) -> int:
+        return await self.collection.count_documents(self._live(query or {}, include_deleted))
+
+    async def count_cached(self, query: Optional[Dict] = None) -> int:
+        """
+        count() of live documents, cached per query for COUNT_CACHE_TTL seconds
+        (at most COUNT_CACHE_SIZE queries: filters are client-controlled).
+        Cleared by this repository's own inserts/deletes; other workers' writes
+        show up after at most the TTL.
+        """
+        key = repr(sorted((query or {}).items()))
+        value = self._counts.get(key)
+        if value is None:
+            value = await self.count(query)
+            self._counts.set(key, value)
+        return value
+
+    async def estimated_count(self) -> int:
+        """Collection size from metadata (O(1)); includes soft-deleted documents."""
+        return await self.collection.estimated_document_count()
+
+    async def insert(self, doc: Dict) -> ObjectId:
+        result = await self.collection.insert_one(doc)
+        self._counts.clear()
+        return result.inserted_id
+
+    async def insert_many(self, docs: List[Dict]) -> Tuple[int, List[Dict]]:
+        """
+        Unordered insert: one bad document (e.g. duplicate _id) does not stop the rest.
+        Returns (inserted count, write errors as {"index", "code", "message"}).
+        """
+        if not docs:
+            return 0, []
+        self._counts.clear()
+        try:
+            result = await self.collection.insert_many(docs, ordered=False)
+            return len(result.inserted_ids), []
+        except BulkWriteError as e:
+            errors = [
+                {"index": err["index"], "code": err.get("code"), "message": err.get("errmsg", "")}
+                for err in e.details.get("writeErrors", [])
+            ]
+            return e.details.get("nInserted", len(docs) - len(errors)), errors
+
+    async def update_by_id(self, value: Any, fields: Dict, include_deleted: bool = False) -> int:
+        """$set fields on a live document; returns matched count."""
+        result = await self.collection.update_one(
+            self._live(id_query(value), include_deleted), {"$set": stamped(fields)}
+        )
+        return result.matched_count
+
+    async def update_and_get(self, value: Any, fields: Dict, include_deleted: bool = False) -> Optional[Dict]:
+        """$set fields on a live document and return it as updated (one round trip); None if not found."""
+        return await self.collection.find_one_and_update(
+            self._live(id_query(value), include_deleted),
+            {"$set": stamped(fields)},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def bulk_update(self, values: Sequence[Any], fields: Dict) -> Tuple[int, int]:
+        """$set the same fields on many live documents in one bulk_write; returns (matched, modified)."""
+        fields = stamped(fields)
+        ops = [UpdateOne(self._live(id_query(v)), {"$set": fields}) for v in dict.fromkeys(values)]
+        if not ops:
+            return 0, 0
+        result = await self.collection.bulk_write(ops, ordered=False)
+        return result.matched_count, result.modified_count
+
+    async def soft_delete(self, value: Any, extra: Optional[Dict] = None) -> int:
+        fields = stamped({self.deleted_field: True, **(extra or {})})
+        result = await self.collection.update_one(id_query(value), {"$set": fields})
+        self._counts.clear()
+        return result.matched_count
@@ -0,0 +1,10 @@
+# app/repositories/candidates.py
+from app.repositories.base import BaseRepository
+
+
+class CandidateRepository(BaseRepository):
+    collection_name = "candidates"
+    deleted_field = "deleted"
+
+
+candidate_repo = CandidateRepository()
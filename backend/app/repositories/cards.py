@@ -0,0 +1,50 @@
+# app/repositories/cards.py
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pymongo import ReplaceOne, UpdateMany
+
+from app.repositories.base import BaseRepository
+
+
+class CardRepository(BaseRepository):
+    """
+    `candidate_cards`: one denormalized listing row per live candidate
+    (candidate + job + resume + score), keyed by the candidate `_id`.
+    Filter / sort keys (job_id, status, scores) are copied to the top level
+    so every listing query is a single index scan (app/core/indexes.py).
+    """
+
+    collection_name = "candidate_cards"
+
+    async def upsert_many(self, cards: List[Dict]) -> int:
+        if not cards:
+            return 0
+        result = await self.collection.bulk_write(
+            [ReplaceOne({"_id": card["_id"]}, card, upsert=True) for card in cards], ordered=False
+        )
+        self._counts.clear()
+        return result.upserted_count + result.modified_count
+
+    async def delete_ids(self, ids: Sequence[Any]) -> int:
+        if not ids:
+            return 0
+        result = await self.collection.delete_many({"_id": {"$in": list(ids)}})
+        self._counts.clear()
+        return result.deleted_count
+
+    async def set_job(self, job_refs: Sequence[str], job_row: Dict) -> int:
+        """Replace the embedded job on every card of that job (candidates may use either job id)."""
+        return await self.set_jobs([(job_refs, job_row)])
+
+    async def set_jobs(self, jobs: Sequence[Tuple[Sequence[str], Dict]]) -> int:
+        """`set_job` for many (job refs, job row) pairs in one bulk_write."""
+        if not jobs:
+            return 0
+        result = await self.collection.bulk_write(
+            [UpdateMany({"job_id": {"$in": list(refs)}}, {"$set": {"job": row}}) for refs, row in jobs],
+            ordered=False,
+        )
+        return result.modified_count
+
+
+card_repo = CardRepository()
@@ -0,0 +1,72 @@
+# app/repositories/idempotency.py
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from bson import Binary
+from pymongo.errors import DuplicateKeyError
+
+from app.repositories.base import BaseRepository
+
+PENDING = "pending"
+DONE = "done"
+
+
+class IdempotencyRepository(BaseRepository):
+    """
+    One document per `Idempotency-Key` (per endpoint scope): a pending claim
+    while the first request runs, then its stored response. Expired by the
+    TTL index on `expires_at` (app/core/indexes.py).
+    """
+
+    collection_name = "idempotency_keys"
+
+    async def claim(self, key_id: str, fingerprint: str, ttl: int, lease: int) -> Tuple[bool, Optional[Dict]]:
+        """
+        Atomically claim a key: (True, None) for the first caller, else (False, existing record).
+        The claim is held for `lease` seconds; after that another request may take it over.
+        """
+        now = datetime.utcnow()
+        try:
+            await self.collection.insert_one({
+                "_id": key_id,
+                "fingerprint": fingerprint,
+                "status": PENDING,
+                "locked_until": now + timedelta(seconds=lease),
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=ttl),
+            })
+            return True, None
+        except DuplicateKeyError:
+            existing = await self.collection.find_one({"_id": key_id})
+            if existing is None:  # released between the insert and the read
+                return await self.claim(key_id, fingerprint, ttl, lease)
+            return False, existing
+
+    async def take_over(self, key_id: str, lease: int) -> bool:
+        """Claim a pending key whose lease ran out (e.g. its worker crashed); True if won."""
+        now = datetime.utcnow()
+        result = await self.collection.update_one(
+            {"_id": key_id, "status": PENDING, "locked_until": {"$lt": now}},
+            {"$set": {"locked_until": now + timedelta(seconds=lease)}},
+        )
+        return result.modified_count == 1
+
+    async def complete(self, key_id: str, status_code: int, body: bytes, media_type: str):
+        await self.collection.update_one(
+            {"_id": key_id},
+            {"$set": {
+                "status": DONE,
+                "response": {"status_code": status_code, "body": Binary(body), "media_type": media_type},
+                "completed_at": datetime.utcnow(),
+            }},
+        )
+
+    async def release(self, key_id: str):
+        """Drop a pending claim (the request failed), so a retry runs again."""
+        await self.collection.delete_one({"_id": key_id, "status": PENDING})
+
+    async def get(self, key_id: str) -> Optional[Dict]:
+        return await self.collection.find_one({"_id": key_id})
+
+
+idempotency_repo = IdempotencyRepository()
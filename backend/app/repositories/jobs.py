@@ -0,0 +1,150 @@
+# app/repositories/jobs.py
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.core.metrics import track_cache
+from app.repositories.base import BaseRepository, id_query
+from app.utils.cache import TTLCache
+from app.utils.http_cache import weak_etag
+
+logger = logging.getLogger("job_cache")
+
+
+class JobRepository(BaseRepository):
+    """
+    Jobs, with a read-through cache: job documents change rarely but are read
+    for every listing page, score request and job page. Entries are keyed by
+    Mongo id; lookups by the legacy `id` field go through an alias map, so
+    invalidating one job is a single key removal. Writes through app/api/jobs.py
+    call `invalidate`, and `watch_invalidations` (change stream) covers other workers.
+    """
+
+    collection_name = "jobs"
+    deleted_field = "is_deleted"
+
+    def __init__(self, database=None):
+        super().__init__(database)
+        self.cache = TTLCache(settings.JOB_CACHE_SIZE, settings.JOB_CACHE_TTL)
+        # legacy `id` -> Mongo id; ids never change, so aliases need no invalidation
+        self.aliases = TTLCache(settings.JOB_CACHE_SIZE, float("inf"))
+        # rendered GET /api/jobs/ bodies (key -> (etag, body)); any job write clears them
+        self.pages = TTLCache(64, settings.JOB_CACHE_TTL)
+        # bumped by every invalidation: a read that raced a write does not re-cache what it fetched
+        self._generation = 0
+        self._watcher: Optional[asyncio.Task] = None
+
+    def _remember(self, doc: Dict, generation: int):
+        if generation != self._generation:  # invalidated while the read was in flight
+            return
+        self.cache.set(str(doc["_id"]), doc)
+        if doc.get("id"):
+            self.aliases.set(str(doc["id"]), str(doc["_id"]))
+
+    def _key(self, value: Any) -> str:
+        value = str(value)
+        return self.aliases.get(value) or value
+
+    def _visible(self, doc: Optional[Dict], include_deleted: bool) -> Optional[Dict]:
+        if doc is None or (doc.get(self.deleted_field) and not include_deleted):
+            return None
+        return {**doc}  # callers may pop/rename keys
+
+    async def get_cached(self, value: Any, include_deleted: bool = False) -> Optional[Dict]:
+        """find_by_id through the cache (deleted jobs are cached too, and filtered here)."""
+        if not value:
+            return None
+        doc = self.cache.get(self._key(value))
+        if doc is None:
+            generation = self._generation
+            doc = await self.collection.find_one(id_query(value))
+            if doc is not None:
+                self._remember(doc, generation)
+        return self._visible(doc, include_deleted)
+
+    async def get_many_cached(self, values: Sequence[Any], include_deleted: bool = False) -> Dict[str, Dict]:
+        """find_by_ids through the cache: one `$in` query for the misses only."""
+        found: Dict[str, Dict] = {}
+        missing = []
+        for value in {str(v) for v in values if v}:
+            doc = self.cache.get(self._key(value))
+            if doc is None:
+                missing.append(value)
+            else:
+                found[value] = doc
+        if missing:
+            generation = self._generation
+            fetched = await self.find_by_ids(missing, include_deleted=True)
+            for value, doc in fetched.items():
+                self._remember(doc, generation)
+                found[value] = doc
+        return {k: d for k, d in ((k, self._visible(d, include_deleted)) for k, d in found.items()) if d}
+
+    def invalidate(self, value: Any):
+        """Drop a job (by Mongo id or legacy id) from this worker's cache."""
+        self.cache.discard(self._key(value))
+        self._clear_pages()
+
+    def _clear_pages(self):
+        self._generation += 1
+        self.pages.clear()
+
+    async def cached_page(self, key: str, render: Callable[[], Awaitable[bytes]]) -> Tuple[str, bytes]:
+        """(etag, body) of a rendered list response; rendered once per key until a job changes."""
+        cached = self.pages.get(key)
+        if cached is None:
+            generation = self._generation
+            body = await render()
+            cached = (weak_etag(body), body)
+            if generation == self._generation:  # no write landed while rendering
+                self.pages.set(key, cached)
+        return cached
+
+    async def insert_many(self, docs: List[Dict]) -> Tuple[int, List[Dict]]:
+        result = await super().insert_many(docs)
+        self._clear_pages()
+        return result
+
+    # ------------------------------
+    # Cross-worker invalidation
+    # ------------------------------
+    async def watch_invalidations(self):
+        """
+        Invalidate on every change to `jobs` made by any process (Mongo change stream).
+        Change streams need a replica set; on a standalone server this logs once and
+        returns, leaving JOB_CACHE_TTL as the bound on staleness.
+        """
+        while True:
+            try:
+                async with self.collection.watch() as stream:
+                    logger.info("Job cache invalidation stream started")
+                    async for change in stream:
+                        self.invalidate(change["documentKey"]["_id"])
+            except asyncio.CancelledError:
+                raise
+            except PyMongoError as e:
+                if getattr(e, "code", None) == 40573:  # not a replica set
+                    logger.warning("Change streams unavailable; job cache relies on TTL across workers")
+                    return
+                logger.warning(f"Job cache invalidation stream error, restarting: {e}")
+                self.cache.clear()  # changes may have been missed
+                self._clear_pages()
+                await asyncio.sleep(5)
+
+    def start_watch(self):
+        if self._watcher is None:
+            self._watcher = asyncio.create_task(self.watch_invalidations())
+
+    async def stop_watch(self):
+        if self._watcher is not None:
+            self._watcher.cancel()
+            self._watcher = None
+
+
+job_repo = JobRepository()
+
+track_cache("jobs", lambda: (job_repo.cache.hits, job_repo.cache.misses))
+track_cache("job_pages", lambda: (job_repo.pages.hits, job_repo.pages.misses))
@@ -0,0 +1,48 @@
+# app/repositories/resumes.py
+from typing import AsyncIterator, Optional, Tuple
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorGridFSBucket, AsyncIOMotorGridIn
+
+from app.repositories.base import BaseRepository
+
+
+class ResumeRepository(BaseRepository):
+    """`resumes` documents plus the resume files stored in GridFS (default `fs` bucket)."""
+
+    collection_name = "resumes"
+
+    def __init__(self, database=None):
+        super().__init__(database)
+        self._bucket: Optional[AsyncIOMotorGridFSBucket] = None
+
+    @property
+    def bucket(self) -> AsyncIOMotorGridFSBucket:
+        # created lazily so the bucket binds to the running event loop
+        if self._bucket is None:
+            self._bucket = AsyncIOMotorGridFSBucket(self.db)
+        return self._bucket
+
+    async def put_file(self, data: bytes, filename: str, content_type: Optional[str] = None) -> ObjectId:
+        # top-level `contentType` on fs.files, as gridfs.GridFS.put writes it
+        # (GridFSBucket.upload_from_stream only takes `metadata`)
+        grid_in = AsyncIOMotorGridIn(self.db["fs"], filename=filename, contentType=content_type)
+        await grid_in.write(data)
+        await grid_in.close()
+        return grid_in._id
+
+    async def open_file(self, file_id: str) -> Tuple[str, AsyncIterator[bytes]]:
+        """Return (filename, async chunk iterator); raises gridfs.NoFile if missing."""
+        grid_out = await self.bucket.open_download_stream(ObjectId(file_id))
+
+        async def chunks():
+            while True:
+                chunk = await grid_out.readchunk()
+                if not chunk:
+                    break
+                yield chunk
+
+        return grid_out.filename, chunks()
+
+
+resume_repo = ResumeRepository()
@@ -0,0 +1,50 @@
+# app/repositories/scores.py
+from typing import Any, Dict, List, Optional
+
+from pymongo import DESCENDING
+
+from app.repositories.base import BaseRepository
+
+NEWEST_FIRST = [("updated_at", DESCENDING), ("_id", DESCENDING)]
+
+
+class ScoreRepository(BaseRepository):
+    collection_name = "candidate_scores"
+    deleted_field = "deleted"
+
+    async def latest_for_candidate(self, candidate_id: str) -> Optional[Dict]:
+        return await self.collection.find_one({"candidate_id": candidate_id, "deleted": False}, sort=NEWEST_FIRST)
+
+    async def latest_for_candidates(
+        self, candidate_ids: List[str], projection: Optional[Dict] = None,
+        job_ids: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Batched `latest_for_candidate`: one `$in` query, newest score per candidate.
+        With `job_ids` (candidate id -> current job_id) only the score for that job
+        counts, as in the score-ordered listing.
+        """
+        found: Dict[str, Dict] = {}
+        if not candidate_ids:
+            return found
+        if projection:
+            projection = {**projection, "candidate_id": 1, "job_id": 1}
+        cursor = self.collection.find(
+            {"candidate_id": {"$in": list(candidate_ids)}, "deleted": False}, projection, sort=NEWEST_FIRST
+        )
+        async for doc in cursor:
+            candidate_id = doc["candidate_id"]
+            if job_ids is not None and doc.get("job_id") != job_ids.get(candidate_id):
+                continue
+            found.setdefault(candidate_id, doc)
+        return found
+
+    async def upsert_score(self, candidate_id: str, job_id: Optional[str], set_doc: Dict, on_insert: Dict):
+        await self.collection.update_one(
+            {"candidate_id": candidate_id, "job_id": job_id},
+            {"$set": set_doc, "$setOnInsert": on_insert},
+            upsert=True,
+        )
+
+
+score_repo = ScoreRepository()
@@ -0,0 +1,232 @@
+# services/bulk_io.py
+# Purpose: Streaming NDJSON import / export of candidates and jobs.
+#          Import validates and inserts in chunks (insert_many, ordered=False);
+#          export streams from a cursor, so memory stays flat at any collection size.
+
+import json
+import logging
+import time
+import uuid
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from bson import ObjectId
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.models.candidate import CandidateCreate
+from app.models.job import JobCreate
+from app.repositories import BaseRepository, candidate_repo, job_repo, normalize
+from app.services import candidate_cards
+from app.services.embedding_pipeline import embedding_pipeline
+
+logger = logging.getLogger("bulk_io")
+
+MAX_LINE_BYTES = 1024 * 1024
+MAX_REPORTED_ERRORS = 100
+DUPLICATE_KEY = 11000
+
+# import id -> latest progress report of imports still running (GET /api/bulk/imports)
+active_imports: Dict[str, Dict] = {}
+
+
+class ImportKind(NamedTuple):
+    """How one collection is imported: row -> document (validation + defaults), post-insert hooks."""
+    name: str
+    repo: BaseRepository
+    to_doc: Callable[[Dict], Dict]
+    on_insert: Callable[[Dict], None]
+    on_batch: Optional[Callable[[List[Dict]], Awaitable[None]]] = None  # inserted docs of one chunk
+
+
+def _candidate_doc(row: Dict) -> Dict:
+    # same shape as POST /api/candidates/
+    doc = {k: v for k, v in CandidateCreate.model_validate(row).model_dump().items() if v is not None}
+    doc.update({"deleted": False, "status": row.get("status") or "active"})
+    return doc
+
+
+def _job_doc(row: Dict) -> Dict:
+    # same shape as POST /api/jobs/
+    doc = JobCreate.model_validate(row).model_dump()
+    now = datetime.utcnow()
+    doc.update({"created_at": now, "updated_at": now, "is_deleted": False})
+    return doc
+
+
+KINDS = {
+    "candidates": ImportKind(
+        "candidates", candidate_repo, _candidate_doc, embedding_pipeline.enqueue_candidate,
+        candidate_cards.refresh_candidates,
+    ),
+    "jobs": ImportKind("jobs", job_repo, _job_doc, embedding_pipeline.enqueue_job),
+}
+
+
+# ------------------------------
+# Import
+# ------------------------------
+async def ndjson_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, bytes]]:
+    """Split a byte stream into (line number, line); blank lines are skipped."""
+    buffer = b""
+    line_no = 0
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_no += 1
+            if line.strip():
+                yield line_no, line
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError(f"Line {line_no + 1} exceeds {MAX_LINE_BYTES} bytes")
+    if buffer.strip():
+        yield line_no + 1, buffer
+
+
+def _parse(kind: ImportKind, line_no: int, line: bytes) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """Line -> (document, None) or (None, error)."""
+    try:
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            raise ValueError("expected a JSON object")
+        # exported rows carry their id: keep it so re-imports skip existing documents
+        row.pop("_id", None)
+        ref = row.pop("id", None)
+        doc = kind.to_doc(row)
+        if ref and ObjectId.is_valid(str(ref)):
+            doc["_id"] = ObjectId(str(ref))
+        elif ref:
+            doc["id"] = ref
+        return doc, None
+    except ValidationError as e:
+        return None, {"line": line_no, "error": "; ".join(
+            f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+        )}
+    except ValueError as e:
+        return None, {"line": line_no, "error": str(e)}
+
+
+class ImportStats:
+    def __init__(self, kind: str):
+        self.import_id = uuid.uuid4().hex
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.processed = 0
+        self.inserted = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors: List[Dict] = []
+
+    def error(self, item: Dict):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(item)
+
+    def snapshot(self, event: str) -> Dict:
+        elapsed = time.perf_counter() - self.started
+        report = {
+            "import_id": self.import_id,
+            "kind": self.kind,
+            "event": event,
+            "processed": self.processed,
+            "inserted": self.inserted,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "elapsed_s": round(elapsed, 3),
+            "rows_per_sec": round(self.processed / elapsed, 1) if elapsed else 0.0,
+        }
+        if event == "done":
+            report["errors"] = self.errors
+        return report
+
+
+async def _flush(kind: ImportKind, docs: List[Dict], lines: List[int], stats: ImportStats):
+    inserted, write_errors = await kind.repo.insert_many(docs)
+    stats.inserted += inserted
+    failed_at = set()
+    for err in write_errors:
+        failed_at.add(err["index"])
+        if err["code"] == DUPLICATE_KEY:
+            stats.duplicates += 1
+        else:
+            stats.error({"line": lines[err["index"]], "error": err["message"]})
+    inserted_docs = [doc for i, doc in enumerate(docs) if i not in failed_at]
+    for doc in inserted_docs:
+        kind.on_insert(doc)
+    if kind.on_batch:
+        await kind.on_batch(inserted_docs)
+
+
+async def import_ndjson(kind_name: str, chunks: AsyncIterator[bytes], chunk_size: Optional[int] = None) -> Dict:
+    """
+    Validate and insert NDJSON rows in chunks of BULK_IMPORT_CHUNK.
+    Progress (rows/sec) is logged and published in `active_imports` after every
+    chunk; returns the final report with up to MAX_REPORTED_ERRORS line-numbered errors.
+    """
+    kind = KINDS[kind_name]
+    chunk_size = chunk_size or settings.BULK_IMPORT_CHUNK
+    stats = ImportStats(kind_name)
+    active_imports[stats.import_id] = stats.snapshot("started")
+    docs: List[Dict] = []
+    lines: List[int] = []
+    try:
+        async for line_no, line in ndjson_lines(chunks):
+            stats.processed += 1
+            doc, error = _parse(kind, line_no, line)
+            if error:
+                stats.error(error)
+                continue
+            docs.append(doc)
+            lines.append(line_no)
+            if len(docs) >= chunk_size:
+                await _flush(kind, docs, lines, stats)
+                docs, lines = [], []
+                progress = active_imports[stats.import_id] = stats.snapshot("progress")
+                logger.info(
+                    f"Importing {kind_name}: {progress['processed']} rows, {progress['rows_per_sec']} rows/s"
+                )
+        if docs:
+            await _flush(kind, docs, lines, stats)
+    except ValueError as e:
+        stats.error({"line": stats.processed + 1, "error": str(e)})
+    finally:
+        active_imports.pop(stats.import_id, None)
+    report = stats.snapshot("done")
+    logger.info(
+        f"Imported {kind_name}: {stats.inserted} inserted, {stats.duplicates} duplicates, "
+        f"{stats.failed} failed, {report['rows_per_sec']} rows/s"
+    )
+    return report
+
+
+# ------------------------------
+# Export
+# ------------------------------
+def _json_default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, bytes):
+        return None
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+async def export_ndjson(kind_name: str, batch_size: int = 1000, log_every: int = 10000) -> AsyncIterator[bytes]:
+    """Live documents as NDJSON (one `id`-keyed object per line), streamed from a cursor."""
+    repo = KINDS[kind_name].repo
+    started = time.perf_counter()
+    rows = 0
+    buffer: List[str] = []
+    async for doc in repo.cursor().sort("_id", 1).batch_size(batch_size):
+        buffer.append(json.dumps(normalize(doc), default=_json_default, ensure_ascii=False))
+        rows += 1
+        if len(buffer) >= batch_size:
+            yield ("\n".join(buffer) + "\n").encode("utf-8")
+            buffer = []
+        if rows % log_every == 0:
+            logger.info(f"Exporting {kind_name}: {rows} rows, {rows / (time.perf_counter() - started):.0f} rows/s")
+    if buffer:
+        yield ("\n".join(buffer) + "\n").encode("utf-8")
+    elapsed = time.perf_counter() - started
+    logger.info(f"Exported {rows} {kind_name} in {elapsed:.1f}s ({rows / elapsed if elapsed else 0:.0f} rows/s)")
@@ -0,0 +1,273 @@
+# services/candidate_cards.py
+# Purpose: Listing rows (candidate + job + resume + score) and the `candidate_cards`
+#          read model that stores them pre-joined. Cards are refreshed by the candidate,
+#          job, score and bulk import write paths; `rebuild` / `check` keep them honest.
+#          Resumes need no hook: an upload only stores a new GridFS file (no card can
+#          reference it yet), linking one is a candidate write (`resume_id`), and the
+#          embedded `resumes` document is not written by the app.
+#
+#   python -m app.services.candidate_cards rebuild
+#   python -m app.services.candidate_cards check [--repair]
+
+import asyncio
+import logging
+from typing import Any, Dict, List, Optional
+
+from pymongo.errors import PyMongoError
+
+from app.models.candidate import CandidateResponse
+from app.models.job import JobResponse, JobSummary
+from app.models.scoring import CandidateScore, ScoreSummary
+from app.repositories import card_repo, candidate_repo, job_repo, normalize, resume_repo, score_repo
+from app.utils.fields import pick, projection
+from app.utils.serialization import trusted_row
+
+logger = logging.getLogger("candidate_cards")
+
+JOB_SUMMARY_FIELDS = list(JobSummary.model_fields)
+SCORE_SUMMARY_FIELDS = list(ScoreSummary.model_fields)
+
+
+def candidate_projection(fields: Optional[List[str]]) -> Optional[Dict]:
+    """Projection for the listed candidates; keeps the keys needed to hydrate relations."""
+    if fields is None:
+        return None
+    return projection([*fields, "job_id", "resume_id"])
+
+
+def job_row(job: Dict) -> Dict:
+    """
+    JobResponse row of a stored (normalized) job. Timestamps a legacy job lacks stay
+    None rather than defaulting to now, so a rebuilt card compares equal to the stored one.
+    """
+    return {
+        **trusted_row(JobResponse, job),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at"),
+    }
+
+
+async def hydrate_candidates(
+    candidates: List[Dict], fields: Optional[List[str]] = None, scores: Optional[Dict[str, Dict]] = None,
+) -> List[Dict]:
+    """
+    Attach job, resume and score to a page of candidate documents.
+    Jobs come from the job cache (one `$in` query for misses); resumes and
+    scores are one batched `$in` query each, all run concurrently, whatever the
+    page size (instead of three `find_one` round trips per candidate).
+    With `fields` (sparse listing) the candidate is cut down to those fields and
+    job / score to their summary models. The score is the candidate's newest one for
+    its current job. `scores` (candidate id -> score document) skips the score
+    lookup when the caller already has them.
+    """
+    candidate_ids = [str(c["_id"]) for c in candidates]
+    slim = fields is not None
+
+    async def no_lookup():
+        return scores
+
+    jobs, resumes, scores = await asyncio.gather(
+        job_repo.get_many_cached([c.get("job_id") for c in candidates], include_deleted=True),
+        resume_repo.find_by_ids([c.get("resume_id") for c in candidates]),
+        no_lookup() if scores is not None else score_repo.latest_for_candidates(
+            candidate_ids, projection=projection(SCORE_SUMMARY_FIELDS) if slim else None,
+            job_ids={str(c["_id"]): c.get("job_id") for c in candidates},
+        ),
+    )
+
+    result = []
+    for candidate in candidates:
+        candidate = normalize(candidate)
+        job = normalize(jobs.get(str(candidate.get("job_id"))))
+        resume = normalize(resumes.get(str(candidate.get("resume_id"))))
+
+        score_doc = normalize(scores.get(candidate["id"]))
+        if slim:
+            result.append({
+                "candidate": pick(candidate, fields),
+                "job": pick(job, JOB_SUMMARY_FIELDS) if job else None,
+                "resume": resume if resume else None,
+                "score": pick(score_doc, SCORE_SUMMARY_FIELDS) if score_doc else None,
+            })
+            continue
+
+        # stored documents are trusted (validated on write): shaped, not re-validated
+        result.append({
+            "candidate": trusted_row(CandidateResponse, candidate),
+            "job": job_row(job) if job else None,
+            "resume": resume if resume else None,
+            "score": trusted_row(CandidateScore, score_doc) if score_doc else None,
+        })
+    return result
+
+
+
+# ------------------------------
+# Cards
+# ------------------------------
+ROW_KEYS = ("candidate", "job", "resume", "score")
+
+
+def to_card(candidate_id: Any, row: Dict) -> Dict:
+    """Full listing row -> card document (row + top-level filter/sort keys)."""
+    candidate, score = row["candidate"], row["score"] or {}
+    return {
+        "_id": candidate_id,
+        **row,
+        "job_id": candidate.get("job_id"),
+        "status": candidate.get("status"),
+        "overall_score": score.get("overall_score"),
+        "fitment_score": score.get("fitment_score"),
+        "fitment_status": score.get("fitment_status"),
+    }
+
+
+def card_projection(fields: Optional[List[str]]) -> Optional[Dict]:
+    """Projection of the card parts a (sparse) listing row needs."""
+    if fields is None:
+        return {key: 1 for key in ROW_KEYS}
+    return {
+        **{f"candidate.{f}": 1 for f in fields},
+        **{f"job.{f}": 1 for f in JOB_SUMMARY_FIELDS},
+        **{f"score.{f}": 1 for f in SCORE_SUMMARY_FIELDS},
+        "resume": 1,
+    }
+
+
+def card_row(card: Dict, fields: Optional[List[str]] = None) -> Dict:
+    """Card -> the same row hydrate_candidates returns."""
+    if fields is None:
+        return {key: card.get(key) for key in ROW_KEYS}
+    job, score = card.get("job"), card.get("score")
+    return {
+        "candidate": pick(card.get("candidate") or {}, fields),
+        "job": pick(job, JOB_SUMMARY_FIELDS) if job else None,
+        "resume": card.get("resume"),
+        "score": pick(score, SCORE_SUMMARY_FIELDS) if score else None,
+    }
+
+
+async def build_cards(candidates: List[Dict]) -> List[Dict]:
+    rows = await hydrate_candidates(candidates)
+    return [to_card(c["_id"], row) for c, row in zip(candidates, rows)]
+
+
+async def refresh_candidates(candidates: List[Dict]):
+    """
+    Rebuild the cards of these candidate documents (soft-deleted ones are removed).
+    Called after the write succeeded, so a failure is logged rather than raised;
+    `check --repair` fixes any drift.
+    """
+    try:
+        await card_repo.upsert_many(await build_cards([c for c in candidates if not c.get("deleted")]))
+        await card_repo.delete_ids([c["_id"] for c in candidates if c.get("deleted")])
+    except PyMongoError:
+        logger.exception(f"Failed to refresh {len(candidates)} candidate card(s)")
+
+
+async def refresh_candidate_ids(candidate_ids: List[Any]):
+    found = await candidate_repo.find_by_ids(candidate_ids, include_deleted=True)
+    docs = list({str(d["_id"]): d for d in found.values()}.values())
+    await refresh_candidates(docs)
+
+
+async def remove_candidate(candidate_id: Any):
+    try:
+        await card_repo.delete_ids([candidate_id])
+    except PyMongoError:
+        logger.exception(f"Failed to remove card {candidate_id}")
+
+
+async def refresh_job(job: Optional[Dict]):
+    """Push a changed job into the cards of its candidates (one update_many)."""
+    if job:
+        await refresh_jobs([job])
+
+
+async def refresh_jobs(jobs: List[Dict]):
+    """`refresh_job` for many jobs: one bulk_write of update_many per job."""
+    if not jobs:
+        return
+    updates = [
+        ([str(job["_id"])] + ([str(job["id"])] if job.get("id") else []), job_row(normalize(job)))
+        for job in jobs
+    ]
+    try:
+        await card_repo.set_jobs(updates)
+    except PyMongoError:
+        logger.exception(f"Failed to refresh cards of {len(jobs)} job(s)")
+
+
+# ------------------------------
+# Rebuild / consistency check
+# ------------------------------
+async def sync_cards(write: bool = True, compare: bool = False, batch_size: int = 500) -> Dict[str, int]:
+    """
+    Walk all live candidates in `_id` order and rebuild their cards, then drop
+    cards without a live candidate. With `compare`, only missing / stale cards
+    are counted (and written when `write`).
+    """
+    report = {"candidates": 0, "missing": 0, "stale": 0, "orphans": 0, "written": 0, "removed": 0}
+    last_id = None
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        batch = await candidate_repo.find_many(query, sort=[("_id", 1)], limit=batch_size)
+        if not batch:
+            break
+        last_id = batch[-1]["_id"]
+        report["candidates"] += len(batch)
+        expected = await build_cards(batch)
+        if compare:
+            stored = {c["_id"]: c for c in await card_repo.find_many({"_id": {"$in": [c["_id"] for c in batch]}})}
+            changed = []
+            for card in expected:
+                current = stored.get(card["_id"])
+                if current is None:
+                    report["missing"] += 1
+                    changed.append(card)
+                elif current != card:
+                    report["stale"] += 1
+                    changed.append(card)
+            expected = changed
+        if write and expected:
+            report["written"] += await card_repo.upsert_many(expected)
+
+    last_id = None
+    while True:
+        query = {"_id": {"$gt": last_id}} if last_id is not None else {}
+        ids = [c["_id"] for c in await card_repo.find_many(query, {"_id": 1}, sort=[("_id", 1)], limit=batch_size)]
+        if not ids:
+            break
+        last_id = ids[-1]
+        live = {c["_id"] for c in await candidate_repo.find_many({"_id": {"$in": ids}}, {"_id": 1})}
+        orphans = [i for i in ids if i not in live]
+        report["orphans"] += len(orphans)
+        if write:
+            report["removed"] += await card_repo.delete_ids(orphans)
+    logger.info(f"Candidate cards sync: {report}")
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    from app.repositories import run_sync
+
+    parser = argparse.ArgumentParser(description="Rebuild or verify the candidate_cards read model")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--repair", action="store_true", help="check: rewrite missing / stale cards")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.command == "rebuild":
+        result = run_sync(sync_cards(write=True, batch_size=args.batch))
+    else:
+        result = run_sync(sync_cards(write=args.repair, compare=True, batch_size=args.batch))
+    print(result)
+    if args.command == "rebuild":
+        print("✅ candidate_cards rebuilt")
+    else:
+        drift = result["missing"] + result["stale"] + result["orphans"]
+        if drift and not args.repair:
+            raise SystemExit(f"❌ {drift} card(s) out of date; run with --repair")
+        print(f"✅ repaired {drift} card(s)" if drift else "✅ candidate_cards consistent")
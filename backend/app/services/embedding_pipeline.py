@@ -0,0 +1,296 @@
+# services/embedding_pipeline.py
+# Purpose: Keep the resume (candidate) and job vector indexes in sync with Mongo.
+#          Write handlers enqueue documents; a background worker embeds them in batches.
+
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.db import candidates_collection, jobs_collection
+from app.services.embeddings import embedding_service
+from app.services.vectorstore import VectorStore
+from app.utils.text_utils import html_to_text
+
+logger = logging.getLogger("embedding_pipeline")
+
+RESUME_INDEX = "resumes"
+JOB_INDEX = "jobs"
+
+
+def candidate_embedding_text(doc: Dict) -> str:
+    """Text that represents a candidate's resume in the vector index."""
+    extra = doc.get("extra_data") or {}
+    parts = [
+        doc.get("position") or "",
+        f"Skills: {', '.join(doc.get('skills') or [])}",
+        f"Experience: {doc.get('years_of_experience') or ''} years",
+        f"Location: {doc.get('location') or ''}",
+        doc.get("experience_summary") or "",
+    ]
+    for project in extra.get("projects") or []:
+        if isinstance(project, dict):
+            techs = ", ".join(project.get("technologies") or [])
+            parts.append(f"Project: {project.get('title', '')} {project.get('description', '')} {techs}")
+    for key in ("certifications", "role_specific_highlights"):
+        values = extra.get(key) or []
+        if isinstance(values, list) and values:
+            parts.append(", ".join(str(v) for v in values))
+    return "\n".join(p for p in parts if p and p.strip())
+
+
+def job_embedding_text(doc: Dict) -> str:
+    """Text that represents a job opening in the vector index."""
+    parts = [
+        doc.get("title") or "",
+        f"Department: {doc.get('department') or ''}",
+        f"Location: {doc.get('location') or ''}",
+        f"Experience: {doc.get('experience') or ''}",
+        html_to_text(doc.get("description")),
+        html_to_text(doc.get("responsibilities")),
+        html_to_text(doc.get("requirements")),
+    ]
+    return "\n".join(p for p in parts if p and p.strip())
+
+
+_NUMBER_RE = re.compile(r"\d+(?:\.\d+)?")
+
+
+def parse_years(value: Any) -> Optional[float]:
+    """'5', '5+ years', '3.5 yrs' -> float; None when no number is present."""
+    if isinstance(value, (int, float)):
+        return float(value)
+    match = _NUMBER_RE.search(str(value or ""))
+    return float(match.group(0)) if match else None
+
+
+def location_tokens(value: Optional[str]) -> List[str]:
+    """'Pune, India' -> ['pune', 'india'] (matched against the `location` search filter)."""
+    return [t.strip() for t in re.split(r"[,/;|]+", (value or "").lower()) if t.strip()]
+
+
+def candidate_filter_metadata(doc: Dict) -> Dict:
+    """Filterable fields stored next to the vector id in `vector_refs` (pre-filtering for ANN search)."""
+    return {
+        "location": location_tokens(doc.get("location")),
+        "years": parse_years(doc.get("years_of_experience")),
+        "job_id": str(doc["job_id"]) if doc.get("job_id") else None,
+        "status": doc.get("status") or "active",
+    }
+
+
+def job_filter_metadata(doc: Dict) -> Dict:
+    return {
+        "location": location_tokens(doc.get("location")),
+        "status": doc.get("status", 2),
+        "department": doc.get("department"),
+    }
+
+
+class EmbeddingPipeline:
+    """
+    Batched embedding of candidates and jobs.
+
+    `enqueue_*` is cheap and non-blocking (safe to call from request handlers);
+    the worker drains the queue in batches of EMBEDDING_BATCH_SIZE, or after
+    EMBEDDING_FLUSH_INTERVAL seconds for partial batches, embeds only texts
+    whose hash changed, and upserts them into the ID-mapped indexes.
+    """
+
+    def __init__(self):
+        self.stores: Dict[str, VectorStore] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._snapshotter: Optional[asyncio.Task] = None
+
+    def store(self, name: str) -> VectorStore:
+        if name not in self.stores:
+            self.stores[name] = VectorStore(name, dim=settings.VECTOR_DIM)
+        return self.stores[name]
+
+    # ------------------------------
+    # Producer side
+    # ------------------------------
+    def _put(self, item: Tuple[str, str, str, Optional[Dict]]):
+        if self._queue is None:
+            return  # pipeline not started (scripts / tests)
+        self._queue.put_nowait(item)
+
+    def enqueue_candidate(self, doc: Dict):
+        ref_id = str(doc.get("_id") or doc.get("id"))
+        if doc.get("deleted"):
+            self._put(("delete", RESUME_INDEX, ref_id, None))
+        else:
+            self._put(("upsert", RESUME_INDEX, ref_id, doc))
+
+    def enqueue_job(self, doc: Dict):
+        ref_id = str(doc.get("_id") or doc.get("id"))
+        if doc.get("is_deleted"):
+            self._put(("delete", JOB_INDEX, ref_id, None))
+        else:
+            self._put(("upsert", JOB_INDEX, ref_id, doc))
+
+    def remove(self, index: str, ref_id: str):
+        self._put(("delete", index, str(ref_id), None))
+
+    # ------------------------------
+    # Worker side
+    # ------------------------------
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+            self._snapshotter = asyncio.create_task(self._snapshot_loop())
+            logger.info("Embedding pipeline started")
+
+    async def stop(self):
+        if self._worker is None:
+            return
+        await self._queue.join()
+        self._worker.cancel()
+        self._snapshotter.cancel()
+        self._worker = None
+        self._snapshotter = None
+        self._queue = None
+        for store in self.stores.values():
+            await asyncio.to_thread(store.close)
+        logger.info("Embedding pipeline stopped")
+
+    async def _snapshot_loop(self):
+        """Periodic persistence: snapshot stores whose append log is older than VECTOR_SNAPSHOT_INTERVAL."""
+        while True:
+            await asyncio.sleep(max(1, settings.VECTOR_SNAPSHOT_INTERVAL // 4))
+            for store in list(self.stores.values()):
+                try:
+                    await asyncio.to_thread(store.maybe_snapshot)
+                except Exception:
+                    logger.exception(f"Snapshot of '{store.name}' failed")
+
+    async def _next_batch(self) -> List[Tuple[str, str, str, Optional[Dict]]]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.EMBEDDING_FLUSH_INTERVAL
+        while len(batch) < settings.EMBEDDING_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            try:
+                await asyncio.to_thread(self.process_batch, batch)
+            except Exception:
+                logger.exception(f"Embedding batch of {len(batch)} failed")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def process_batch(self, batch: List[Tuple[str, str, str, Optional[Dict]]]):
+        """Apply a batch of upserts/deletes (blocking). Later entries for the same id win."""
+        latest: Dict[Tuple[str, str], Tuple[str, Optional[Dict]]] = {}
+        for op, index, ref_id, doc in batch:
+            latest[(index, ref_id)] = (op, doc)
+
+        by_index: Dict[str, Dict[str, List]] = {}
+        for (index, ref_id), (op, doc) in latest.items():
+            bucket = by_index.setdefault(index, {"upsert": [], "delete": []})
+            bucket[op].append((ref_id, doc))
+
+        for index, ops in by_index.items():
+            store = self.store(index)
+            if ops["delete"]:
+                store.delete([ref_id for ref_id, _ in ops["delete"]])
+            if ops["upsert"]:
+                self._upsert(store, ops["upsert"])
+
+    def _upsert(self, store: VectorStore, items: List[Tuple[str, Dict]]):
+        if store.name == RESUME_INDEX:
+            to_text, to_meta = candidate_embedding_text, candidate_filter_metadata
+        else:
+            to_text, to_meta = job_embedding_text, job_filter_metadata
+        texts = {ref_id: to_text(doc) for ref_id, doc in items}
+        metadata = {ref_id: to_meta(doc) for ref_id, doc in items}
+        hashes = {ref_id: embedding_service.text_hash(t) for ref_id, t in texts.items()}
+
+        indexed = store.indexed_hashes(list(texts))
+        changed = [r for r in texts if texts[r] and indexed.get(r) != hashes[r]]
+        unchanged = [r for r in texts if r in indexed and indexed[r] == hashes[r]]
+        if unchanged:
+            # e.g. a status change: no re-embedding, only the filter fields move
+            store.update_metadata(unchanged, [metadata[r] for r in unchanged])
+        if not changed:
+            return
+
+        vectors = embedding_service.embed_texts([texts[r] for r in changed])
+        store.upsert(changed, vectors, [hashes[r] for r in changed], [metadata[r] for r in changed])
+        logger.info(f"Indexed {len(changed)} document(s) into '{store.name}' (size={store.size})")
+
+    # ------------------------------
+    # Backfill / search
+    # ------------------------------
+    def backfill(self, index: str, batch_size: Optional[int] = None) -> int:
+        """Embed every live document of a kind (blocking, batched). Returns documents processed."""
+        batch_size = batch_size or settings.EMBEDDING_BATCH_SIZE
+        if index == RESUME_INDEX:
+            cursor = candidates_collection.find({"deleted": False})
+        else:
+            cursor = jobs_collection.find({"is_deleted": False})
+
+        store = self.store(index)
+        total = 0
+        items: List[Tuple[str, Dict]] = []
+        for doc in cursor.batch_size(batch_size):
+            items.append((str(doc["_id"]), doc))
+            if len(items) >= batch_size:
+                self._upsert(store, items)
+                total += len(items)
+                items = []
+        if items:
+            self._upsert(store, items)
+            total += len(items)
+        return total
+
+    def search(
+        self, index: str, query: str, top_k: int = 10, filters: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Semantic search (blocking): returns (Mongo id, similarity) pairs, best first.
+        `filters` is a Mongo filter over the metadata fields in `vector_refs`
+        (see candidate_filter_metadata / job_filter_metadata), applied inside the ANN search.
+        """
+        query_vector = embedding_service.embed_query(query)
+        return self.store(index).search_refs(query_vector, top_k, filters)
+
+    def recommend_jobs(self, candidate: Dict, top_n: int = 5, exclude_job_id: Optional[str] = None):
+        """
+        Open jobs (status == 1) closest to a candidate's resume embedding (blocking).
+        The candidate vector comes from the embedding cache, so this costs no LLM call.
+        """
+        text = candidate_embedding_text(candidate)
+        if not text:
+            return []
+        query_vector = embedding_service.embed_texts([text])
+        filters: Dict[str, Any] = {"status": 1}
+        if exclude_job_id:
+            filters["ref_id"] = {"$ne": str(exclude_job_id)}
+        return self.store(JOB_INDEX).search_refs(query_vector, top_n, filters)
+
+
+embedding_pipeline = EmbeddingPipeline()
+
+
+if __name__ == "__main__":
+    # python -m app.services.embedding_pipeline [resumes|jobs ...]
+    import sys
+
+    for name in sys.argv[1:] or [RESUME_INDEX, JOB_INDEX]:
+        count = embedding_pipeline.backfill(name)
+        embedding_pipeline.store(name).close()
+        print(f"✅ Backfilled {count} document(s) into '{name}'")
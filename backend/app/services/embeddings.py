@@ -0,0 +1,236 @@
+# services/embeddings.py
+# Purpose: Turn resume / job text into normalized vectors (Gemini, local model or offline hashing),
+#          with an embedding cache keyed by text hash (in-process LRU + Mongo).
+
+import hashlib
+import logging
+import re
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+from bson.binary import Binary
+
+from app.core.config import settings
+from app.core.metrics import track_cache
+from app.core.db import embedding_cache_collection
+
+logger = logging.getLogger("embeddings")
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.\-]*")
+
+
+class EmbeddingError(Exception):
+    """Raised when an embedding backend cannot produce vectors."""
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype="float32")
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+# ------------------------------
+# Embedders
+# ------------------------------
+class GeminiEmbedder:
+    """Remote embeddings through the Gemini embedding API (batched request per call)."""
+
+    max_batch = 100  # batchEmbedContents limit
+
+    def __init__(self, dim: int):
+        import google.generativeai as genai
+
+        genai.configure(api_key=settings.GEMINI_API_KEY)
+        self._genai = genai
+        self.dim = dim
+        model = settings.EMBEDDING_MODEL_NAME
+        self.model = model if model.startswith("models/") else f"models/{model}"
+        self.name = f"gemini:{self.model}:{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        out = []
+        for i in range(0, len(texts), self.max_batch):
+            chunk = texts[i:i + self.max_batch]
+            result = self._genai.embed_content(
+                model=self.model,
+                content=chunk,
+                task_type="retrieval_document",
+                output_dimensionality=self.dim,
+            )
+            out.extend(result["embedding"])
+        return _normalize(np.array(out, dtype="float32"))
+
+
+class SentenceTransformerEmbedder:
+    """Local, offline embeddings with a sentence-transformers model (optional dependency)."""
+
+    def __init__(self, dim: int):
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError:
+            raise EmbeddingError(
+                "EMBEDDING_PROVIDER=sentence-transformers requires the 'sentence-transformers' package"
+            )
+        self.model = SentenceTransformer(settings.LOCAL_EMBEDDING_MODEL)
+        model_dim = self.model.get_sentence_embedding_dimension()
+        if model_dim != dim:
+            raise EmbeddingError(
+                f"{settings.LOCAL_EMBEDDING_MODEL} produces {model_dim}-d vectors but VECTOR_DIM={dim}"
+            )
+        self.dim = dim
+        self.name = f"st:{settings.LOCAL_EMBEDDING_MODEL}:{dim}"
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = self.model.encode(texts, batch_size=settings.EMBEDDING_BATCH_SIZE, show_progress_bar=False)
+        return _normalize(vectors)
+
+
+class HashingEmbedder:
+    """
+    Offline embedder with no model download: signed feature hashing of
+    unigrams + bigrams with log term frequency. Good enough for keyword-heavy
+    matching (skills, titles) and for running the pipeline in dev/CI.
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+        self.name = f"hashing:v1:{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        tokens = _TOKEN_RE.findall((text or "").lower())
+        return tokens + [f"{a} {b}" for a, b in zip(tokens, tokens[1:])]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype="float32")
+        for row, text in enumerate(texts):
+            counts: Dict[str, int] = {}
+            for feature in self._features(text):
+                counts[feature] = counts.get(feature, 0) + 1
+            for feature, count in counts.items():
+                digest = hashlib.blake2b(feature.encode(), digest_size=8).digest()
+                h = int.from_bytes(digest, "little")
+                sign = 1.0 if h & 1 else -1.0
+                vectors[row, (h >> 1) % self.dim] += sign * (1.0 + np.log(count))
+        return _normalize(vectors)
+
+
+_EMBEDDERS = {
+    "gemini": GeminiEmbedder,
+    "sentence-transformers": SentenceTransformerEmbedder,
+    "hashing": HashingEmbedder,
+}
+
+
+def create_embedder(provider: Optional[str] = None, dim: Optional[int] = None):
+    provider = (provider or settings.EMBEDDING_PROVIDER).lower()
+    if provider not in _EMBEDDERS:
+        raise EmbeddingError(f"Unknown EMBEDDING_PROVIDER '{provider}' (expected one of {list(_EMBEDDERS)})")
+    return _EMBEDDERS[provider](dim or settings.VECTOR_DIM)
+
+
+# ------------------------------
+# Cached embedding service
+# ------------------------------
+class EmbeddingService:
+    """
+    Embeds texts in batches. Each text is looked up by hash of
+    (embedder name, text) first in an in-process LRU, then in Mongo;
+    only misses are sent to the embedder, in one batch.
+    """
+
+    def __init__(self, embedder=None):
+        self._embedder = embedder
+        self._lru: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"requested": 0, "memory_hits": 0, "db_hits": 0, "embedded": 0}
+
+    @property
+    def embedder(self):
+        if self._embedder is None:
+            self._embedder = create_embedder()
+            logger.info(f"Embedding provider initialized: {self._embedder.name}")
+        return self._embedder
+
+    @property
+    def dim(self) -> int:
+        return self.embedder.dim
+
+    def text_hash(self, text: str) -> str:
+        return hashlib.sha256(f"{self.embedder.name}\x00{text}".encode("utf-8")).hexdigest()
+
+    def _remember(self, key: str, vector: np.ndarray):
+        with self._lock:
+            self._lru[key] = vector
+            self._lru.move_to_end(key)
+            while len(self._lru) > settings.EMBEDDING_CACHE_SIZE:
+                self._lru.popitem(last=False)
+
+    def embed_texts(self, texts: List[str], persist: bool = True) -> np.ndarray:
+        """
+        Return an (n, dim) float32 matrix of normalized embeddings. Blocking; call via a thread.
+        With persist=False (ad-hoc queries) new vectors are only kept in the in-process LRU.
+        """
+        if not texts:
+            return np.zeros((0, self.dim), dtype="float32")
+
+        keys = [self.text_hash(t) for t in texts]
+        found: Dict[str, np.ndarray] = {}
+        self.stats["requested"] += len(texts)
+
+        with self._lock:
+            for key in keys:
+                if key in self._lru:
+                    found[key] = self._lru[key]
+                    self._lru.move_to_end(key)
+        self.stats["memory_hits"] += len(found)
+
+        missing = [k for k in dict.fromkeys(keys) if k not in found]
+        if missing:
+            for doc in embedding_cache_collection.find({"_id": {"$in": missing}}, {"vector": 1}):
+                vector = np.frombuffer(doc["vector"], dtype="float32")
+                if vector.shape[0] == self.dim:
+                    found[doc["_id"]] = vector
+                    self._remember(doc["_id"], vector)
+                    self.stats["db_hits"] += 1
+
+        to_embed = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in to_embed:
+                to_embed[key] = text
+        if to_embed:
+            vectors = self.embedder.embed(list(to_embed.values()))
+            now = datetime.utcnow()
+            docs = []
+            for key, vector in zip(to_embed.keys(), vectors):
+                found[key] = vector
+                self._remember(key, vector)
+                docs.append({
+                    "_id": key,
+                    "vector": Binary(vector.astype("float32").tobytes()),
+                    "model": self.embedder.name,
+                    "created_at": now,
+                })
+            self.stats["embedded"] += len(docs)
+            if persist:
+                try:
+                    embedding_cache_collection.insert_many(docs, ordered=False)
+                except Exception as e:
+                    # duplicates from a concurrent worker are expected and harmless
+                    logger.debug(f"Embedding cache insert: {e}")
+
+        return np.vstack([found[k] for k in keys]).astype("float32")
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embed_texts([text], persist=False)
+
+
+embedding_service = EmbeddingService()
+
+track_cache("embeddings", lambda: (
+    embedding_service.stats["memory_hits"] + embedding_service.stats["db_hits"],
+    embedding_service.stats["embedded"],
+))
@@ -0,0 +1,165 @@
+# services/health.py
+# Purpose: Health checks run by a background task every HEALTH_CHECK_INTERVAL seconds;
+#          /health, /health/ready and /system-health only read the cached results, so
+#          load-balancer probing costs no Mongo round trip, DNS lookup or file write.
+#          All checks are in-process (no HTTP calls to our own port, which could
+#          deadlock a single worker).
+
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.db import async_client
+from app.core.executors import POOLS
+
+logger = logging.getLogger("health")
+
+PENDING = "pending"
+
+
+# ------------------------------
+# Checks: each returns "ok" or a short failure description
+# ------------------------------
+async def check_mongodb() -> str:
+    await async_client.admin.command("ping")
+    return "ok"
+
+
+def _touch_log_file() -> str:
+    log_dir = os.path.dirname(settings.LOG_FILE)
+    if log_dir and not os.path.exists(log_dir):
+        os.makedirs(log_dir)
+    with open(settings.LOG_FILE, "a") as f:
+        f.write("")
+    return "ok"
+
+
+async def check_logging() -> str:
+    return await asyncio.to_thread(_touch_log_file)
+
+
+async def check_env() -> str:
+    required_envs = ["MONGO_URI", "MONGO_DB_NAME", "ENCRYPTION_KEY", "JWT_SECRET_KEY"]
+    missing_envs = [
+        var for var in required_envs
+        if not getattr(settings, var, None) or getattr(settings, var) in ["", "None"]
+    ]
+    return "ok" if not missing_envs else f"missing: {', '.join(missing_envs)}"
+
+
+async def check_network() -> str:
+    if not settings.HEALTH_DNS_HOST:
+        return "ok"
+    # resolver runs in the loop's default executor: never blocks request handling
+    await asyncio.get_running_loop().getaddrinfo(settings.HEALTH_DNS_HOST, None)
+    return "ok"
+
+
+async def check_executors() -> str:
+    full = [
+        name for name, pool in POOLS.items()
+        if pool.admitted >= pool.workers + pool.queue_limit
+    ]
+    return "ok" if not full else f"saturated: {', '.join(full)}"
+
+
+# (name, check, critical): readiness fails only on critical checks
+CHECKS: List[Tuple[str, Callable[[], Awaitable[str]], bool]] = [
+    ("mongodb", check_mongodb, True),
+    ("env", check_env, True),
+    ("logging", check_logging, False),
+    ("network", check_network, False),
+    ("executors", check_executors, False),
+]
+
+
+class HealthMonitor:
+    """Runs CHECKS in the background and keeps the latest result of each."""
+
+    def __init__(self):
+        self.results: Dict[str, Dict[str, Any]] = {
+            name: {"status": PENDING, "ok": False, "duration": 0.0, "critical": critical}
+            for name, _, critical in CHECKS
+        }
+        self.checked_at: Optional[datetime] = None
+        self.loop_lag = 0.0         # seconds the refresher woke up late (event loop blocked)
+        self._refreshed = 0.0       # time.monotonic() of the last completed round
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    async def _run_check(self, name: str, check: Callable[[], Awaitable[str]], critical: bool):
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(check(), settings.HEALTH_CHECK_TIMEOUT)
+        except asyncio.TimeoutError:
+            status = f"error: timed out after {settings.HEALTH_CHECK_TIMEOUT}s"
+        except Exception as e:
+            status = f"error: {str(e)}"
+        ok = status == "ok"
+        if not ok and self.results[name]["ok"]:
+            logger.warning(f"Health check {name} failing: {status}")
+        self.results[name] = {
+            "status": status, "ok": ok, "duration": time.perf_counter() - start, "critical": critical,
+        }
+
+    async def refresh(self):
+        await asyncio.gather(*(self._run_check(name, check, critical) for name, check, critical in CHECKS))
+        self.checked_at = datetime.now(timezone.utc)
+        self._refreshed = time.monotonic()
+
+    async def _loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                logger.exception("Health check round failed")
+            expected = time.monotonic() + settings.HEALTH_CHECK_INTERVAL
+            await asyncio.sleep(settings.HEALTH_CHECK_INTERVAL)
+            self.loop_lag = max(0.0, time.monotonic() - expected)
+
+    async def start(self):
+        if self._task is None:
+            self._stopping = False
+            self._task = asyncio.create_task(self._loop())
+            logger.info("Health monitor started")
+
+    async def stop(self):
+        # readiness turns false first, so the load balancer drains this worker
+        self._stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+            logger.info("Health monitor stopped")
+
+    def is_stale(self) -> bool:
+        return not self._refreshed or time.monotonic() - self._refreshed > 3 * settings.HEALTH_CHECK_INTERVAL
+
+    def readiness(self) -> Tuple[bool, Dict[str, Any]]:
+        failing = [name for name, result in self.results.items() if result["critical"] and not result["ok"]]
+        if self._stopping:
+            failing.append("shutting down")
+        elif self.is_stale():
+            failing.append("stale" if self._refreshed else "starting")
+        return not failing, {
+            "status": "ready" if not failing else "not ready",
+            "failing": failing,
+            "checked_at": self.checked_at,
+        }
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Latest results plus the event loop lag seen by the refresher."""
+        lag_ok = self.loop_lag < 1.0
+        return {
+            **self.results,
+            "event_loop": {
+                "status": "ok" if lag_ok else f"blocked for {self.loop_lag:.2f}s",
+                "ok": lag_ok, "duration": self.loop_lag, "critical": False,
+            },
+        }
+
+
+health_monitor = HealthMonitor()
@@ -0,0 +1,138 @@
+# services/idempotency.py
+# Purpose: `Idempotency-Key` support for expensive POST endpoints (GridFS write + LLM call).
+#          The first request with a key runs and its response is stored; repeats get the
+#          stored response, concurrent duplicates wait for the first one to finish.
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import HTTPException, Request, Response
+
+from app.core.config import settings
+from app.core.deadline import outside_deadline, remaining
+from app.core.metrics import track_cache
+from app.repositories import idempotency_repo
+from app.repositories.idempotency import DONE
+from app.utils.serialization import FastJSONResponse, dumps
+
+logger = logging.getLogger("idempotency")
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+WAIT_RESERVE = 0.5  # seconds of the request budget kept for answering 409 instead of timing out (504)
+
+# counters since process start (GET /idempotency/stats)
+stats: Dict[str, int] = {
+    "requests": 0,         # requests that carried a key
+    "executed": 0,         # ... and ran
+    "replayed": 0,         # ... and got a stored response (directly or after waiting)
+    "waited": 0,           # ... and arrived while the first request was still running
+    "conflicts": 0,        # key reused for a different request body
+    "llm_calls_saved": 0,  # LLM calls not repeated thanks to replays
+}
+
+# a replayed response is a hit on the stored-response cache
+track_cache("idempotent_responses", lambda: (stats["replayed"], stats["executed"]))
+
+# key -> event set when this worker finishes the request (waiters in the same worker wake at once)
+_running: Dict[str, asyncio.Event] = {}
+
+
+def fingerprint(*parts: Any) -> str:
+    """Hash of what identifies the request (body, file bytes...): a reused key must match it."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def _replay(record: Dict, llm_calls: int) -> Response:
+    stats["replayed"] += 1
+    stats["llm_calls_saved"] += llm_calls
+    response = record["response"]
+    return Response(
+        bytes(response["body"]),
+        status_code=response["status_code"],
+        media_type=response["media_type"],
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+async def _execute(key_id: str, run: Callable[[], Awaitable[Any]]) -> Response:
+    stats["executed"] += 1
+    done = _running[key_id] = asyncio.Event()
+    try:
+        body = dumps(await run())
+        await idempotency_repo.complete(key_id, 200, body, FastJSONResponse.media_type)
+        return Response(body, media_type=FastJSONResponse.media_type)
+    except BaseException:
+        # failed, cancelled or past its deadline: free the key so the client's retry runs again
+        await outside_deadline(idempotency_repo.release(key_id))
+        raise
+    finally:
+        done.set()
+        _running.pop(key_id, None)
+
+
+async def _wait(key_id: str, delay: float):
+    event = _running.get(key_id)
+    if event is None:
+        await asyncio.sleep(delay)  # first request runs in another worker: poll
+        return
+    try:
+        await asyncio.wait_for(event.wait(), delay)
+    except asyncio.TimeoutError:
+        pass
+
+
+async def idempotent(
+    request: Request, scope: str, request_fingerprint: str,
+    run: Callable[[], Awaitable[Any]], llm_calls: int = 1,
+) -> Any:
+    """
+    Run `run()` once per (scope, Idempotency-Key) within IDEMPOTENCY_TTL.
+    Without the header this is just `await run()`. `llm_calls` is what a replay saves.
+    """
+    key = request.headers.get(HEADER)
+    if not key:
+        return await run()
+    if len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(status_code=400, detail=f"{HEADER} must be at most {MAX_KEY_LENGTH} characters")
+
+    stats["requests"] += 1
+    key_id = f"{scope}:{key}"
+    wait_limit = settings.IDEMPOTENCY_WAIT_TIMEOUT
+    budget = remaining()
+    if budget is not None:
+        wait_limit = min(wait_limit, budget - WAIT_RESERVE)
+    deadline = time.monotonic() + wait_limit
+    delay = 0.1
+    waited = False
+    while True:
+        claimed, record = await idempotency_repo.claim(
+            key_id, request_fingerprint, settings.IDEMPOTENCY_TTL, settings.IDEMPOTENCY_LOCK_TIMEOUT
+        )
+        if claimed:
+            return await _execute(key_id, run)
+        if record["fingerprint"] != request_fingerprint:
+            stats["conflicts"] += 1
+            raise HTTPException(status_code=422, detail=f"{HEADER} was already used for a different request")
+        if record["status"] == DONE:
+            if waited:
+                logger.info(f"Duplicate {scope} request served after waiting for the first one")
+            return _replay(record, llm_calls)
+        if await idempotency_repo.take_over(key_id, settings.IDEMPOTENCY_LOCK_TIMEOUT):
+            logger.warning(f"Taking over stale {scope} request for key {key}")
+            return await _execute(key_id, run)
+        left = deadline - time.monotonic()
+        if left <= 0:
+            raise HTTPException(status_code=409, detail=f"A request with this {HEADER} is still in progress")
+        if not waited:
+            stats["waited"] += 1
+            waited = True
+        await _wait(key_id, min(delay, left))
+        delay = min(delay * 2, 2.0)
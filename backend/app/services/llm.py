@@ -2,8 +2,11 @@ import google.generativeai as genai
 from app.core.config import settings
 from app.models.job_ai import JobAIRequest, JobAISuggestion
 from app.chains.job_prompt import job_prompt
-import logging, uuid, json, re, asyncio
-from tenacity import retry, wait_exponential, stop_after_attempt
+from app.core.deadline import DeadlineExceeded, check, remaining
+from app.core.executors import PoolSaturated, llm_pool
+from app.core.metrics import track_llm
+import logging, uuid, json, re
+from tenacity import retry, retry_if_exception_type, wait_exponential, stop_after_attempt
 
 logger = logging.getLogger(__name__)
 
@@ -12,6 +15,12 @@ class LLMServiceError(Exception):
     """Custom error for LLM failures."""
 
 
+def request_options() -> dict:
+    """Gemini transport timeout = what is left of the current request's deadline."""
+    timeout = remaining()
+    return {"timeout": timeout} if timeout is not None else {}
+
+
 class LLMService:
     def __init__(self):
         try:
@@ -30,17 +39,30 @@ class LLMService:
         except Exception:
             raise LLMServiceError("Gemini returned no usable content")
 
-    @retry(wait=wait_exponential(min=1, max=8), stop=stop_after_attempt(3))
-    async def generate_response(self, prompt: str) -> str:
-        """Generate plain text response with retries and async safe call."""
+    # only Gemini failures are retried: not deadlines, nor the cancellation of an abandoned request
+    @retry(
+        wait=wait_exponential(min=1, max=8), stop=stop_after_attempt(3),
+        retry=retry_if_exception_type(LLMServiceError),
+    )
+    async def generate_response(self, prompt: str, site: str = "generate_response") -> str:
+        """
+        Generate plain text response with retries, bounded by the request deadline.
+        `site` labels the call in the LLM metrics (e.g. "extract_scores").
+        """
         logger.debug(f"Gemini request prompt: {prompt[:200]}...")
 
         try:
-            response = await asyncio.to_thread(self.model.generate_content, prompt)
+            with track_llm(site) as call:
+                call["response"] = response = await llm_pool.run(
+                    self.model.generate_content, prompt, request_options=request_options()
+                )
             text = self._extract_text(response)
             logger.debug(f"Gemini response: {text[:200]}...")
             return text
+        except (DeadlineExceeded, PoolSaturated):
+            raise
         except Exception as e:
+            check()  # transport timeout at the deadline: report the deadline, don't retry
             logger.error(f"❌ Error in Gemini generate_response: {str(e)}")
             raise LLMServiceError("Failed to generate response")
 
@@ -52,9 +74,15 @@ class LLMService:
             chat = self.model.start_chat(history=[
                 {"role": h["role"], "parts": [h["text"]]} for h in history
             ])
-            response = await asyncio.to_thread(chat.send_message, user_input)
+            with track_llm("generate_chat") as call:
+                call["response"] = response = await llm_pool.run(
+                    chat.send_message, user_input, request_options=request_options()
+                )
             return self._extract_text(response)
+        except (DeadlineExceeded, PoolSaturated):
+            raise
         except Exception as e:
+            check()  # transport timeout at the deadline: report the deadline, don't retry
             logger.error(f"❌ Error in Gemini generate_chat: {str(e)}")
             raise LLMServiceError("Failed to generate chat response")
         
@@ -93,13 +121,18 @@ You are an interviewer. Start a professional interview with {candidate_name} for
 Return only the first interviewer question, not the entire interview.
 """
     try:
-        response = llm_service.model.generate_content(prompt)
+        with track_llm("run_interview") as call:
+            call["response"] = response = await llm_pool.run(
+                llm_service.model.generate_content, prompt, request_options=request_options()
+            )
 
         if not response or not response.candidates:
             raise ValueError("Empty response from Gemini")
 
         text = response.candidates[0].content.parts[0].text
         return text.strip()
+    except (DeadlineExceeded, PoolSaturated):
+        raise
     except Exception as e:
         logger.error(f"❌ Error in run_interview: {str(e)}")
         return "Failed to start interview."
@@ -123,7 +156,10 @@ async def generate_job_with_ai(request: JobAIRequest) -> JobAISuggestion:
     structured_prompt = job_prompt.format(title=request.title)
 
     try:
-        response = llm_service.model.generate_content(structured_prompt)
+        with track_llm("generate_job_with_ai") as call:
+            call["response"] = response = await llm_pool.run(
+                llm_service.model.generate_content, structured_prompt, request_options=request_options()
+            )
 
         if not response or not response.candidates:
             raise ValueError("Empty response from Gemini")
@@ -154,6 +190,8 @@ async def generate_job_with_ai(request: JobAIRequest) -> JobAISuggestion:
 
         return JobAISuggestion(**data)
 
+    except (DeadlineExceeded, PoolSaturated):
+        raise
     except Exception as e:
         logger.error(f"❌ Error in generate_job_with_ai: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -4,6 +4,8 @@ import json
 import logging
 import re
 from langchain_google_genai import ChatGoogleGenerativeAI
+from app.core.deadline import DeadlineExceeded, check, remaining
+from app.core.metrics import track_llm
 
 logging.basicConfig(
     filename="logs/app.log",
@@ -123,7 +125,13 @@ class ResumeParserService:
         """
 
         try:
-            response = self.llm.invoke(prompt)
+            # runs in a worker thread: the request deadline caps the Gemini call itself
+            check()
+            timeout = remaining()
+            with track_llm("parse_resume") as call:
+                call["response"] = response = self.llm.invoke(
+                    prompt, **({"timeout": timeout} if timeout is not None else {})
+                )
 
             if hasattr(response, "content"):
                 parsed_text = (
@@ -145,7 +153,10 @@ class ResumeParserService:
 
             return self._normalize(parsed)
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
+            check()  # a transport timeout at the deadline is not an unparseable resume
             logging.error(f"Parsing failed: {e}", exc_info=True)
             return {
                 "name": "",
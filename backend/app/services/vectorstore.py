@@ -1,31 +1,629 @@
 # services/vectorstore.py
 # Purpose: Manage FAISS / Pinecone vector storage for resumes, interview embeddings
+#
+# Layout of one named store (e.g. "resumes") under VECTORSTORE_PATH:
+#   <name>.current           generation number of the live snapshot
+#   <name>.<gen>.faiss       base index (flat | ivfpq | hnsw), immutable between snapshots,
+#                            optionally loaded with IO_FLAG_MMAP
+#   <name>.<gen>.meta.npz    label -> vector id map and "alive" bitmap of the base index
+#   <name>.<gen>.log         append log of adds/deletes since snapshot <gen> (replayed on load)
+#
+# Writes go to a small in-memory flat "delta" index + the append log (one fsync per batch).
+# Deletes/replacements only clear bits in the alive bitmap; searches skip dead labels through
+# a FAISS IDSelectorBitmap. A snapshot folds the delta into the base and starts a new log.
 
 import faiss
+import glob
+import hashlib
+import logging
 import os
+import struct
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from pymongo import UpdateOne
+
 from app.core.config import settings
+from app.core.db import vector_refs_collection
+
+logger = logging.getLogger("vectorstore")
+
+_OP_ADD = 1
+_OP_DELETE = 2
+_RECORD_HEADER = struct.Struct("<bq")
+
+
+def vector_id(ref_id: str) -> int:
+    """Stable int64 FAISS id for a Mongo id (63-bit hash, mapping kept in `vector_refs`)."""
+    digest = hashlib.blake2b(str(ref_id).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big") & 0x7FFF_FFFF_FFFF_FFFF
+
+
+def _bitmap(mask: np.ndarray) -> np.ndarray:
+    """bool mask -> little-endian packed bitmap as expected by faiss.IDSelectorBitmap."""
+    return np.packbits(mask, bitorder="little")
+
+
+def _index_type(index) -> str:
+    if isinstance(index, faiss.IndexIVF):
+        return "ivfpq"
+    if isinstance(index, faiss.IndexHNSW):
+        return "hnsw"
+    return "flat"
+
+
+class _Segment:
+    """A FAISS index with positional/explicit labels, label -> vid map and alive mask."""
+
+    def __init__(self, index, vids: np.ndarray, alive: np.ndarray):
+        self.index = index
+        self.vids = vids            # int64, indexed by label
+        self.alive = alive          # bool, indexed by label
+        self._order = None          # argsort of vids, built lazily for vid -> label lookups
+
+    @property
+    def live_count(self) -> int:
+        return int(self.alive.sum())
+
+    def labels_of(self, vids: np.ndarray) -> np.ndarray:
+        """All labels (alive or not) holding any of the given vids."""
+        if len(self.vids) == 0 or len(vids) == 0:
+            return np.zeros(0, dtype="int64")
+        if self._order is None or len(self._order) != len(self.vids):
+            self._order = np.argsort(self.vids, kind="stable")
+        sorted_vids = self.vids[self._order]
+        vids = np.unique(vids)
+        lo = np.searchsorted(sorted_vids, vids, side="left")
+        hi = np.searchsorted(sorted_vids, vids, side="right")
+        if not (hi > lo).any():
+            return np.zeros(0, dtype="int64")
+        return np.concatenate([self._order[a:b] for a, b in zip(lo, hi) if b > a])
+
+    def kill(self, vids: np.ndarray) -> int:
+        labels = self.labels_of(vids)
+        if len(labels) == 0:
+            return 0
+        killed = int(self.alive[labels].sum())
+        self.alive[labels] = False
+        return killed
+
+    def search(self, query: np.ndarray, k: int, allowed_vids: Optional[np.ndarray] = None):
+        n = len(self.vids)
+        if n == 0 or self.index.ntotal == 0:
+            return None
+        mask = self.alive
+        if allowed_vids is not None:
+            mask = np.zeros(n, dtype=bool)
+            labels = self.labels_of(allowed_vids)
+            mask[labels] = self.alive[labels]
+        if not mask.any():
+            return None
+        bitmap = _bitmap(mask)
+        sel = faiss.IDSelectorBitmap(n, faiss.swig_ptr(bitmap))
+        kind = _index_type(self.index)
+        if kind == "ivfpq":
+            params = faiss.SearchParametersIVF(sel=sel, nprobe=settings.VECTOR_IVF_NPROBE)
+        elif kind == "hnsw":
+            params = faiss.SearchParametersHNSW(sel=sel, efSearch=max(settings.VECTOR_HNSW_EF_SEARCH, k))
+        else:
+            params = faiss.SearchParameters(sel=sel)
+        return self.index.search(query, k, params=params)
+
 
 class VectorStore:
-    def __init__(self):
-        self.index_file = os.path.join(settings.VECTORSTORE_PATH, "hr_index.faiss")
-        self.index = None
+    """
+    Named vector index (e.g. "resumes", "jobs") keyed by Mongo ids.
+    FAISS ids are derived from Mongo ids; `vector_refs` maps them back.
+    The base index type is VECTOR_INDEX_TYPE (flat | ivfpq | hnsw); ivfpq is
+    trained on a sample once VECTOR_TRAIN_MIN vectors exist, flat until then.
+    """
+
+    def __init__(self, name: str = "hr_index", dim: Optional[int] = None):
+        self.name = name
+        self.dim = dim or settings.VECTOR_DIM
+        self.path = settings.VECTORSTORE_PATH
+        self.index_type = settings.VECTOR_INDEX_TYPE.lower()
+        if self.index_type not in ("flat", "ivfpq", "hnsw"):
+            raise ValueError(f"Unknown VECTOR_INDEX_TYPE '{self.index_type}' (flat | ivfpq | hnsw)")
+
+        self._lock = threading.RLock()
+        self._snapshot_lock = threading.Lock()
+        self.generation = 0
+        self.base: _Segment = self._empty_segment()
+        self.frozen: Optional[_Segment] = None       # delta being folded into the base by a snapshot
+        self.delta: _Segment = self._empty_segment()
+        self._delta_labels: Dict[int, int] = {}
+        self._pending_dead: List[np.ndarray] = []    # deletes that arrive while a snapshot runs
+        self._log = None
+        self._log_gen = 0
+        self._log_records = 0
+        self._last_snapshot = time.time()
+
+        os.makedirs(self.path, exist_ok=True)
         self._load_or_create_index()
 
+    # ------------------------------
+    # Files
+    # ------------------------------
+    def _file(self, gen: int, suffix: str) -> str:
+        return os.path.join(self.path, f"{self.name}.{gen}.{suffix}")
+
+    @property
+    def _current_file(self) -> str:
+        return os.path.join(self.path, f"{self.name}.current")
+
+    @property
+    def index_file(self) -> str:
+        return self._file(self.generation, "faiss")
+
+    def _empty_segment(self) -> _Segment:
+        return _Segment(faiss.IndexFlatL2(self.dim), np.zeros(0, dtype="int64"), np.zeros(0, dtype=bool))
+
     def _load_or_create_index(self):
-        if os.path.exists(self.index_file):
-            self.index = faiss.read_index(self.index_file)
+        if os.path.exists(self._current_file):
+            with open(self._current_file) as f:
+                self.generation = int(f.read().strip())
+            self.base = self._read_segment(self.generation, mmap=settings.VECTOR_MMAP)
         else:
-            self.index = faiss.IndexFlatL2(settings.VECTOR_DIM)
+            self._import_legacy_index()
 
-    def save_index(self):
-        faiss.write_index(self.index, self.index_file)
+        # Replay every log at or after the live generation (a crash mid-snapshot leaves two)
+        replayed = 0
+        log_gen = self.generation
+        for gen in self._log_generations():
+            if gen >= self.generation:
+                replayed += self._replay_log(self._file(gen, "log"))
+                log_gen = gen
+        self._open_log(log_gen)
+        self._log_records = replayed
+        logger.info(
+            f"VectorStore '{self.name}' loaded: type={_index_type(self.base.index)} "
+            f"base={self.base.live_count} delta={self.delta.live_count} gen={self.generation}"
+        )
+
+    def _import_legacy_index(self):
+        """Convert the single-file IndexIDMap2 layout (<name>.faiss) into a generation-0 snapshot."""
+        legacy = os.path.join(self.path, f"{self.name}.faiss")
+        if not os.path.exists(legacy):
+            return
+        index = faiss.read_index(legacy)
+        if index.ntotal:
+            inner = faiss.downcast_index(index.index)
+            vectors = inner.reconstruct_n(0, index.ntotal)
+            vids = faiss.vector_to_array(index.id_map).astype("int64")
+            self.base = _Segment(faiss.IndexFlatL2(self.dim), vids, np.ones(len(vids), dtype=bool))
+            self.base.index.add(vectors)
+        self._write_snapshot(0, self.base)
+        logger.info(f"Imported legacy index {legacy} ({index.ntotal} vectors)")
+
+    def _read_segment(self, gen: int, mmap: bool = False) -> _Segment:
+        flags = 0
+        if mmap:
+            flags = faiss.IO_FLAG_MMAP
+            meta_type = str(np.load(self._file(gen, "meta.npz"))["index_type"])
+            if meta_type != "ivfpq":
+                flags |= getattr(faiss, "IO_FLAG_MMAP_IFC", 0)
+        index = faiss.read_index(self._file(gen, "faiss"), flags)
+        if index.d != self.dim:
+            raise ValueError(f"Index {self.name} gen {gen} has dim={index.d}, expected VECTOR_DIM={self.dim}")
+        meta = np.load(self._file(gen, "meta.npz"))
+        vids = meta["vids"].astype("int64")
+        alive = np.unpackbits(meta["alive"], count=len(vids), bitorder="little").astype(bool)
+        return _Segment(index, vids, alive)
+
+    def _write_snapshot(self, gen: int, segment: _Segment):
+        faiss.write_index(segment.index, self._file(gen, "faiss.tmp"))
+        with open(self._file(gen, "meta.tmp"), "wb") as f:
+            np.savez(
+                f,
+                vids=segment.vids,
+                alive=_bitmap(segment.alive),
+                index_type=np.array(_index_type(segment.index)),
+            )
+        os.replace(self._file(gen, "faiss.tmp"), self._file(gen, "faiss"))
+        os.replace(self._file(gen, "meta.tmp"), self._file(gen, "meta.npz"))
+        tmp_current = f"{self._current_file}.tmp"
+        with open(tmp_current, "w") as f:
+            f.write(str(gen))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_current, self._current_file)
+
+    def _log_generations(self) -> List[int]:
+        gens = []
+        for path in glob.glob(os.path.join(self.path, f"{self.name}.*.log")):
+            try:
+                gens.append(int(os.path.basename(path).split(".")[-2]))
+            except ValueError:
+                continue
+        return sorted(gens)
+
+    def _open_log(self, gen: int):
+        if self._log:
+            self._log.close()
+        self._log = open(self._file(gen, "log"), "ab")
+        self._log_gen = gen
+
+    def _replay_log(self, path: str) -> int:
+        record_size = _RECORD_HEADER.size + self.dim * 4
+        count = 0
+        with open(path, "rb") as f:
+            while True:
+                header = f.read(_RECORD_HEADER.size)
+                if len(header) < _RECORD_HEADER.size:
+                    break
+                op, vid = _RECORD_HEADER.unpack(header)
+                if op == _OP_ADD:
+                    payload = f.read(record_size - _RECORD_HEADER.size)
+                    if len(payload) < self.dim * 4:
+                        break  # torn tail from a crash mid-write
+                    vector = np.frombuffer(payload, dtype="float32").reshape(1, self.dim)
+                    self._apply_add(vector, np.array([vid], dtype="int64"))
+                elif op == _OP_DELETE:
+                    self._apply_delete(np.array([vid], dtype="int64"))
+                else:
+                    break
+                count += 1
+        return count
+
+    def _append_log(self, records: bytes, count: int):
+        self._log.write(records)
+        self._log.flush()
+        if settings.VECTOR_LOG_FSYNC:
+            os.fsync(self._log.fileno())
+        self._log_records += count
+
+    # ------------------------------
+    # Mutations (callers hold self._lock)
+    # ------------------------------
+    def _apply_delete(self, vids: np.ndarray) -> int:
+        removed = self.base.kill(vids)
+        if self.frozen is not None:
+            removed += self.frozen.kill(vids)
+            self._pending_dead.append(vids)
+        for vid in vids.tolist():
+            label = self._delta_labels.pop(vid, None)
+            if label is not None and self.delta.alive[label]:
+                self.delta.alive[label] = False
+                removed += 1
+        return removed
+
+    def _apply_add(self, vectors: np.ndarray, vids: np.ndarray):
+        self._apply_delete(vids)  # upsert: older copies anywhere are superseded
+        start = self.delta.index.ntotal
+        self.delta.index.add(vectors)
+        self.delta.vids = np.concatenate([self.delta.vids, vids])
+        self.delta.alive = np.concatenate([self.delta.alive, np.ones(len(vids), dtype=bool)])
+        for offset, vid in enumerate(vids.tolist()):
+            self._delta_labels[vid] = start + offset
+
+    @property
+    def size(self) -> int:
+        with self._lock:
+            total = self.base.live_count + self.delta.live_count
+            if self.frozen is not None:
+                total += self.frozen.live_count
+            return total
 
     def add_vectors(self, vectors, ids):
-        self.index.add_with_ids(vectors, ids)
+        """Insert or replace vectors for the given int64 ids (logged, persisted by snapshots)."""
+        vectors = np.ascontiguousarray(vectors, dtype="float32").reshape(-1, self.dim)
+        ids = np.asarray(ids, dtype="int64")
+        records = b"".join(
+            _RECORD_HEADER.pack(_OP_ADD, int(vid)) + vec.tobytes() for vid, vec in zip(ids, vectors)
+        )
+        with self._lock:
+            self._append_log(records, len(ids))
+            self._apply_add(vectors, ids)
+        self.maybe_snapshot()
+
+    def remove_vectors(self, ids) -> int:
+        ids = np.asarray(ids, dtype="int64")
+        records = b"".join(_RECORD_HEADER.pack(_OP_DELETE, int(vid)) for vid in ids)
+        with self._lock:
+            self._append_log(records, len(ids))
+            removed = self._apply_delete(ids)
+        self.maybe_snapshot()
+        return removed
+
+    # ------------------------------
+    # Search
+    # ------------------------------
+    def search(self, query_vector, top_k=5, allowed_ids: Optional[Iterable[int]] = None):
+        """
+        Return (distances, ids) arrays of shape (nq, top_k), ids = -1 when fewer hits exist.
+        `allowed_ids` restricts the search to those vector ids (applied inside FAISS).
+        """
+        query_vector = np.ascontiguousarray(query_vector, dtype="float32").reshape(-1, self.dim)
+        allowed = None if allowed_ids is None else np.fromiter(allowed_ids, dtype="int64")
+        nq = query_vector.shape[0]
+
+        with self._lock:
+            segments = [s for s in (self.base, self.frozen, self.delta) if s is not None]
+            results = []
+            for segment in segments:
+                found = segment.search(query_vector, top_k, allowed)
+                if found is not None:
+                    distances, labels = found
+                    vids = np.where(labels >= 0, segment.vids[np.clip(labels, 0, None)], -1)
+                    results.append((distances, vids))
+
+        out_d = np.full((nq, top_k), np.inf, dtype="float32")
+        out_i = np.full((nq, top_k), -1, dtype="int64")
+        if not results:
+            return out_d, out_i
+        all_d = np.concatenate([d for d, _ in results], axis=1)
+        all_i = np.concatenate([i for _, i in results], axis=1)
+        all_d[all_i < 0] = np.inf
+        order = np.argsort(all_d, axis=1)[:, :top_k]
+        take = order.shape[1]
+        out_d[:, :take] = np.take_along_axis(all_d, order, axis=1)
+        out_i[:, :take] = np.take_along_axis(all_i, order, axis=1)
+        out_i[~np.isfinite(out_d)] = -1
+        return out_d, out_i
+
+    # ------------------------------
+    # Snapshots
+    # ------------------------------
+    def maybe_snapshot(self, force: bool = False) -> bool:
+        """Snapshot when the log holds VECTOR_SNAPSHOT_EVERY records, or the interval elapsed (or force)."""
+        due = self._log_records >= settings.VECTOR_SNAPSHOT_EVERY or (
+            self._log_records and time.time() - self._last_snapshot >= settings.VECTOR_SNAPSHOT_INTERVAL
+        )
+        if not (force or due):
+            return False
+        if not self._snapshot_lock.acquire(blocking=False):
+            return False  # one already running
+        try:
+            self._snapshot()
+            return True
+        finally:
+            self._snapshot_lock.release()
+
+    def save_index(self):
+        """Force a snapshot (e.g. on shutdown)."""
+        with self._snapshot_lock:
+            self._snapshot()
+
+    def _snapshot(self):
+        started = time.time()
+        with self._lock:
+            if self._log_records == 0 and os.path.exists(self._current_file):
+                self._last_snapshot = time.time()
+                return
+            # Freeze the delta; new writes go to a fresh delta and the next generation's log
+            new_gen = self._log_gen + 1
+            self.frozen = self.delta
+            self.delta = self._empty_segment()
+            self._delta_labels = {}
+            self._pending_dead = []
+            self._open_log(new_gen)
+            self._log_records = 0
+            base_gen = self.generation
+            base_mmapped = settings.VECTOR_MMAP and os.path.exists(self._file(base_gen, "faiss"))
+            base_alive = self.base.alive.copy()
+            frozen = self.frozen
+
+        # Build the next base outside the lock (searches keep using base + frozen + delta)
+        if base_mmapped:
+            work = self._read_segment(base_gen, mmap=False)
+            work.alive = base_alive
+        else:
+            work = _Segment(faiss.clone_index(self.base.index), self.base.vids.copy(), base_alive)
+        new_base = self._merge(work, frozen)
+        self._write_snapshot(new_gen, new_base)
+
+        with self._lock:
+            for vids in self._pending_dead:
+                new_base.kill(vids)
+            self._pending_dead = []
+            if settings.VECTOR_MMAP:
+                mapped = self._read_segment(new_gen, mmap=True)
+                mapped.alive = new_base.alive
+                new_base = mapped
+            self.base = new_base
+            self.frozen = None
+            self.generation = new_gen
+            self._last_snapshot = time.time()
+
+        for gen in range(base_gen, new_gen):
+            for suffix in ("faiss", "meta.npz", "log"):
+                try:
+                    os.remove(self._file(gen, suffix))
+                except FileNotFoundError:
+                    pass
+        logger.info(
+            f"VectorStore '{self.name}' snapshot gen={new_gen} type={_index_type(new_base.index)} "
+            f"live={new_base.live_count} in {time.time() - started:.2f}s"
+        )
+
+    def _merge(self, base: _Segment, delta: _Segment) -> _Segment:
+        """Fold delta's live vectors into base; retrain/rebuild when the configured type requires it."""
+        live = np.flatnonzero(delta.alive)
+        new_vectors = delta.index.reconstruct_n(0, delta.index.ntotal)[live] if len(live) else None
+        new_vids = delta.vids[live]
+
+        current = _index_type(base.index)
+        total_live = base.live_count + len(live)
+        dead_ratio = 1.0 - (base.live_count / len(base.vids)) if len(base.vids) else 0.0
+        promote = current != self.index_type and (
+            self.index_type == "hnsw"
+            or (self.index_type == "ivfpq" and total_live >= settings.VECTOR_TRAIN_MIN)
+            or (self.index_type == "flat" and current == "hnsw")
+        )
+        rebuild = current != "ivfpq" and dead_ratio > settings.VECTOR_REBUILD_DEAD_RATIO
+
+        if current == "ivfpq" and promote:
+            logger.warning(
+                f"VectorStore '{self.name}': cannot convert a trained ivfpq index without the source "
+                f"vectors; re-run the backfill into an empty VECTORSTORE_PATH to change VECTOR_INDEX_TYPE"
+            )
+            promote = False
+
+        if promote or rebuild:
+            keep = np.flatnonzero(base.alive)
+            old_vectors = base.index.reconstruct_n(0, base.index.ntotal)[keep] if len(keep) else \
+                np.zeros((0, self.dim), dtype="float32")
+            vectors = old_vectors if new_vectors is None else np.vstack([old_vectors, new_vectors])
+            vids = np.concatenate([base.vids[keep], new_vids])
+            index = self._build_index(vectors, self.index_type if promote else current)
+            return _Segment(index, vids, np.ones(len(vids), dtype=bool))
+
+        if new_vectors is None:
+            return base
+
+        start = len(base.vids)
+        if current == "ivfpq":
+            dead = np.flatnonzero(~base.alive)
+            if len(dead):
+                base.index.remove_ids(dead.astype("int64"))  # IVF keeps explicit labels
+            base.index.add_with_ids(new_vectors, np.arange(start, start + len(live), dtype="int64"))
+        else:
+            base.index.add(new_vectors)
+        base.vids = np.concatenate([base.vids, new_vids])
+        base.alive = np.concatenate([base.alive, np.ones(len(live), dtype=bool)])
+        base._order = None
+        return base
+
+    def _build_index(self, vectors: np.ndarray, kind: str):
+        n = len(vectors)
+        if kind == "ivfpq" and n >= settings.VECTOR_TRAIN_MIN:
+            nlist = max(1, min(settings.VECTOR_IVF_NLIST, int(4 * np.sqrt(n)), n // 39))
+            m = settings.VECTOR_PQ_M
+            while self.dim % m:
+                m -= 1
+            index = faiss.index_factory(self.dim, f"IVF{nlist},PQ{m}")
+            rng = np.random.default_rng(0)
+            sample = vectors[rng.choice(n, size=min(n, settings.VECTOR_TRAIN_SAMPLE), replace=False)]
+            index.train(sample)
+            index.add_with_ids(vectors, np.arange(n, dtype="int64"))
+            return index
+        if kind == "hnsw":
+            index = faiss.index_factory(self.dim, f"HNSW{settings.VECTOR_HNSW_M},Flat")
+            index.hnsw.efConstruction = settings.VECTOR_HNSW_EF_CONSTRUCTION
+        else:
+            index = faiss.IndexFlatL2(self.dim)
+        if n:
+            index.add(vectors)
+        return index
+
+    def close(self):
         self.save_index()
+        with self._lock:
+            if self._log:
+                self._log.close()
+                self._log = None
+
+    # ------------------------------
+    # Mongo id <-> vector id helpers
+    # ------------------------------
+    def upsert(
+        self,
+        ref_ids: List[str],
+        vectors,
+        text_hashes: Optional[List[str]] = None,
+        metadata: Optional[List[Dict]] = None,
+    ):
+        """Add/replace vectors keyed by Mongo ids and record the id mapping (+ filter metadata)."""
+        if not ref_ids:
+            return
+        vids = [vector_id(r) for r in ref_ids]
+        self.add_vectors(vectors, vids)
+
+        now = datetime.utcnow()
+        ops = []
+        for i, (ref_id, vid) in enumerate(zip(ref_ids, vids)):
+            doc = {"index": self.name, "vid": vid, "ref_id": str(ref_id), "updated_at": now}
+            if text_hashes:
+                doc["text_hash"] = text_hashes[i]
+            if metadata:
+                doc.update(metadata[i])
+            ops.append(UpdateOne({"index": self.name, "vid": vid}, {"$set": doc}, upsert=True))
+        vector_refs_collection.bulk_write(ops, ordered=False)
+
+    def update_metadata(self, ref_ids: List[str], metadata: List[Dict]):
+        """Refresh filter metadata of already indexed documents (no vector change)."""
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne({"index": self.name, "vid": vector_id(r)}, {"$set": {**meta, "updated_at": now}})
+            for r, meta in zip(ref_ids, metadata)
+        ]
+        if ops:
+            vector_refs_collection.bulk_write(ops, ordered=False)
+
+    def delete(self, ref_ids: List[str]):
+        if not ref_ids:
+            return
+        vids = [vector_id(r) for r in ref_ids]
+        self.remove_vectors(vids)
+        vector_refs_collection.delete_many({"index": self.name, "vid": {"$in": vids}})
+
+    def indexed_hashes(self, ref_ids: List[str]) -> Dict[str, str]:
+        """ref_id -> text_hash currently indexed, to skip re-embedding unchanged documents."""
+        vids = [vector_id(r) for r in ref_ids]
+        cursor = vector_refs_collection.find(
+            {"index": self.name, "vid": {"$in": vids}}, {"ref_id": 1, "text_hash": 1}
+        )
+        return {d["ref_id"]: d.get("text_hash") for d in cursor}
+
+    def _hits(self, query_vector, top_k: int, allowed_ids=None) -> List[Tuple[int, float]]:
+        distances, indices = self.search(query_vector, top_k, allowed_ids)
+        return [(int(i), float(d)) for i, d in zip(indices[0], distances[0]) if i != -1]
+
+    def _resolve(self, hits: List[Tuple[int, float]], refs: Dict[int, str]) -> List[Tuple[str, float]]:
+        # vectors are L2-normalized, so squared L2 distance d maps to cosine 1 - d/2
+        return [(refs[vid], 1.0 - dist / 2.0) for vid, dist in hits if vid in refs]
+
+    def search_refs(
+        self, query_vector, top_k: int = 10, filters: Optional[Dict] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Search and resolve hits to (Mongo id, cosine similarity) pairs, best first.
+
+        With `filters` (Mongo filter over the metadata stored in `vector_refs`):
+        - selective filters (<= VECTOR_PREFILTER_MAX matches): matching vector ids are
+          fetched from the (index, field, vid) indexes and passed to FAISS as an
+          IDSelector, so the ANN search only visits allowed vectors;
+        - broad filters: the ANN search over-fetches and hits are checked against the
+          filter in one `$in` query per round, widening k until top_k pass.
+        """
+        if not filters:
+            hits = self._hits(query_vector, top_k)
+            if not hits:
+                return []
+            refs = {
+                d["vid"]: d["ref_id"]
+                for d in vector_refs_collection.find(
+                    {"index": self.name, "vid": {"$in": [vid for vid, _ in hits]}}, {"vid": 1, "ref_id": 1}
+                )
+            }
+            return self._resolve(hits, refs)
 
-    def search(self, query_vector, top_k=5):
-        distances, indices = self.index.search(query_vector, top_k)
-        return distances, indices
+        query = {**filters, "index": self.name}
+        matches = vector_refs_collection.count_documents(query, limit=settings.VECTOR_PREFILTER_MAX + 1)
+        if matches == 0:
+            return []
 
+        if matches <= settings.VECTOR_PREFILTER_MAX:
+            refs = {
+                d["vid"]: d["ref_id"]
+                for d in vector_refs_collection.find(query, {"vid": 1, "ref_id": 1, "_id": 0})
+            }
+            return self._resolve(self._hits(query_vector, top_k, refs.keys()), refs)
 
+        k = top_k * 4
+        while True:
+            hits = self._hits(query_vector, k)
+            refs = {
+                d["vid"]: d["ref_id"]
+                for d in vector_refs_collection.find(
+                    {**query, "vid": {"$in": [vid for vid, _ in hits]}}, {"vid": 1, "ref_id": 1, "_id": 0}
+                )
+            }
+            results = self._resolve(hits, refs)
+            if len(results) >= top_k or len(hits) < k:
+                return results[:top_k]
+            k *= 4
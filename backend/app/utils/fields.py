@@ -0,0 +1,40 @@
+# app/utils/fields.py
+# Sparse fieldsets for list endpoints: `?fields=name,email,skills` or `?fields=summary`.
+from typing import Any, Collection, Dict, List, Optional, Sequence
+
+SUMMARY = "summary"
+
+
+def parse_fields(raw: Optional[str], allowed: Collection[str], summary: Sequence[str]) -> Optional[List[str]]:
+    """
+    `fields` parameter -> list of top-level field names (None = whole document).
+    "summary" expands to the slim preset. Raises ValueError on unknown fields.
+    """
+    if raw is None or not raw.strip():
+        return None
+    fields: List[str] = []
+    for name in (f.strip() for f in raw.split(",")):
+        if not name:
+            continue
+        if name == SUMMARY:
+            fields.extend(summary)
+        elif name in allowed:
+            fields.append(name)
+        else:
+            raise ValueError(f"Unknown field '{name}'")
+    if "id" not in fields:
+        fields.insert(0, "id")
+    return list(dict.fromkeys(fields))
+
+
+def projection(fields: Optional[Sequence[str]]) -> Optional[Dict[str, int]]:
+    """Mongo projection for a field list (`id` is the always-returned `_id`)."""
+    if fields is None:
+        return None
+    return {f: 1 for f in fields if f != "id"} or {"_id": 1}
+
+
+def pick(doc: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Requested fields of a normalized document (missing fields are returned as null)."""
+    return {f: doc.get(f) for f in fields}
+
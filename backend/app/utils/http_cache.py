@@ -0,0 +1,64 @@
+# app/utils/http_cache.py
+# Conditional GETs: weak ETags, If-None-Match -> 304, Cache-Control per route.
+import hashlib
+from typing import Any, Optional
+
+from fastapi import Request, Response
+
+from app.utils.serialization import FastJSONResponse, dumps
+
+# Cache-Control policies
+REVALIDATE = "private, no-cache"                     # browser keeps a copy, revalidates with the ETag every time
+IMMUTABLE = "private, max-age=31536000, immutable"   # content never changes under this URL (GridFS files)
+NO_STORE = "no-store"
+
+
+def weak_etag(*parts: Any) -> str:
+    """Weak validator from version fields (e.g. id + updated_at) or raw content."""
+    digest = hashlib.blake2b(digest_size=12)
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else str(part).encode("utf-8"))
+        digest.update(b"\x00")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check with weak comparison (RFC 9110 13.1.2)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in header.split(","))
+
+
+def not_modified(etag: str, cache_control: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": cache_control})
+
+
+def conditional_json(
+    request: Request,
+    content: Any = None,
+    *,
+    body: Optional[bytes] = None,
+    etag: Optional[str] = None,
+    cache_control: str = REVALIDATE,
+) -> Response:
+    """
+    JSON response with validators. Pass `etag` when it is known before rendering
+    (a match then skips serialization); otherwise it is hashed from the body.
+    `body` is an already rendered payload (e.g. from a response cache).
+    """
+    if etag and etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    if body is None:
+        body = dumps(content)
+    etag = etag or weak_etag(body)
+    if etag_matches(request, etag):
+        return not_modified(etag, cache_control)
+    return Response(
+        body,
+        media_type=FastJSONResponse.media_type,
+        headers={"ETag": etag, "Cache-Control": cache_control},
+    )
@@ -0,0 +1,54 @@
+# app/utils/pagination.py
+import base64
+from typing import Any, Dict, Optional, Tuple
+
+from bson import json_util
+from bson.errors import InvalidId
+
+
+class InvalidCursor(ValueError):
+    """Raised when an `after` token is malformed or belongs to another sort order."""
+
+
+def encode_cursor(sort_field: str, value: Any, last_id: Any) -> str:
+    """Opaque keyset token: the sort key and `_id` of the last row of a page."""
+    raw = json_util.dumps({"f": sort_field, "v": None if sort_field == "_id" else value, "id": last_id})
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, sort_field: str) -> Tuple[Any, Any]:
+    """Token -> (sort value, last `_id`). Raises InvalidCursor."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        data = json_util.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, TypeError, InvalidId) as e:
+        raise InvalidCursor(f"Invalid cursor: {e}")
+    if not isinstance(data, dict) or data.get("f") != sort_field or "id" not in data:
+        raise InvalidCursor("Cursor does not match this listing's sort order")
+    return data.get("v"), data["id"]
+
+
+def keyset_query(sort_field: str, direction: int, after: Optional[Tuple[Any, Any]]) -> Dict:
+    """
+    Filter selecting the rows after a cursor for sort [(sort_field, direction), ("_id", direction)].
+    Sorting on `_id` alone needs a single range condition.
+    Null / missing keys sort first ascending and last descending, but `$gt` / `$lt`
+    never match them (comparisons are type-bracketed), so they get their own clause.
+    """
+    if after is None:
+        return {}
+    value, last_id = after
+    op = "$lt" if direction < 0 else "$gt"
+    if sort_field == "_id":
+        return {"_id": {op: last_id}}
+    if value is None:
+        same_key = {sort_field: None, "_id": {op: last_id}}
+        # descending: only the remaining null rows; ascending: those, then every non-null row
+        return same_key if direction < 0 else {"$or": [same_key, {sort_field: {"$ne": None}}]}
+    clauses = [
+        {sort_field: {op: value}},
+        {sort_field: value, "_id": {op: last_id}},
+    ]
+    if direction < 0:
+        clauses.append({sort_field: None})
+    return {"$or": clauses}
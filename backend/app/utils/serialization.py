@@ -0,0 +1,84 @@
+# app/utils/serialization.py
+# Fast JSON path for read endpoints: orjson rendering, and response rows built
+# from trusted Mongo documents without re-validating them through pydantic.
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple, Type
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if isinstance(value, bytes):
+        return None
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=ORJSON_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSONResponse rendered with orjson; also accepts ObjectId / pydantic models.
+    Returning one from a route skips FastAPI's jsonable_encoder / response_model
+    pass, so the content is serialized exactly once.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+# ------------------------------
+# Trusted rows
+# ------------------------------
+_MISSING = object()
+_REQUIRED = object()
+
+
+@lru_cache(maxsize=None)
+def _plan(model: Type[BaseModel]) -> Tuple[List[Tuple[str, Any, Callable]], bool]:
+    """(field name, default, default factory) per field, and whether extras go to `extra_data`."""
+    fields = [
+        (name, _REQUIRED if f.is_required() else _MISSING if f.default_factory else f.default, f.default_factory)
+        for name, f in model.model_fields.items()
+    ]
+    return fields, "extra_data" in model.model_fields
+
+
+def trusted_row(model: Type[BaseModel], doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Same dict as `model(**doc).model_dump()` for a document this app wrote,
+    without validation: fields are copied, missing ones get their defaults, and
+    unknown keys are dropped (or folded into `extra_data`, like CandidateBase does).
+    A legacy document lacking a required field is returned as is (validation would fail).
+    `doc` must already be normalized (`id` instead of `_id`).
+    """
+    fields, folds_extras = _plan(model)
+    row = {}
+    for name, default, factory in fields:
+        value = doc.get(name, _MISSING)
+        if value is _MISSING:
+            if default is _REQUIRED:
+                return dict(doc)
+            value = factory() if factory else default
+        row[name] = value
+    if folds_extras:
+        extras = {k: v for k, v in doc.items() if k not in row}
+        if extras:
+            row["extra_data"] = {**(row["extra_data"] or {}), **extras}
+    return row
+
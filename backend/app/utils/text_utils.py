@@ -0,0 +1,58 @@
+# app/utils/text_utils.py
+import html
+import re
+from typing import Iterable, Optional
+
+_BLOCK_BREAK_RE = re.compile(r"<\s*(br|/p|/div|/h[1-6]|/ul|/ol|/tr)\s*/?\s*>", re.IGNORECASE)
+_LIST_ITEM_RE = re.compile(r"<\s*li[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]+>")
+_SPACES_RE = re.compile(r"[ \t\r\f\v]+")
+
+
+def html_to_text(raw: Optional[str]) -> str:
+    """
+    Convert rich-text HTML (job descriptions, <ul><li> bullet lists) into
+    compact plain text: one line per paragraph / bullet, no markup.
+    """
+    if not raw:
+        return ""
+    text = _LIST_ITEM_RE.sub("\n- ", raw)
+    text = _BLOCK_BREAK_RE.sub("\n", text)
+    text = _TAG_RE.sub(" ", text)
+    text = html.unescape(text)
+
+    lines = []
+    for line in text.split("\n"):
+        line = _SPACES_RE.sub(" ", line).strip()
+        if line and line != "-":
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def _line_key(line: str) -> str:
+    return _SPACES_RE.sub(" ", line.strip().lstrip("-*• ").lower())
+
+
+def dedupe_lines(text: str, seen: Optional[Iterable[str]] = None) -> str:
+    """
+    Drop repeated lines (case/whitespace insensitive) from text.
+    Lines already present in `seen` are dropped as well.
+    """
+    known = {_line_key(s) for s in (seen or []) if s}
+    out = []
+    for line in (text or "").split("\n"):
+        key = _line_key(line)
+        if not key:
+            continue
+        if key in known:
+            continue
+        known.add(key)
+        out.append(line.strip())
+    return "\n".join(out)
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Cheap token estimate (~4 chars per token), good enough for prompt-size reporting."""
+    if not text:
+        return 0
+    return (len(text) + 3) // 4
@@ -0,0 +1,23 @@
+# tests/conftest.py
+# Settings the app requires at import time (see .env.example); the tests never reach
+# Mongo, Gemini or SMTP.
+import os
+
+for name, value in {
+    "MONGO_URI": "mongodb://localhost:27017",
+    "MONGO_DB_NAME": "smart_hr_bot_test",
+    "ENCRYPTION_KEY": "dGVzdC1lbmNyeXB0aW9uLWtleS0zMi1ieXRlcyEhISE=",
+    "JWT_SECRET_KEY": "test-secret",
+    "GEMINI_API_KEY": "test-key",
+    "ASTRA_DB_API_KEY": "test",
+    "GOOGLE_CLIENT_ID": "test",
+    "GOOGLE_CLIENT_SECRET": "test",
+    "KEKA_CLIENT_ID": "test",
+    "KEKA_CLIENT_SECRET": "test",
+    "MS_CLIENT_ID": "test",
+    "MS_CLIENT_SECRET": "test",
+    "SMTP_HOST": "localhost",
+    "SMTP_USER": "test",
+    "SMTP_PASSWORD": "test",
+}.items():
+    os.environ.setdefault(name, value)
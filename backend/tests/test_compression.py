@@ -0,0 +1,72 @@
+# tests/test_compression.py
+import gzip
+
+import pytest
+
+from app.core.compression import CompressionMiddleware, accepted_encodings
+
+
+def http_scope(accept_encoding="gzip"):
+    return {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+
+
+def respond(chunks, content_type=b"application/json", headers=(), status=200):
+    async def app(scope, receive, send):
+        length = sum(len(c) for c in chunks)
+        raw = [(b"content-type", content_type), (b"content-length", str(length).encode()), *headers]
+        await send({"type": "http.response.start", "status": status, "headers": raw})
+        for i, chunk in enumerate(chunks):
+            await send({"type": "http.response.body", "body": chunk, "more_body": i < len(chunks) - 1})
+    return app
+
+
+async def call(app, accept_encoding="gzip"):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    await CompressionMiddleware(app, minimum_size=100)(http_scope(accept_encoding), None, send)
+    headers = {k.decode(): v.decode() for k, v in sent[0]["headers"]}
+    return headers, b"".join(m.get("body", b"") for m in sent[1:])
+
+
+@pytest.mark.asyncio
+async def test_large_body_is_gzipped_with_its_length():
+    body = b'{"a": "' + b"x" * 1000 + b'"}'
+    headers, sent = await call(respond([body]))
+
+    assert headers["content-encoding"] == "gzip"
+    assert headers["vary"] == "Accept-Encoding"
+    assert headers["content-length"] == str(len(sent))
+    assert gzip.decompress(sent) == body
+
+
+@pytest.mark.asyncio
+async def test_stream_is_gzipped_chunk_by_chunk():
+    chunks = [b"line %d\n" % i for i in range(50)]
+    headers, sent = await call(respond(chunks))
+
+    assert headers["content-encoding"] == "gzip"
+    assert "content-length" not in headers
+    assert gzip.decompress(sent) == b"".join(chunks)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("app, accept_encoding", [
+    (respond([b"{}"]), "gzip"),                                                 # under minimum_size
+    (respond([b"x" * 1000], content_type=b"application/pdf"), "gzip"),          # excluded type
+    (respond([b"x" * 1000], content_type=b"video/mp4"), "gzip"),                # excluded family
+    (respond([b"x" * 1000], headers=[(b"content-encoding", b"br")]), "gzip"),    # already encoded
+    (respond([b"x" * 1000], status=206), "gzip"),                               # range response
+    (respond([b"x" * 1000]), "gzip;q=0, identity"),                             # gzip refused
+])
+async def test_body_is_sent_as_is(app, accept_encoding):
+    headers, sent = await call(app, accept_encoding)
+
+    assert headers.get("content-encoding") in (None, "br")
+    assert sent in (b"{}", b"x" * 1000)
+
+
+def test_accepted_encodings_drop_zero_q():
+    assert accepted_encodings("gzip;q=0, br;q=1.0, deflate") == {"br", "deflate"}
@@ -0,0 +1,146 @@
+# tests/test_deadline.py
+import asyncio
+import json
+import time
+
+import pytest
+
+from app.core.deadline import HEADER, Budget, DeadlineExceeded, DeadlineMiddleware, _budget, check, remaining
+
+
+def http_scope(headers=()):
+    return {"type": "http", "method": "GET", "path": "/work", "headers": list(headers)}
+
+
+class Client:
+    """ASGI server side of one request: feeds the body, optionally disconnects, records what is sent."""
+
+    def __init__(self, disconnect_after: float = None):
+        self.sent = []
+        self._disconnect_after = disconnect_after
+        self._delivered = False
+
+    async def receive(self):
+        if not self._delivered:
+            self._delivered = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        if self._disconnect_after is None:
+            await asyncio.Event().wait()  # client stays connected
+        await asyncio.sleep(self._disconnect_after)
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        self.sent.append(message)
+
+    @property
+    def status(self):
+        starts = [m for m in self.sent if m["type"] == "http.response.start"]
+        return starts[0]["status"] if starts else None
+
+
+async def ok(send, status=200):
+    await send({"type": "http.response.start", "status": status, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@pytest.mark.asyncio
+async def test_disconnect_cancels_handler_and_sends_nothing():
+    cancelled = asyncio.Event()
+
+    async def app(scope, receive, send):
+        await receive()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        await ok(send)
+
+    client = Client(disconnect_after=0.05)
+    await asyncio.wait_for(DeadlineMiddleware(app, default=5)(http_scope(), client.receive, client.send), 2)
+
+    assert cancelled.is_set()
+    assert client.sent == []
+
+
+@pytest.mark.asyncio
+async def test_deadline_cancels_handler_with_504():
+    cancelled = asyncio.Event()
+
+    async def app(scope, receive, send):
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    client = Client()
+    await asyncio.wait_for(DeadlineMiddleware(app, default=0.05)(http_scope(), client.receive, client.send), 2)
+
+    assert cancelled.is_set()
+    assert client.status == 504
+    assert json.loads(client.sent[-1]["body"]) == {"detail": "Request deadline exceeded"}
+
+
+@pytest.mark.asyncio
+async def test_client_timeout_header_is_capped_and_visible_to_the_handler():
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["remaining"] = remaining()
+        await ok(send)
+
+    client = Client()
+    middleware = DeadlineMiddleware(app, default=60, maximum=2)
+    await middleware(http_scope([(HEADER.lower().encode(), b"30")]), client.receive, client.send)
+
+    assert client.status == 200
+    assert 1 < seen["remaining"] <= 2
+
+
+@pytest.mark.asyncio
+async def test_error_sent_after_expiry_is_reported_as_504():
+    async def app(scope, receive, send):
+        try:
+            await asyncio.sleep(10)
+        except BaseException:  # a handler turning the cancellation into a generic error
+            await ok(send, status=500)
+
+    client = Client()
+    await asyncio.wait_for(DeadlineMiddleware(app, default=0.05)(http_scope(), client.receive, client.send), 2)
+
+    assert client.status == 504
+    assert [m["type"] for m in client.sent] == ["http.response.start", "http.response.body"]
+
+
+def test_check_raises_once_the_budget_is_spent_or_abandoned():
+    budget = Budget(0.05)
+    token = _budget.set(budget)
+    try:
+        check()
+        time.sleep(0.06)
+        with pytest.raises(DeadlineExceeded, match="deadline exceeded"):
+            check()
+        budget.expires_at += 60
+        budget.cancelled = True
+        with pytest.raises(DeadlineExceeded, match="client disconnected"):
+            check()
+    finally:
+        _budget.reset(token)
+    check()  # no request budget: never raises
+
+
+@pytest.mark.asyncio
+async def test_exempt_paths_have_no_budget():
+    seen = {}
+
+    async def app(scope, receive, send):
+        seen["remaining"] = remaining()
+        await ok(send)
+
+    client = Client()
+    scope = {**http_scope(), "path": "/api/bulk/export"}
+    await DeadlineMiddleware(app, default=0.05, exempt=["/api/bulk/"])(scope, client.receive, client.send)
+
+    assert client.status == 200
+    assert seen["remaining"] is None
@@ -0,0 +1,114 @@
+# tests/test_executors.py
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.core.executors import PoolSaturated, StagePool
+
+
+@pytest.fixture
+def pool():
+    pool = StagePool("test", workers=1, queue_limit=1)
+    yield pool
+    pool.shutdown()
+
+
+async def wait_until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_full_pool_rejects_with_503(pool):
+    release = threading.Event()
+    running = asyncio.create_task(pool.run(release.wait, 5))
+    await wait_until(lambda: pool.running == 1)
+    queued = asyncio.create_task(pool.run(lambda: "queued"))
+    await wait_until(lambda: pool.queued == 1)
+
+    with pytest.raises(PoolSaturated) as exc:
+        await pool.run(lambda: "rejected")
+    assert exc.value.status_code == 503
+    assert exc.value.headers["Retry-After"] == "1"
+    assert pool.stats()["rejected"] == 1
+
+    release.set()
+    assert await running is True
+    assert await queued == "queued"
+    assert pool.admitted == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_queued_call_never_runs_and_frees_its_slot(pool):
+    release = threading.Event()
+    ran = []
+    running = asyncio.create_task(pool.run(release.wait, 5))
+    await wait_until(lambda: pool.running == 1)
+    queued = asyncio.create_task(pool.run(ran.append, "queued"))
+    await wait_until(lambda: pool.queued == 1)
+
+    queued.cancel()  # e.g. the client disconnected
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert pool.dropped == 1
+    assert pool.admitted == 1  # only the running call holds a slot
+
+    # the freed slot admits a new call while the worker is still busy
+    follow_up = asyncio.create_task(pool.run(lambda: "follow-up"))
+    await wait_until(lambda: pool.queued == 1)
+
+    release.set()
+    await running
+    assert await follow_up == "follow-up"
+    assert ran == []
+    assert pool.admitted == 0
+    assert pool.stats()["completed"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_running_call_keeps_its_slot_until_it_returns(pool):
+    release = threading.Event()
+    running = asyncio.create_task(pool.run(release.wait, 5))
+    await wait_until(lambda: pool.running == 1)
+
+    running.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await running
+    assert pool.dropped == 0
+    assert pool.admitted == 1  # the thread cannot be stopped
+
+    release.set()
+    await wait_until(lambda: pool.admitted == 0)
+    assert pool.stats()["completed"] == 1
+
+
+def test_admission_is_atomic_across_threads(pool):
+    release = threading.Event()
+    start = threading.Barrier(8)
+    outcomes = []
+
+    def caller():
+        async def call():
+            start.wait()
+            try:
+                await pool.run(release.wait, 5)
+                outcomes.append("ran")
+            except PoolSaturated:
+                outcomes.append("rejected")
+        asyncio.run(call())
+
+    threads = [threading.Thread(target=caller) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    deadline = time.monotonic() + 2
+    while outcomes.count("rejected") < 6 and time.monotonic() < deadline:
+        time.sleep(0.005)
+    assert pool.admitted == 2  # workers + queue_limit, never more
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert sorted(outcomes) == ["ran", "ran"] + ["rejected"] * 6
@@ -0,0 +1,182 @@
+# tests/test_idempotency.py
+import asyncio
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core.deadline import Budget, _budget, check
+from app.repositories.idempotency import DONE, PENDING
+from app.services import idempotency
+from app.services.idempotency import HEADER, WAIT_RESERVE, idempotent
+
+
+class MemoryIdempotencyRepository:
+    """Same claim / take_over / complete / release contract as IdempotencyRepository, in memory."""
+
+    def __init__(self):
+        self.records = {}
+
+    async def claim(self, key_id, fingerprint, ttl, lease):
+        if key_id in self.records:
+            return False, dict(self.records[key_id])
+        self.records[key_id] = {
+            "fingerprint": fingerprint, "status": PENDING,
+            "locked_until": datetime.utcnow() + timedelta(seconds=lease),
+        }
+        return True, None
+
+    async def take_over(self, key_id, lease):
+        record = self.records.get(key_id)
+        if record and record["status"] == PENDING and record["locked_until"] < datetime.utcnow():
+            record["locked_until"] = datetime.utcnow() + timedelta(seconds=lease)
+            return True
+        return False
+
+    async def complete(self, key_id, status_code, body, media_type):
+        self.records[key_id].update(
+            status=DONE, response={"status_code": status_code, "body": body, "media_type": media_type}
+        )
+
+    async def release(self, key_id):
+        if self.records.get(key_id, {}).get("status") == PENDING:
+            del self.records[key_id]
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    repo = MemoryIdempotencyRepository()
+    monkeypatch.setattr(idempotency, "idempotency_repo", repo)
+    monkeypatch.setattr(idempotency, "stats", {k: 0 for k in idempotency.stats})
+    return repo
+
+
+def request_with_key(key="key-1"):
+    headers = [(HEADER.lower().encode(), key.encode())] if key else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers})
+
+
+def body(response):
+    return json.loads(response.body)
+
+
+@pytest.mark.asyncio
+async def test_without_key_runs_every_time(repo):
+    calls = []
+
+    async def run():
+        calls.append(1)
+        return {"n": len(calls)}
+
+    assert await idempotent(request_with_key(None), "score", "fp", run) == {"n": 1}
+    assert await idempotent(request_with_key(None), "score", "fp", run) == {"n": 2}
+    assert repo.records == {}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_duplicates_wait_and_replay(repo):
+    calls = []
+    release = asyncio.Event()
+
+    async def run():
+        calls.append(1)
+        await release.wait()
+        return {"score": 87}
+
+    first = asyncio.create_task(idempotent(request_with_key(), "score", "fp", run))
+    await asyncio.sleep(0)
+    duplicates = [asyncio.create_task(idempotent(request_with_key(), "score", "fp", run)) for _ in range(3)]
+    await asyncio.sleep(0.05)
+    assert not any(d.done() for d in duplicates)  # waiting for the first request
+
+    release.set()
+    responses = await asyncio.gather(first, *duplicates)
+
+    assert calls == [1]
+    assert all(body(r) == {"score": 87} for r in responses)
+    assert [r.headers.get("Idempotent-Replayed") for r in responses] == [None, "true", "true", "true"]
+    assert idempotency.stats["waited"] == 3
+    assert idempotency.stats["llm_calls_saved"] == 3
+
+
+@pytest.mark.asyncio
+async def test_failed_first_request_releases_the_key(repo):
+    async def fail():
+        raise RuntimeError("gemini down")
+
+    async def succeed():
+        return {"score": 50}
+
+    with pytest.raises(RuntimeError):
+        await idempotent(request_with_key(), "score", "fp", fail)
+    assert repo.records == {}
+
+    response = await idempotent(request_with_key(), "score", "fp", succeed)
+    assert body(response) == {"score": 50}
+    assert "Idempotent-Replayed" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_cancelled_first_request_releases_the_key(repo):
+    started = asyncio.Event()
+
+    async def slow():
+        started.set()
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(idempotent(request_with_key(), "score", "fp", slow))
+    await started.wait()
+    task.cancel()  # client disconnected / deadline
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert repo.records == {}
+
+
+@pytest.mark.asyncio
+async def test_stale_claim_is_taken_over(repo):
+    await repo.claim("score:key-1", "fp", ttl=60, lease=60)
+    repo.records["score:key-1"]["locked_until"] = datetime.utcnow() - timedelta(seconds=1)  # worker crashed
+
+    async def run():
+        return {"score": 70}
+
+    response = await idempotent(request_with_key(), "score", "fp", run)
+    assert body(response) == {"score": 70}
+    assert repo.records["score:key-1"]["status"] == DONE
+
+
+@pytest.mark.asyncio
+async def test_reused_key_with_different_body_is_rejected(repo):
+    async def run():
+        return {"score": 1}
+
+    await idempotent(request_with_key(), "score", "fp-a", run)
+    with pytest.raises(HTTPException) as exc:
+        await idempotent(request_with_key(), "score", "fp-b", run)
+    assert exc.value.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_waiting_duplicate_gets_409_before_the_request_deadline(repo):
+    release = asyncio.Event()
+
+    async def run():
+        await release.wait()
+        return {"score": 1}
+
+    first = asyncio.create_task(idempotent(request_with_key(), "score", "fp", run))
+    await asyncio.sleep(0)
+
+    token = _budget.set(Budget(WAIT_RESERVE + 0.2))
+    try:
+        with pytest.raises(HTTPException) as exc:
+            await idempotent(request_with_key(), "score", "fp", run)
+        assert exc.value.status_code == 409
+        check()  # answered with time to spare: no 504
+    finally:
+        _budget.reset(token)
+
+    release.set()
+    await first
@@ -0,0 +1,399 @@
+# scripts/backup_db.py
+# Parallel, compressed, resumable MongoDB backup / restore (GridFS included: fs.files + fs.chunks).
+#
+#   cd backend
+#   python ../scripts/backup_db.py backup  --out ../backups/full-2025-01-01 [--resume]
+#   python ../scripts/backup_db.py backup  --out ../backups/incr-2025-01-02 --since ../backups/full-2025-01-01
+#   python ../scripts/backup_db.py verify  ../backups/incr-2025-01-02
+#   python ../scripts/backup_db.py restore ../backups/full-2025-01-01 ../backups/incr-2025-01-02 [--drop]
+#
+# Layout of a backup directory:
+#   <collection>.bson.gz | <collection>.ndjson.gz   one gzip stream per collection
+#   manifest.json                                    counts, sha256 checksums, watermarks, indexes
+#
+# Collections are dumped / restored in parallel (one worker per collection, largest first).
+# The manifest is rewritten as each collection finishes, so an interrupted backup can be
+# continued with --resume: collections whose file still matches its checksum are kept.
+# Incremental backups (--since) only contain documents whose `_id` or `updated_at` is past the
+# previous backup's watermark (both indexed); restoring them upserts by `_id`. Every update made
+# through app/repositories (BaseRepository helpers, score upserts) stamps `updated_at`, and the app
+# soft-deletes, so deletes of candidates / jobs / scores arrive as updates of `deleted` /
+# `is_deleted`. Collections written elsewhere (candidate_cards, vector_refs, idempotency_keys)
+# only contribute new documents: after restoring an incremental, run
+# `python -m app.services.candidate_cards rebuild` and `python -m app.services.embedding_pipeline`.
+
+import argparse
+import gzip
+import hashlib
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import bson
+from bson import json_util
+from bson.codec_options import CodecOptions
+from bson.json_util import CANONICAL_JSON_OPTIONS
+from bson.raw_bson import RawBSONDocument
+from pymongo import InsertOne, MongoClient, ReplaceOne
+from pymongo.errors import BulkWriteError
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+MANIFEST = "manifest.json"
+FORMAT_VERSION = 1
+WRITE_BATCH = 1000
+RAW = CodecOptions(document_class=RawBSONDocument)
+
+
+# ------------------------------
+# Helpers
+# ------------------------------
+class HashingWriter:
+    """File wrapper that sha256-hashes and counts the (compressed) bytes written through it."""
+
+    def __init__(self, fileobj):
+        self._f = fileobj
+        self.sha256 = hashlib.sha256()
+        self.size = 0
+
+    def write(self, data):
+        self.sha256.update(data)
+        self.size += len(data)
+        return self._f.write(data)
+
+    def flush(self):
+        self._f.flush()
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def mb_per_s(num_bytes: int, seconds: float) -> float:
+    return round(num_bytes / (1 << 20) / seconds, 2) if seconds else 0.0
+
+
+def connect(uri: Optional[str], db_name: Optional[str]):
+    if not uri or not db_name:
+        from app.core.config import settings
+        uri = uri or settings.MONGO_URI
+        db_name = db_name or settings.MONGO_DB_NAME
+    return MongoClient(uri)[db_name]
+
+
+def load_manifest(directory: Path) -> Dict:
+    with open(directory / MANIFEST) as f:
+        return json_util.loads(f.read())
+
+
+def write_manifest(directory: Path, manifest: Dict):
+    tmp = directory / f"{MANIFEST}.tmp"
+    with open(tmp, "w") as f:
+        f.write(json_util.dumps(manifest, indent=2, json_options=CANONICAL_JSON_OPTIONS))
+    os.replace(tmp, directory / MANIFEST)
+
+
+def watermark(collection) -> Dict[str, Any]:
+    """Highest `_id` and `updated_at` at backup start (the next incremental starts past these)."""
+    mark: Dict[str, Any] = {}
+    last = collection.find_one({}, {"_id": 1}, sort=[("_id", -1)])
+    if last:
+        mark["_id"] = last["_id"]
+    latest = collection.find_one({"updated_at": {"$exists": True}}, {"updated_at": 1}, sort=[("updated_at", -1)])
+    if latest:
+        mark["updated_at"] = latest["updated_at"]
+    return mark
+
+
+def since_query(previous: Optional[Dict]) -> Dict:
+    if not previous:
+        return {}
+    clauses = []
+    if "_id" in previous:
+        clauses.append({"_id": {"$gt": previous["_id"]}})
+    if "updated_at" in previous:
+        clauses.append({"updated_at": {"$gt": previous["updated_at"]}})
+    return {"$or": clauses} if clauses else {}
+
+
+def index_specs(collection) -> List[Dict]:
+    specs = []
+    for name, info in collection.index_information().items():
+        if name == "_id_":
+            continue
+        options = {k: v for k, v in info.items() if k not in ("key", "v", "ns")}
+        specs.append({"name": name, "key": list(info["key"]), "options": options})
+    return specs
+
+
+# ------------------------------
+# Backup
+# ------------------------------
+def dump_collection(db, name: str, out: Path, fmt: str, level: int, previous: Optional[Dict]) -> Dict:
+    collection = db[name]
+    mark = watermark(collection)
+    query = since_query(previous)
+    path = out / f"{name}.{fmt}.gz"
+
+    started = time.perf_counter()
+    docs = raw_bytes = 0
+    with open(path, "wb") as raw_file:
+        writer = HashingWriter(raw_file)
+        with gzip.GzipFile(fileobj=writer, mode="wb", compresslevel=level) as gz:
+            if fmt == "bson":
+                # RawBSONDocument: bytes go straight from the wire to the file, no decode/encode
+                cursor = collection.with_options(codec_options=RAW).find(query).sort("_id", 1)
+                for doc in cursor.batch_size(WRITE_BATCH):
+                    gz.write(doc.raw)
+                    raw_bytes += len(doc.raw)
+                    docs += 1
+            else:
+                for doc in collection.find(query).sort("_id", 1).batch_size(WRITE_BATCH):
+                    line = (json_util.dumps(doc, json_options=CANONICAL_JSON_OPTIONS) + "\n").encode("utf-8")
+                    gz.write(line)
+                    raw_bytes += len(line)
+                    docs += 1
+    seconds = time.perf_counter() - started
+
+    return {
+        "file": path.name,
+        "format": fmt,
+        "documents": docs,
+        "raw_bytes": raw_bytes,
+        "compressed_bytes": writer.size,
+        "sha256": writer.sha256.hexdigest(),
+        "watermark": mark,
+        "incremental": bool(query),
+        "indexes": index_specs(collection),
+        "seconds": round(seconds, 3),
+        "mb_per_s": mb_per_s(raw_bytes, seconds),
+    }
+
+
+def backup(args) -> int:
+    db = connect(args.uri, args.db)
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+
+    base = load_manifest(Path(args.since)) if args.since else None
+    names = args.collections.split(",") if args.collections else [
+        n for n in db.list_collection_names() if not n.startswith("system.")
+    ]
+    # largest first, so the slowest dump starts immediately
+    names.sort(key=lambda n: db[n].estimated_document_count(), reverse=True)
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "database": db.name,
+        "created_at": datetime.utcnow(),
+        "base": str(Path(args.since).resolve()) if args.since else None,
+        "complete": False,
+        "collections": {},
+    }
+    if args.resume and (out / MANIFEST).exists():
+        previous = load_manifest(out)
+        for name, entry in previous["collections"].items():
+            path = out / entry["file"]
+            if name in names and path.exists() and sha256_file(path) == entry["sha256"]:
+                manifest["collections"][name] = entry
+        print(f"↻ Resuming: {len(manifest['collections'])} collection(s) already backed up")
+    todo = [n for n in names if n not in manifest["collections"]]
+
+    started = time.perf_counter()
+    failed = 0
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {
+            pool.submit(
+                dump_collection, db, name, out, args.format, args.level,
+                (base or {}).get("collections", {}).get(name, {}).get("watermark"),
+            ): name
+            for name in todo
+        }
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                entry = manifest["collections"][name] = future.result()
+                write_manifest(out, manifest)
+                print(
+                    f"  ✅ {name:28} {entry['documents']:>10} docs  "
+                    f"{entry['raw_bytes'] / (1 << 20):>9.1f} MB -> {entry['compressed_bytes'] / (1 << 20):>8.1f} MB  "
+                    f"{entry['mb_per_s']:>7} MB/s"
+                )
+            except Exception as e:
+                failed += 1
+                print(f"  ❌ {name}: {e}")
+
+    seconds = time.perf_counter() - started
+    manifest["seconds"] = round(seconds, 3)
+    manifest["complete"] = not failed
+    write_manifest(out, manifest)
+
+    entries = [manifest["collections"][n] for n in todo if n in manifest["collections"]]
+    total_raw = sum(e["raw_bytes"] for e in entries)
+    print(
+        f"✅ Backup {'(incremental) ' if base else ''}of {len(entries)} collection(s), "
+        f"{sum(e['documents'] for e in entries)} docs, {total_raw / (1 << 20):.1f} MB "
+        f"in {seconds:.1f}s ({mb_per_s(total_raw, seconds)} MB/s) -> {out}"
+    )
+    return 1 if failed else 0
+
+
+# ------------------------------
+# Verify
+# ------------------------------
+def verify_dir(directory: Path) -> List[str]:
+    """Missing files and checksum mismatches of one backup directory."""
+    manifest = load_manifest(directory)
+    problems = [] if manifest.get("complete") else ["backup did not complete (rerun with --resume)"]
+    for name, entry in manifest["collections"].items():
+        path = directory / entry["file"]
+        if not path.exists():
+            problems.append(f"{name}: missing {entry['file']}")
+        elif sha256_file(path) != entry["sha256"]:
+            problems.append(f"{name}: checksum mismatch for {entry['file']}")
+    return problems
+
+
+def verify(args) -> int:
+    status = 0
+    for directory in args.dirs:
+        problems = verify_dir(Path(directory))
+        for problem in problems:
+            print(f"  ❌ {problem}")
+        print(f"{'❌' if problems else '✅'} {directory}: {len(problems)} problem(s)")
+        status |= bool(problems)
+    return status
+
+
+# ------------------------------
+# Restore
+# ------------------------------
+def read_documents(path: Path, fmt: str):
+    with gzip.open(path, "rb") as gz:
+        if fmt == "bson":
+            yield from bson.decode_file_iter(gz, codec_options=RAW)
+        else:
+            for line in gz:
+                if line.strip():
+                    yield json_util.loads(line, json_options=CANONICAL_JSON_OPTIONS)
+
+
+def restore_collection(db, name: str, directory: Path, entry: Dict, upsert: bool, with_indexes: bool) -> Dict:
+    collection = db[name]
+    started = time.perf_counter()
+    docs = errors = 0
+    batch = []
+
+    def flush():
+        nonlocal errors
+        try:
+            collection.bulk_write(batch, ordered=False)
+        except BulkWriteError as e:
+            errors += len(e.details.get("writeErrors", []))
+        batch.clear()
+
+    for doc in read_documents(directory / entry["file"], entry["format"]):
+        # incremental files (and --upsert) replace by _id so re-applying is idempotent
+        batch.append(ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) if upsert else InsertOne(doc))
+        docs += 1
+        if len(batch) >= WRITE_BATCH:
+            flush()
+    if batch:
+        flush()
+
+    if with_indexes:
+        for spec in entry.get("indexes", []):
+            collection.create_index([tuple(k) for k in spec["key"]], name=spec["name"], **spec["options"])
+
+    seconds = time.perf_counter() - started
+    return {"documents": docs, "errors": errors, "seconds": seconds, "raw_bytes": entry["raw_bytes"]}
+
+
+def restore(args) -> int:
+    directories = [Path(d) for d in args.dirs]
+    for directory in directories:
+        problems = verify_dir(directory)
+        if problems:
+            print(f"❌ {directory} failed verification: {'; '.join(problems)}")
+            return 1
+
+    db = connect(args.uri, args.db)
+    if args.drop:
+        first = load_manifest(directories[0])
+        for name in first["collections"]:
+            db[name].drop()
+
+    started = time.perf_counter()
+    totals = {"documents": 0, "errors": 0, "raw_bytes": 0}
+    # directories in order (full, then increments); collections within one directory in parallel
+    for position, directory in enumerate(directories):
+        manifest = load_manifest(directory)
+        upsert = args.upsert or position > 0 or any(e["incremental"] for e in manifest["collections"].values())
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            futures = {
+                pool.submit(restore_collection, db, name, directory, entry, upsert, not args.no_indexes): name
+                for name, entry in sorted(
+                    manifest["collections"].items(), key=lambda item: item[1]["raw_bytes"], reverse=True
+                )
+            }
+            for future in as_completed(futures):
+                name = futures[future]
+                result = future.result()
+                for key in totals:
+                    totals[key] += result[key]
+                print(
+                    f"  ✅ {directory.name}/{name:28} {result['documents']:>10} docs  "
+                    f"{result['errors']:>6} errors  {mb_per_s(result['raw_bytes'], result['seconds']):>7} MB/s"
+                )
+
+    seconds = time.perf_counter() - started
+    # any write error fails the restore, whether it inserted or upserted (incremental restores upsert)
+    mark = "❌" if totals["errors"] else "✅"
+    print(
+        f"{mark} Restored {totals['documents']} docs ({totals['errors']} write errors) from "
+        f"{len(directories)} backup(s) in {seconds:.1f}s ({mb_per_s(totals['raw_bytes'], seconds)} MB/s)"
+    )
+    return 1 if totals["errors"] else 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Parallel compressed MongoDB backup / restore")
+    parser.add_argument("--uri", help="Mongo URI (default: MONGO_URI from backend/.env)")
+    parser.add_argument("--db", help="Database name (default: MONGO_DB_NAME)")
+    parser.add_argument("--workers", type=int, default=min(8, (os.cpu_count() or 2) * 2))
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_backup = sub.add_parser("backup", help="dump collections (and GridFS) to a directory")
+    p_backup.add_argument("--out", required=True)
+    p_backup.add_argument("--since", help="previous backup directory: dump only newer/updated documents")
+    p_backup.add_argument("--collections", help="comma-separated (default: all)")
+    p_backup.add_argument("--format", choices=["bson", "ndjson"], default="bson")
+    p_backup.add_argument("--level", type=int, default=6, help="gzip level 1-9")
+    p_backup.add_argument("--resume", action="store_true", help="keep finished collections of an interrupted run")
+    p_backup.set_defaults(func=backup)
+
+    p_verify = sub.add_parser("verify", help="check sha256 checksums of backup files")
+    p_verify.add_argument("dirs", nargs="+")
+    p_verify.set_defaults(func=verify)
+
+    p_restore = sub.add_parser("restore", help="restore a full backup followed by incremental ones")
+    p_restore.add_argument("dirs", nargs="+", help="full backup first, then increments in order")
+    p_restore.add_argument("--drop", action="store_true", help="drop the collections first")
+    p_restore.add_argument("--upsert", action="store_true", help="replace existing documents by _id")
+    p_restore.add_argument("--no-indexes", action="store_true", help="skip recreating secondary indexes")
+    p_restore.set_defaults(func=restore)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
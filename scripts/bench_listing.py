@@ -0,0 +1,84 @@
+# scripts/bench_listing.py
+# Round trips and latency per page of the candidate listing, batched hydration
+# vs. the previous per-candidate (N+1) lookups.
+#
+#   cd backend && python ../scripts/bench_listing.py [--limits 10,50,200] [--repeat 20]
+#
+# Runs against the configured MONGO_URI / MONGO_DB_NAME (backend/.env);
+# seed data first if empty.
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from pymongo import monitoring
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to the server (one per round trip)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+counter = CommandCounter()
+monitoring.register(counter)  # must happen before the app creates its Mongo clients
+
+from app.api.candidate_listing import hydrate_candidates  # noqa: E402
+from app.repositories import candidate_repo, job_repo, normalize, resume_repo, score_repo  # noqa: E402
+
+
+async def hydrate_n_plus_one(candidates):
+    """Previous behaviour: three find_one calls per candidate."""
+    result = []
+    for candidate in candidates:
+        candidate = normalize(candidate)
+        job = await job_repo.find_by_id(candidate["job_id"], include_deleted=True) if candidate.get("job_id") else None
+        resume = await resume_repo.find_by_id(candidate["resume_id"]) if candidate.get("resume_id") else None
+        score = await score_repo.latest_for_candidate(candidate["id"])
+        result.append((candidate, job, resume, score))
+    return result
+
+
+async def measure(hydrate, limit: int, repeat: int):
+    timings, trips = [], []
+    for _ in range(repeat):
+        before = counter.count
+        start = time.perf_counter()
+        candidates = await candidate_repo.find_many(sort=[("_id", -1)], limit=limit)
+        await hydrate(candidates)
+        timings.append((time.perf_counter() - start) * 1000)
+        trips.append(counter.count - before)
+    return len(candidates), statistics.median(trips), statistics.median(timings), max(timings)
+
+
+async def main(limits, repeat: int):
+    total = await candidate_repo.count()
+    print(f"candidates: {total}")
+    print(f"{'limit':>6} {'rows':>5} {'mode':>10} {'round trips':>12} {'p50 ms':>9} {'max ms':>9}")
+    for limit in limits:
+        for mode, hydrate in (("batched", hydrate_candidates), ("n+1", hydrate_n_plus_one)):
+            rows, trips, p50, worst = await measure(hydrate, limit, repeat)
+            print(f"{limit:>6} {rows:>5} {mode:>10} {trips:>12.0f} {p50:>9.1f} {worst:>9.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Candidate listing hydration benchmark")
+    parser.add_argument("--limits", default="10,50,200")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main([int(x) for x in args.limits.split(",")], args.repeat))
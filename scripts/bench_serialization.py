@@ -0,0 +1,96 @@
+# scripts/bench_serialization.py
+# Per-row serialization cost of listing responses: the previous path
+# (Model(**doc).dict() -> jsonable_encoder -> json.dumps) vs. trusted rows
+# rendered with orjson (app/utils/serialization.py).
+#
+#   cd backend && python ../scripts/bench_serialization.py [--rows 1000] [--repeat 20]
+#
+# No database needed: rows come from the seed_data generators.
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+
+from app.models.candidate import CandidateResponse  # noqa: E402
+from app.models.job import JobResponse  # noqa: E402
+from app.models.scoring import CandidateScore  # noqa: E402
+from app.repositories import normalize  # noqa: E402
+from app.utils.serialization import dumps, trusted_row  # noqa: E402
+from seed_data import job_ids, make_candidate, make_job, make_score, seeded_object_id  # noqa: E402
+
+
+def listing_docs(count: int, seed: int):
+    rng = random.Random(seed)
+    ids = job_ids(seed, 50)
+    jobs = {str(_id): make_job(rng, _id, i) for i, _id in enumerate(ids)}
+    rows = []
+    for i in range(count):
+        candidate = make_candidate(rng, seeded_object_id(rng, i), i, ids)
+        candidate["job_id"] = candidate["job_id"] or str(ids[0])
+        score = {**make_score(rng, candidate), "_id": seeded_object_id(rng, i)}
+        rows.append((normalize(candidate), normalize(jobs[candidate["job_id"]]), normalize(score)))
+    return rows
+
+
+def legacy(rows) -> bytes:
+    body = {"candidates": [
+        {
+            "candidate": CandidateResponse(**c).dict(),
+            "job": JobResponse(**j).dict(),
+            "score": CandidateScore(**s).dict(),
+        }
+        for c, j, s in rows
+    ]}
+    # what FastAPI + starlette JSONResponse do with a returned dict
+    return json.dumps(jsonable_encoder(body), ensure_ascii=False, allow_nan=False,
+                      indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def trusted(rows) -> bytes:
+    return dumps({"candidates": [
+        {
+            "candidate": trusted_row(CandidateResponse, c),
+            "job": trusted_row(JobResponse, j),
+            "score": trusted_row(CandidateScore, s),
+        }
+        for c, j, s in rows
+    ]})
+
+
+def main():
+    warnings.simplefilter("ignore", DeprecationWarning)  # .dict() in the legacy path
+    parser = argparse.ArgumentParser(description="Benchmark listing response serialization")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    rows = listing_docs(args.rows, args.seed)
+    if json.loads(legacy(rows)) != json.loads(trusted(rows)):
+        print("! outputs differ")
+
+    print(f"{'path':>10} {'ms/response':>12} {'us/row':>8} {'bytes':>10}")
+    baseline = None
+    for name, render in (("legacy", legacy), ("trusted", trusted)):
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            body = render(rows)
+            timings.append((time.perf_counter() - started) * 1000)
+        median = statistics.median(timings)
+        baseline = baseline or median
+        print(f"{name:>10} {median:>12.1f} {median * 1000 / args.rows:>8.1f} {len(body):>10}"
+              f"  ({baseline / median:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
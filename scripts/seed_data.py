@@ -0,0 +1,424 @@
+# scripts/seed_data.py
+# Reproducible synthetic dataset for scale testing (jobs, candidates, scores, resume files).
+#
+#   cd backend
+#   python ../scripts/seed_data.py --jobs 500 --candidates 1000000 --seed 42 --drop
+#   python ../scripts/seed_data.py --candidates 20000 --resumes 1.0 --workers 4
+#
+# The same --seed (and sizes) always produces the same documents, ids included.
+# Documents match what the API writes (POST /api/jobs/, POST /api/candidates/,
+# generate-score, resume upload) so listing, scoring and search run against them
+# unchanged. Resume files are real PDF / DOCX files written straight into GridFS
+# (fs.files + fs.chunks) with bulk inserts.
+#
+# Candidates are generated by --workers processes, each owning a slice of the id
+# range and inserting in batches of --batch with insert_many(ordered=False).
+# Secondary indexes (app/core/indexes.py) are built once at the end, which is
+# faster than maintaining them during the load. Vectors are not created here:
+# run `python -m app.services.embedding_pipeline` afterwards for semantic search.
+
+import argparse
+import io
+import os
+import random
+import struct
+import sys
+import time
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from bson import Binary, ObjectId
+from pymongo import MongoClient
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "backend"))
+
+BASE_TIME = datetime(2024, 1, 1)
+GRIDFS_CHUNK = 255 * 1024
+# candidates per worker slice (one rng stream each): fixed, so the dataset depends only on --seed and sizes
+SLICE_SIZE = 10000
+
+FIRST_NAMES = [
+    "Aarav", "Vivaan", "Aditya", "Ananya", "Diya", "Ishaan", "Kabir", "Meera", "Priya", "Rohan",
+    "Sara", "Arjun", "Neha", "Vikram", "Kavya", "Rahul", "Sneha", "Karan", "Pooja", "Nikhil",
+    "Emma", "Liam", "Olivia", "Noah", "Ava", "Lucas", "Mia", "Ethan", "Zoe", "Leo",
+]
+LAST_NAMES = [
+    "Sharma", "Patel", "Iyer", "Reddy", "Nair", "Gupta", "Singh", "Khan", "Das", "Mehta",
+    "Joshi", "Kulkarni", "Rao", "Menon", "Bose", "Smith", "Garcia", "Müller", "Rossi", "Silva",
+]
+LOCATIONS = [
+    "Pune, India", "Bengaluru, India", "Hyderabad, India", "Chennai, India", "Mumbai, India",
+    "Delhi, India", "Noida, India", "Kochi, India", "Remote", "London, UK", "Berlin, Germany",
+    "Austin, USA", "Toronto, Canada", "Singapore",
+]
+ROLES = {
+    "Backend Engineer": ["Python", "FastAPI", "Django", "PostgreSQL", "MongoDB", "Redis", "Docker", "Kafka", "Go", "gRPC"],
+    "Frontend Engineer": ["React", "TypeScript", "Next.js", "Redux", "Tailwind CSS", "Vite", "Jest", "GraphQL", "HTML", "CSS"],
+    "Data Scientist": ["Python", "Pandas", "scikit-learn", "PyTorch", "TensorFlow", "SQL", "Spark", "NLP", "Statistics", "MLflow"],
+    "DevOps Engineer": ["Kubernetes", "Terraform", "AWS", "GCP", "Docker", "Jenkins", "Prometheus", "Ansible", "Linux", "Helm"],
+    "Mobile Developer": ["Kotlin", "Swift", "Flutter", "React Native", "Android", "iOS", "Firebase", "Dart", "REST", "SQLite"],
+    "QA Engineer": ["Selenium", "Cypress", "Playwright", "Java", "Postman", "JMeter", "Python", "Appium", "TestNG", "CI/CD"],
+    "Product Manager": ["Roadmapping", "Jira", "Analytics", "A/B Testing", "SQL", "Figma", "Stakeholder Management", "Agile", "OKRs", "Market Research"],
+}
+DEPARTMENTS = ["Engineering", "Data", "Platform", "Mobile", "Quality", "Product"]
+DEGREES = ["B.Tech Computer Science", "B.E. Information Technology", "M.Tech Software Systems", "MCA", "B.Sc Mathematics", "MBA"]
+INSTITUTIONS = ["IIT Bombay", "NIT Trichy", "BITS Pilani", "Pune University", "VIT Vellore", "Anna University", "IIIT Hyderabad"]
+CERTIFICATIONS = ["AWS Solutions Architect", "CKA", "Google Data Engineer", "Scrum Master", "Azure Fundamentals", "MongoDB Developer"]
+LANGUAGES = ["English", "Hindi", "Marathi", "Tamil", "Telugu", "German", "French", "Spanish"]
+HOBBIES = ["chess", "running", "photography", "open source", "cycling", "music", "reading", "trekking"]
+VERBS = ["Built", "Designed", "Led", "Migrated", "Optimized", "Automated", "Scaled", "Shipped"]
+OBJECTS = ["a payments API", "an analytics dashboard", "the CI pipeline", "a recommendation service",
+           "the mobile checkout", "a data lake ingestion job", "an internal design system", "a search backend"]
+FITMENT = [(80, "Good Fit"), (60, "Average"), (0, "Poor")]
+
+
+# ------------------------------
+# Deterministic ids
+# ------------------------------
+def seeded_object_id(rng: random.Random, position: int) -> ObjectId:
+    """ObjectId whose timestamp advances with `position` and whose tail comes from the seeded RNG."""
+    timestamp = int(BASE_TIME.timestamp()) + position // 100
+    return ObjectId(struct.pack(">I", timestamp) + rng.getrandbits(64).to_bytes(8, "big"))
+
+
+def job_ids(seed: int, count: int) -> List[ObjectId]:
+    rng = random.Random(f"{seed}:job-ids")
+    return [seeded_object_id(rng, i) for i in range(count)]
+
+
+# ------------------------------
+# Documents
+# ------------------------------
+def _html_list(items: List[str]) -> str:
+    return "<ul>" + "".join(f"<li>{i}</li>" for i in items) + "</ul>"
+
+
+def make_job(rng: random.Random, _id: ObjectId, index: int) -> Dict:
+    role = rng.choice(list(ROLES))
+    skills = rng.sample(ROLES[role], 5)
+    created = BASE_TIME + timedelta(minutes=index * 7)
+    return {
+        "_id": _id,
+        "title": f"{rng.choice(['Senior ', '', 'Lead ', 'Junior '])}{role}",
+        "department": rng.choice(DEPARTMENTS),
+        "location": rng.choice(LOCATIONS),
+        "workMode": rng.choice(["On-site", "Hybrid", "Remote"]),
+        "type": rng.choice(["Full-time", "Full-time", "Contract"]),
+        "experience": f"{rng.randint(1, 8)}+ years",
+        "openings": rng.randint(1, 5),
+        "salary": f"{rng.randint(8, 40)} LPA",
+        "deadline": created + timedelta(days=rng.randint(20, 90)),
+        "description": f"<p>We are hiring a {role} to work on {rng.choice(OBJECTS)}.</p>",
+        "responsibilities": _html_list([f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}" for _ in range(4)]),
+        "requirements": _html_list([f"Hands-on experience with {s}" for s in skills]),
+        "benefits": _html_list(["Health insurance", "Learning budget", "Flexible hours"]),
+        "status": rng.choice([0, 1, 1, 1, 2]),
+        "hiringManager": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "visibility": "Public",
+        "skills": skills,
+        "created_at": created,
+        "updated_at": created,
+        "is_deleted": rng.random() < 0.02,
+    }
+
+
+def make_candidate(rng: random.Random, _id: ObjectId, index: int, jobs: List[ObjectId]) -> Dict:
+    role = rng.choice(list(ROLES))
+    years = rng.randint(0, 15)
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    skills = rng.sample(ROLES[role], rng.randint(4, 8))
+    return {
+        "_id": _id,
+        "name": f"{first} {last}",
+        "email": f"{first.lower()}.{last.lower()}.{index}@example.com",
+        "phone": f"+91 9{rng.randint(100000000, 999999999)}",
+        "location": rng.choice(LOCATIONS),
+        "years_of_experience": str(years),
+        "skills": skills,
+        "interests": rng.sample(HOBBIES, 2),
+        "experience_summary": (
+            f"{role} with {years} years of experience. "
+            + " ".join(f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(skills)}." for _ in range(3))
+        ),
+        "position": role,
+        "job_id": str(rng.choice(jobs)) if jobs and rng.random() < 0.9 else None,
+        "status": "active" if rng.random() < 0.9 else "inactive",
+        "deleted": rng.random() < 0.03,
+        "resume_id": None,
+        "resume_url": None,
+        "extra_data": {
+            "education": [{
+                "degree": rng.choice(DEGREES),
+                "institution": rng.choice(INSTITUTIONS),
+                "year": str(2024 - years - rng.randint(0, 3)),
+            }],
+            "projects": [
+                {
+                    "title": f"{rng.choice(['Project', 'Platform', 'Service'])} {rng.choice(['Atlas', 'Nova', 'Orion', 'Falcon', 'Zephyr'])}",
+                    "description": f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} serving {rng.randint(1, 500)}k users.",
+                    "technologies": rng.sample(skills, min(3, len(skills))),
+                }
+                for _ in range(rng.randint(1, 4))
+            ],
+            "certifications": rng.sample(CERTIFICATIONS, rng.randint(0, 2)),
+            "languages": rng.sample(LANGUAGES, rng.randint(1, 3)),
+            "hobbies": rng.sample(HOBBIES, 2),
+            "role_specific_highlights": [f"{rng.choice(VERBS)} {rng.choice(OBJECTS)}" for _ in range(2)],
+        },
+    }
+
+
+def make_score(rng: random.Random, candidate: Dict) -> Dict:
+    overall = rng.randint(20, 98)
+    breakdown = {
+        key: max(0, min(100, overall + rng.randint(-20, 20)))
+        for key in ("skills", "experience", "education", "projects", "keywords", "ats", "grammar",
+                    "soft_skills", "readability", "cultural_fit", "domain_relevance", "certifications_score")
+    }
+    matched = candidate["skills"][: rng.randint(1, len(candidate["skills"]))]
+    created = BASE_TIME + timedelta(days=rng.randint(0, 300))
+    return {
+        "candidate_id": str(candidate["_id"]),
+        "job_id": candidate["job_id"],
+        "overall_score": overall,
+        "fitment_score": max(0, min(100, overall + rng.randint(-10, 10))),
+        "scoring_breakdown": breakdown,
+        "job_match": {
+            "skills_matched": matched,
+            "skills_missing": rng.sample(HOBBIES, 1),
+            "keyword_density": {"required_keywords": 10, "matched": len(matched), "percentage": len(matched) * 10},
+        },
+        "sentiment": {"overall": rng.choice(["Positive", "Neutral"]), "tone": "Professional", "soft_skills_extraction": ["communication"]},
+        "strengths": {"technical": matched[:2], "soft": ["ownership"]},
+        "weaknesses": {"technical": [], "soft": []},
+        "recommendation": "Proceed to interview" if overall >= 70 else "Keep in pool",
+        "fitment_status": next(label for floor, label in FITMENT if overall >= floor),
+        "ranking_score": overall,
+        "percentile": rng.randint(1, 99),
+        "scoring_version": "v1.1",
+        "deleted": False,
+        "deleted_at": None,
+        "created_at": created,
+        "updated_at": created,
+    }
+
+
+# ------------------------------
+# Resume files
+# ------------------------------
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").encode("latin-1", "replace").decode("latin-1")
+
+
+def make_pdf(lines: List[str]) -> bytes:
+    """Minimal single-page PDF with a text stream (readable by pdfminer)."""
+    content = "BT /F1 11 Tf 50 780 Td 14 TL " + " ".join(f"({_pdf_escape(l)}) '" for l in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] /Contents 4 0 R /Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(content.encode('latin-1'))} >>\nstream\n{content}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1"))
+    for offset in offsets:
+        out.write(f"{offset:010d} 00000 n \n".encode("latin-1"))
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1"))
+    return out.getvalue()
+
+
+_DOCX_TYPES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/word/document.xml" '
+    'ContentType="application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+    "</Types>"
+)
+_DOCX_RELS = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    'Target="word/document.xml"/></Relationships>'
+)
+
+
+def make_docx(lines: List[str]) -> bytes:
+    """Minimal DOCX (one paragraph per line, readable by python-docx)."""
+    from xml.sax.saxutils import escape
+
+    paragraphs = "".join(f"<w:p><w:r><w:t>{escape(l)}</w:t></w:r></w:p>" for l in lines)
+    document = (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+        f"<w:body>{paragraphs}</w:body></w:document>"
+    )
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
+        z.writestr("[Content_Types].xml", _DOCX_TYPES)
+        z.writestr("_rels/.rels", _DOCX_RELS)
+        z.writestr("word/document.xml", document)
+    return out.getvalue()
+
+
+def resume_lines(candidate: Dict) -> List[str]:
+    extra = candidate["extra_data"]
+    lines = [
+        candidate["name"], f"{candidate['email']} | {candidate['phone']} | {candidate['location']}",
+        f"{candidate['position']} - {candidate['years_of_experience']} years", "",
+        "Summary", candidate["experience_summary"], "", "Skills", ", ".join(candidate["skills"]), "", "Projects",
+    ]
+    lines += [f"{p['title']}: {p['description']} ({', '.join(p['technologies'])})" for p in extra["projects"]]
+    lines += ["", "Education"] + [f"{e['degree']}, {e['institution']} ({e['year']})" for e in extra["education"]]
+    if extra["certifications"]:
+        lines += ["", "Certifications", ", ".join(extra["certifications"])]
+    return lines
+
+
+def gridfs_docs(file_id: ObjectId, filename: str, content_type: str, data: bytes, uploaded: datetime) -> Tuple[Dict, List[Dict]]:
+    """fs.files + fs.chunks documents, as ResumeRepository.put_file (GridIn) writes them."""
+    chunks = [
+        {"files_id": file_id, "n": n, "data": Binary(data[offset:offset + GRIDFS_CHUNK])}
+        for n, offset in enumerate(range(0, max(len(data), 1), GRIDFS_CHUNK))
+    ]
+    files = {
+        "_id": file_id,
+        "length": len(data),
+        "chunkSize": GRIDFS_CHUNK,
+        "uploadDate": uploaded,
+        "filename": filename,
+        "contentType": content_type,
+    }
+    return files, chunks
+
+
+# ------------------------------
+# Workers
+# ------------------------------
+def seed_candidate_slice(
+    uri: str, db_name: str, seed: int, start: int, stop: int, jobs: List[ObjectId],
+    resume_ratio: float, score_ratio: float, batch: int,
+) -> Dict[str, int]:
+    """Generate and insert candidates [start, stop) (runs in a worker process)."""
+    db = MongoClient(uri)[db_name]
+    rng = random.Random(f"{seed}:candidates:{start}")
+    counts = {"candidates": 0, "scores": 0, "resumes": 0}
+    candidates, scores, files, chunks = [], [], [], []
+
+    def flush():
+        if files:
+            db["fs.files"].insert_many(files, ordered=False)
+            db["fs.chunks"].insert_many(chunks, ordered=False)
+        if candidates:
+            db["candidates"].insert_many(candidates, ordered=False)
+        if scores:
+            db["candidate_scores"].insert_many(scores, ordered=False)
+        counts["candidates"] += len(candidates)
+        counts["scores"] += len(scores)
+        counts["resumes"] += len(files)
+        for buffer in (candidates, scores, files, chunks):
+            buffer.clear()
+
+    for index in range(start, stop):
+        candidate = make_candidate(rng, seeded_object_id(rng, index), index, jobs)
+        if rng.random() < resume_ratio:
+            file_id = seeded_object_id(rng, index)
+            as_pdf = rng.random() < 0.7
+            data = (make_pdf if as_pdf else make_docx)(resume_lines(candidate))
+            name = f"{candidate['name'].replace(' ', '_')}_{index}.{'pdf' if as_pdf else 'docx'}"
+            content_type = "application/pdf" if as_pdf else (
+                "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+            )
+            file_doc, file_chunks = gridfs_docs(file_id, name, content_type, data, BASE_TIME + timedelta(seconds=index))
+            files.append(file_doc)
+            chunks.extend(file_chunks)
+            candidate["resume_id"] = str(file_id)
+            candidate["resume_url"] = f"/api/resume/{file_id}"
+        candidates.append(candidate)
+        if candidate["job_id"] and rng.random() < score_ratio:
+            scores.append(make_score(rng, candidate))
+        if len(candidates) >= batch:
+            flush()
+    flush()
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Seed a reproducible synthetic dataset")
+    parser.add_argument("--uri", help="Mongo URI (default: MONGO_URI from backend/.env)")
+    parser.add_argument("--db", help="Database name (default: MONGO_DB_NAME)")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--resumes", type=float, default=0.05, help="fraction of candidates with a resume file")
+    parser.add_argument("--scored", type=float, default=0.6, help="fraction of candidates (with a job) that get a score")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch", type=int, default=5000, help="documents per insert_many")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--drop", action="store_true", help="drop the seeded collections first")
+    parser.add_argument("--no-indexes", action="store_true", help="skip building app indexes at the end")
+    args = parser.parse_args(argv)
+
+    uri, db_name = args.uri, args.db
+    if not uri or not db_name:
+        from app.core.config import settings
+        uri = uri or settings.MONGO_URI
+        db_name = db_name or settings.MONGO_DB_NAME
+    db = MongoClient(uri)[db_name]
+
+    if args.drop:
+        for name in ("jobs", "candidates", "candidate_scores", "fs.files", "fs.chunks", "vector_refs"):
+            db[name].drop()
+
+    started = time.perf_counter()
+    ids = job_ids(args.seed, args.jobs)
+    rng = random.Random(f"{args.seed}:jobs")
+    jobs = [make_job(rng, _id, i) for i, _id in enumerate(ids)]
+    if jobs:
+        db["jobs"].insert_many(jobs, ordered=False)
+    print(f"✅ {len(jobs)} jobs")
+
+    # fixed slice boundaries, so the output does not depend on --workers or --batch
+    slices = [(s, min(s + SLICE_SIZE, args.candidates)) for s in range(0, args.candidates, SLICE_SIZE)]
+    totals = {"candidates": 0, "scores": 0, "resumes": 0}
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(seed_candidate_slice, uri, db_name, args.seed, start, stop, ids,
+                        args.resumes, args.scored, args.batch)
+            for start, stop in slices
+        ]
+        for future in futures:
+            for key, value in future.result().items():
+                totals[key] += value
+            elapsed = time.perf_counter() - started
+            print(f"  … {totals['candidates']:>9} candidates  {totals['candidates'] / elapsed:>8.0f} docs/s", flush=True)
+
+    load_seconds = time.perf_counter() - started
+    print(
+        f"✅ {totals['candidates']} candidates, {totals['scores']} scores, {totals['resumes']} resume files "
+        f"in {load_seconds:.1f}s ({totals['candidates'] / load_seconds:.0f} candidates/s)"
+    )
+
+    if not args.no_indexes:
+        from app.core.indexes import ensure_indexes
+
+        index_started = time.perf_counter()
+        report = ensure_indexes(db)
+        print(f"✅ {len(report['created'])} indexes in {time.perf_counter() - index_started:.1f}s")
+        for conflict in report["conflicts"]:
+            print(f"  ! {conflict}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())